@@ -0,0 +1,84 @@
+# transdevs_techexperience/benchmarks/benchmark_dashboard_sessions.py
+
+import sys
+import os
+import argparse
+import gc
+import logging
+import pickle
+import resource
+import tracemalloc
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from streamlit.testing.v1 import AppTest
+
+from src.config import DASHBOARD_BUNDLE_PATH, ANONYMIZED_PII_PATH
+from src.storage import read_dataset
+from src.dashboard_bundle import read_dashboard_bundle
+from src.app.utils import build_display_tables
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+# Aviso do Streamlit a cada sessão ('missing ScriptRunContext', ao preencher secrets e session_state fora de um rerun)
+logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').disabled = True
+
+APP_PATH = os.path.join(project_root, 'src', 'app', 'main.py')
+
+def open_session() -> AppTest:
+    """Sessão do dashboard já autenticada que percorre todas as seções (cada seção desenhada ao menos uma vez)."""
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.secrets['user_credentials'] = {'username': 'benchmark', 'password': 'benchmark'}
+    at.session_state['password_correct'] = True
+    at.run()
+    for section in at.radio(key='dashboard_section').options:
+        at.radio(key='dashboard_section').set_value(section).run()
+    if at.exception:
+        raise RuntimeError(f"Erro no dashboard: {[e.value for e in at.exception]}")
+    return at
+
+def traced_mb() -> float:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 1024 ** 2
+
+def shared_data_sizes() -> tuple:
+    """
+    Tamanhos (MB) dos dados do dashboard: a cópia que st.cache_data desserializava a cada rerun de cada sessão
+    (pacote + mapeamento de PII, serializados) e as tabelas pyarrow compartilhadas agora por todas as sessões.
+    """
+    bundle = read_dashboard_bundle(DASHBOARD_BUNDLE_PATH)
+    df_pii = read_dataset(ANONYMIZED_PII_PATH, columns=['participant_id', 'nome_completo'])
+    copy_mb = len(pickle.dumps((bundle, df_pii))) / 1024 ** 2
+    tables = build_display_tables(bundle, df_pii)
+    arrow_mb = (tables['direct_leaders'].nbytes + tables['support_suggestions'].nbytes
+                + sum(table.nbytes for table in tables['team_members'].values())) / 1024 ** 2
+    return copy_mb, arrow_mb
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede a memória por sessão do dashboard: abre sessões (AppTest) que percorrem todas as seções e ficam abertas, "
+                    "e mede o crescimento da memória alocada pelo Python (tracemalloc) a cada sessão nova. "
+                    "Usa os dados já gerados em data/processed (execute o run_eda.py ou o run_all.py antes).")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 20], help="Quantidades de sessões abertas ao mesmo tempo.")
+    args = parser.parse_args()
+
+    copy_mb, arrow_mb = shared_data_sizes()
+    print(f"Cópia por rerun com st.cache_data (pacote + PII serializados): {copy_mb:.3f} MB")
+    print(f"Tabelas pyarrow compartilhadas entre as sessões: {arrow_mb:.3f} MB\n")
+
+    tracemalloc.start()
+    sessions = [open_session()] # A primeira sessão carrega os dados compartilhados e os caches das figuras
+    first_mb = traced_mb()
+    print(f"{'sessões':>8} {'memória (MB)':>13} {'por sessão extra (KB)':>22} {'pico RSS (MB)':>14}")
+    print(f"{1:>8} {first_mb:>13.2f} {'-':>22} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>14.1f}")
+    for n_sessions in sorted(n for n in args.sessions if n > 1):
+        while len(sessions) < n_sessions:
+            sessions.append(open_session())
+        total_mb = traced_mb()
+        per_session_kb = (total_mb - first_mb) / (n_sessions - 1) * 1024
+        print(f"{n_sessions:>8} {total_mb:>13.2f} {per_session_kb:>22.1f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# transdevs_techexperience/benchmarks/benchmark_import_time.py
+
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cada alvo é executado em um interpretador novo (import "a frio")
+TARGETS = {
+    'src.analysis.nlp_processing': "import src.analysis.nlp_processing",
+    # Mesmos imports do topo de src/app/main.py, sem executar a página do Streamlit
+    'dashboard (imports de main.py)': (
+        "import streamlit, pandas, plotly.express, wordcloud, matplotlib.pyplot\n"
+        "import src.app.utils, src.config\n"
+        "from src.analysis.nlp_processing import get_ngram_text_for_wordcloud"
+    ),
+}
+
+TIMER_TEMPLATE = (
+    "import time, logging\n"
+    "logging.disable(logging.CRITICAL)\n"
+    "start = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+def time_cold_import(code: str, repeat: int) -> list:
+    """Mede o tempo de import em 'repeat' interpretadores novos e retorna os tempos em segundos."""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', TIMER_TEMPLATE.format(code=code)],
+            cwd=project_root, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de import a frio do módulo de NLP e do dashboard.")
+    parser.add_argument('--repeat', type=int, default=5, help="Quantidade de interpretadores novos por alvo.")
+    args = parser.parse_args()
+
+    print(f"{'alvo':<34} {'mediana (s)':>12} {'mín (s)':>9} {'máx (s)':>9}")
+    for name, code in TARGETS.items():
+        timings = time_cold_import(code, args.repeat)
+        print(f"{name:<34} {statistics.median(timings):>12.3f} {min(timings):>9.3f} {max(timings):>9.3f}")
+
+if __name__ == "__main__":
+    main()
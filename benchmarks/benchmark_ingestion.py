@@ -0,0 +1,84 @@
+# transdevs_techexperience/benchmarks/benchmark_ingestion.py
+
+import sys
+import os
+import argparse
+import logging
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from src.config import RAW_DATA_PATH, ROW_HASH_COL
+from src.data_ingestion import iter_raw_data_chunks, compute_row_hashes
+from src.data_processing import preprocess_data, preprocess_data_in_chunks
+from src.incremental import STATE_COLUMNS
+from src.storage import write_dataset
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger().setLevel(logging.WARNING)
+
+def build_raw_export(n_rows: int, file_path: str):
+    """Replica as respostas do CSV bruto real até n_rows linhas, com os mesmos cabeçalhos do formulário."""
+    df = pd.read_csv(RAW_DATA_PATH, dtype=str)
+    repeats = -(-n_rows // len(df)) # Divisão com arredondamento para cima
+    pd.concat([df] * repeats, ignore_index=True).iloc[:n_rows].to_csv(file_path, index=False)
+
+def run_legacy(raw_path: str, out_dir: str):
+    """ETL anterior: CSV inteiro em memória (todas as colunas, dtypes padrão) e pré-processamento de uma vez."""
+    raw_df = pd.read_csv(raw_path)
+    raw_df[ROW_HASH_COL] = compute_row_hashes(raw_df)
+    df_conscience, df_active, pii_mapping_df = preprocess_data(raw_df, save_pii_mapping=False)
+    write_dataset(df_active, os.path.join(out_dir, 'processed.csv'))
+    write_dataset(pii_mapping_df, os.path.join(out_dir, 'pii.csv'))
+    write_dataset(df_conscience[STATE_COLUMNS], os.path.join(out_dir, 'state.csv'))
+
+def run_streaming(raw_path: str, out_dir: str, chunksize: int):
+    """ETL em streaming: iter_raw_data_chunks + preprocess_data_in_chunks."""
+    preprocess_data_in_chunks(iter_raw_data_chunks(raw_path, chunksize), os.path.join(out_dir, 'processed.csv'),
+                              os.path.join(out_dir, 'pii.csv'), os.path.join(out_dir, 'state.csv'))
+
+def _run_in_child(path_name: str, raw_path: str, out_dir: str, chunksize: int) -> tuple:
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if path_name == 'legado':
+        run_legacy(raw_path, out_dir)
+    else:
+        run_streaming(raw_path, out_dir, chunksize)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak_kb - baseline_kb) / 1024
+
+def measure(path_name: str, raw_path: str, out_dir: str, chunksize: int) -> tuple:
+    """
+    Executa o ETL em um processo novo e retorna (tempo em s, aumento do pico de RSS em MB).
+    Um processo por medição garante que o pico de um caminho não contamine o outro.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_in_child, path_name, raw_path, out_dir, chunksize).result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o pico de memória do ETL com o CSV inteiro em memória e em streaming.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 400_000], help="Tamanhos da exportação sintética.")
+    parser.add_argument('--chunksize', type=int, default=10_000, help="Respostas por bloco no caminho em streaming.")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'CSV (MB)':>9} {'caminho':>10} {'tempo (s)':>10} {'pico RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_path = os.path.join(tmp_dir, 'raw.csv')
+        for n_rows in args.rows:
+            build_raw_export(n_rows, raw_path)
+            csv_mb = os.path.getsize(raw_path) / 1024 ** 2
+            for path_name in ('legado', 'streaming'):
+                elapsed, peak_mb = measure(path_name, raw_path, tmp_dir, args.chunksize)
+                print(f"{n_rows:>8} {csv_mb:>9.1f} {path_name:>10} {elapsed:>10.2f} {peak_mb:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# transdevs_techexperience/benchmarks/benchmark_leadership.py
+
+import sys
+import os
+import argparse
+import logging
+import time
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from src.config import LEADERSHIP_SENTIMENT_COLS
+from src.analysis.leadership_analysis import compute_aptitude_matrix, solve_leader_assignment
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def build_candidates(n_candidates: int, groups: list, n_topics: int = 5, seed: int = 42) -> pd.DataFrame:
+    """Candidatos sintéticos com preferências, tópico principal e sentimentos sorteados."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'participant_id': np.arange(1, n_candidates + 1),
+        'grupo_principal': rng.choice(groups, n_candidates),
+        'grupo_alternativo': rng.choice(groups + ['Não tenho interesse por nenhuma outra opção'], n_candidates),
+        'main_topic': rng.integers(1, n_topics + 1, n_candidates),
+    })
+    for col in LEADERSHIP_SENTIMENT_COLS:
+        df[col] = rng.choice(['Positivo', 'Neutro', 'Negativo'], n_candidates)
+    return df
+
+def legacy_scores(df: pd.DataFrame, groups: list, topic_map: dict) -> tuple:
+    """Laço anterior: iterrows() por candidato, laço pelos grupos e sentimento recalculado a cada grupo."""
+    best_groups, best_scores = [], []
+    for _, row in df.iterrows():
+        best_score, best_group = -1, 'N/A'
+        for group in groups:
+            score = 0.0
+            if row['grupo_principal'] == group:
+                score += 0.5
+            elif row['grupo_alternativo'] == group:
+                score += 0.3
+            if int(row['main_topic']) in topic_map:
+                score += topic_map[int(row['main_topic'])].get(group, 0.0) * 0.7
+            sentiment = 0
+            for col in LEADERSHIP_SENTIMENT_COLS:
+                if row[col] == 'Positivo':
+                    sentiment += 1
+                elif row[col] == 'Negativo':
+                    sentiment -= 1
+            score += sentiment * 0.1
+            if score > best_score:
+                best_score, best_group = score, group
+        best_groups.append(best_group)
+        best_scores.append(best_score)
+    return best_groups, best_scores
+
+def vectorized_scores(df: pd.DataFrame, groups: list, topic_map: dict) -> tuple:
+    """Motor atual: matriz de aptidão em NumPy e argmax por linha."""
+    aptitude = compute_aptitude_matrix(df, groups, topic_map)
+    best = aptitude.argmax(axis=1)
+    return np.asarray(groups, dtype=object)[best], aptitude[np.arange(len(aptitude)), best]
+
+def legacy_greedy_assignment(df: pd.DataFrame, groups: list, capacity: int) -> int:
+    """Atribuição anterior dos líderes diretos: ordem das respostas, principal e depois alternativa. Retorna quantos foram alocados."""
+    free_slots = dict.fromkeys(groups, capacity)
+    assigned = 0
+    for principal, alternative in zip(df['grupo_principal'], df['grupo_alternativo']):
+        for group in (principal, alternative):
+            if free_slots.get(group, 0) > 0:
+                free_slots[group] -= 1
+                assigned += 1
+                break
+    return assigned
+
+def optimal_assignment(df: pd.DataFrame, groups: list, capacity: int, topic_map: dict) -> int:
+    """Motor atual: atribuição de custo mínimo sobre a matriz de aptidão. Retorna quantos foram alocados."""
+    group_array = np.asarray(groups, dtype=object)
+    eligible = (df['grupo_principal'].to_numpy(dtype=object)[:, None] == group_array) | \
+               (df['grupo_alternativo'].to_numpy(dtype=object)[:, None] == group_array)
+    assignment = solve_leader_assignment(compute_aptitude_matrix(df, groups, topic_map), eligible, np.full(len(groups), capacity))
+    return int((assignment >= 0).sum())
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o scoring de aptidão (iterrows x vetorizado) e a atribuição de líderes (gulosa x ótima).")
+    parser.add_argument('--candidates', type=int, nargs='+', default=[1_000, 10_000], help="Quantidades de candidatos sintéticos.")
+    parser.add_argument('--groups', type=int, nargs='+', default=[4, 40], help="Quantidades de grupos.")
+    parser.add_argument('--leaders', type=int, default=500, help="Candidatos a líder direto na comparação da atribuição.")
+    parser.add_argument('--assignment-groups', type=int, nargs='+', default=[100, 300], help="Quantidades de grupos na comparação da atribuição.")
+    args = parser.parse_args()
+
+    print(f"{'candidatos':>10} {'grupos':>7} {'iterrows (s)':>13} {'vetorizado (s)':>15} {'mesmo resultado':>16}")
+    for n_groups in args.groups:
+        groups = [f'G{i + 1}' for i in range(n_groups)]
+        rng = np.random.default_rng(n_groups)
+        topic_map = {topic: dict(zip(groups, rng.uniform(0.2, 0.9, n_groups).round(1))) for topic in range(1, 6)}
+        for n_candidates in args.candidates:
+            df = build_candidates(n_candidates, groups)
+            start = time.perf_counter()
+            legacy_groups, legacy_best = legacy_scores(df, groups, topic_map)
+            legacy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            new_groups, new_best = vectorized_scores(df, groups, topic_map)
+            new_time = time.perf_counter() - start
+            same = list(legacy_groups) == list(new_groups) and np.allclose(legacy_best, new_best)
+            print(f"{n_candidates:>10} {n_groups:>7} {legacy_time:>13.3f} {new_time:>15.4f} {str(same):>16}")
+
+    # Atribuição de líderes diretos: o candidato compete pelas vagas dos seus grupos principal e alternativo
+    print(f"\n{'candidatos':>10} {'grupos':>7} {'vagas/grupo':>12} {'guloso (alocados)':>18} {'ótimo (alocados)':>17} {'ótimo (ms)':>11}")
+    for n_groups in args.assignment_groups:
+        groups = [f'G{i + 1}' for i in range(n_groups)]
+        topic_map = {topic: dict.fromkeys(groups, 0.5) for topic in range(1, 6)}
+        for capacity in (1, 2):
+            df = build_candidates(args.leaders, groups)
+            greedy_count = legacy_greedy_assignment(df, groups, capacity)
+            start = time.perf_counter()
+            optimal_count = optimal_assignment(df, groups, capacity, topic_map)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"{args.leaders:>10} {n_groups:>7} {capacity:>12} {greedy_count:>18} {optimal_count:>17} {elapsed_ms:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# transdevs_techexperience/benchmarks/benchmark_lemmatization.py
+
+import sys
+import os
+import argparse
+import logging
+import tempfile
+import time
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from src.config import TEXT_COLUMNS_FOR_NLP, PROCESSED_DATA_PATH, SPACY_BATCH_SIZE, SPACY_N_PROCESS
+from src.storage import read_dataset
+from src.analysis.nlp_processing import (correct_typos_and_standardize, clean_text, tokenize_and_lemmatize, lemmatize_text_columns,
+                                         get_lemma_cache, set_lemma_cache_path, get_nlp)
+from benchmarks.common import unique_marker
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def build_benchmark_frame(n_rows: int) -> pd.DataFrame:
+    """
+    Monta um DataFrame com n_rows respostas, replicando os participantes processados com uma palavra única por texto
+    (senão os dois caminhos lematizariam só as poucas respostas distintas), já com as colunas '{col}_cleaned' prontas para a lematização.
+    """
+    df = read_dataset(PROCESSED_DATA_PATH)
+    repeats = -(-n_rows // len(df)) # Divisão com arredondamento para cima
+    df = pd.concat([df] * repeats, ignore_index=True).iloc[:n_rows]
+    for pos, col in enumerate(TEXT_COLUMNS_FOR_NLP):
+        if col in df.columns:
+            texts = df[col].apply(correct_typos_and_standardize).apply(clean_text)
+            df[f'{col}_cleaned'] = [f"{text} {unique_marker(pos * n_rows + i)}".strip() for i, text in enumerate(texts)]
+    return df
+
+def run_per_row(df: pd.DataFrame) -> float:
+    """Caminho antigo: uma chamada nlp(text) por célula via Series.apply (com a gravação do cache de lemmas)."""
+    start = time.perf_counter()
+    for col in TEXT_COLUMNS_FOR_NLP:
+        if f'{col}_cleaned' in df.columns:
+            df[f'{col}_cleaned'].apply(tokenize_and_lemmatize)
+    lemma_cache = get_lemma_cache()
+    if lemma_cache is not None:
+        lemma_cache.flush()
+    return time.perf_counter() - start
+
+def run_batched(df: pd.DataFrame, batch_size: int, n_process: int) -> float:
+    """Caminho novo: todas as colunas em um único fluxo nlp.pipe."""
+    start = time.perf_counter()
+    lemmatize_text_columns(df, TEXT_COLUMNS_FOR_NLP, batch_size=batch_size, n_process=n_process)
+    return time.perf_counter() - start
+
+def run_cold_and_warm(run, cache_path: str) -> tuple:
+    """
+    Mede um caminho com um cache de lemmas novo e vazio (frio: tudo passa pelo spaCy) e de novo com o cache
+    que ele gravou, reaberto sem a camada em memória (quente: como numa nova execução sobre as mesmas respostas).
+    """
+    set_lemma_cache_path(cache_path)
+    cold = run()
+    set_lemma_cache_path(cache_path)
+    return cold, run()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara a lematização por linha com a lematização em lote (nlp.pipe), com o cache de lemmas frio e quente. "
+                    "Cada caminho usa um cache temporário próprio; o cache do projeto não é lido nem alterado.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 5000], help="Quantidades de respostas a testar.")
+    parser.add_argument('--batch-size', type=int, default=SPACY_BATCH_SIZE)
+    parser.add_argument('--n-process', type=int, default=SPACY_N_PROCESS)
+    args = parser.parse_args()
+
+    get_nlp() # A carga do modelo não entra nas medições
+    print(f"{'linhas':>8} {'textos':>8} {'linha frio (s)':>15} {'lote frio (s)':>14} {'speedup frio':>13} "
+          f"{'linha quente (s)':>17} {'lote quente (s)':>16}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for n_rows in args.rows:
+            df = build_benchmark_frame(n_rows)
+            n_texts = sum(f'{col}_cleaned' in df.columns for col in TEXT_COLUMNS_FOR_NLP) * len(df)
+            row_cold, row_warm = run_cold_and_warm(lambda: run_per_row(df), os.path.join(cache_dir, f'por_linha_{n_rows}.sqlite'))
+            batch_cold, batch_warm = run_cold_and_warm(lambda: run_batched(df, args.batch_size, args.n_process),
+                                                       os.path.join(cache_dir, f'lote_{n_rows}.sqlite'))
+            print(f"{n_rows:>8} {n_texts:>8} {row_cold:>15.2f} {batch_cold:>14.2f} {row_cold / batch_cold:>12.1f}x "
+                  f"{row_warm:>17.2f} {batch_warm:>16.2f}")
+        set_lemma_cache_path(os.path.join(cache_dir, 'fechado.sqlite')) # Fecha o último cache antes de apagar a pasta
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# transdevs_techexperience/benchmarks/benchmark_parallel_text.py
+
+import sys
+import os
+import argparse
+import logging
+import tempfile
+import time
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from src.config import PROCESSED_DATA_PATH, TEXT_COLUMNS_FOR_NLP, TEXT_PROCESSING_CHUNK_SIZE
+from src.storage import read_dataset
+from src.analysis.eda import clean_text_columns
+from src.analysis.nlp_processing import lemmatize_text_columns, process_text_columns_parallel, score_sentiment_lemmas, get_nlp, set_lemma_cache_path
+from benchmarks.common import unique_marker
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def run_sequential(df: pd.DataFrame, text_columns: list) -> tuple:
+    """Caminho sequencial de process_and_analyze_text_columns: limpeza, lematização em um fluxo e sentimento por coluna."""
+    cleaned_df = clean_text_columns(df, text_columns)
+    lemmas_df = lemmatize_text_columns(cleaned_df, text_columns)
+    column_sentiment = {col: score_sentiment_lemmas(lemmas_df[f'{col}_lemmas']) for col in text_columns if f'{col}_lemmas' in lemmas_df.columns}
+    return cleaned_df, lemmas_df, column_sentiment
+
+def build_responses(df_base: pd.DataFrame, n_rows: int, text_columns: list, run: int) -> pd.DataFrame:
+    """Replica as respostas reais até n_rows linhas e acrescenta a cada texto uma palavra única da rodada."""
+    df = df_base.iloc[np.arange(n_rows) % len(df_base)].reset_index(drop=True)
+    offset = run * n_rows * len(text_columns)
+    for pos, col in enumerate(text_columns):
+        markers = [unique_marker(offset + pos * n_rows + i) for i in range(n_rows)]
+        df[col] = [f"{text} {marker}" if isinstance(text, str) else marker for text, marker in zip(df[col], markers)]
+    return df
+
+def same_output(sequential: tuple, parallel: tuple) -> bool:
+    """Compara textos limpos, lemmas e sentimento das duas execuções."""
+    cleaned_seq, lemmas_seq, sentiment_seq = sequential
+    cleaned_par, lemmas_par, sentiment_par = parallel
+    return (cleaned_seq.equals(cleaned_par) and lemmas_seq.equals(lemmas_par)
+            and all(sentiment_seq[col].equals(sentiment_par[col]) for col in sentiment_seq))
+
+def run_benchmark(args):
+    """Conferência de equivalência nos dados reais e medições sequencial x pool para cada tamanho."""
+    df_base = read_dataset(PROCESSED_DATA_PATH)
+    text_columns = [col for col in TEXT_COLUMNS_FOR_NLP if col in df_base.columns]
+    get_nlp() # A carga do modelo no processo principal não entra nas medições do caminho sequencial
+
+    # Conferência de equivalência nos dados reais: a saída paralela é idêntica à sequencial
+    sequential = run_sequential(df_base, text_columns)
+    for n_workers in args.workers:
+        parallel = process_text_columns_parallel(df_base, text_columns, n_workers=n_workers, chunk_size=max(len(df_base) // 3, 1))
+        print(f"Saída com {n_workers} processos idêntica à sequencial: {'sim' if same_output(sequential, parallel) else 'NÃO'}")
+
+    print(f"\nNúcleos disponíveis: {os.cpu_count()}")
+    print(f"{'linhas':>8} {'processos':>10} {'sequencial (s)':>15} {'paralelo (s)':>13} {'speedup':>8}")
+    run = 0
+    for n_rows in args.rows:
+        run += 1
+        df = build_responses(df_base, n_rows, text_columns, run)
+        start = time.perf_counter()
+        run_sequential(df, text_columns)
+        sequential_seconds = time.perf_counter() - start
+        for n_workers in args.workers:
+            run += 1
+            df = build_responses(df_base, n_rows, text_columns, run)
+            start = time.perf_counter()
+            process_text_columns_parallel(df, text_columns, n_workers=n_workers, chunk_size=args.chunk_size)
+            parallel_seconds = time.perf_counter() - start # Inclui criar o pool e carregar o spaCy em cada processo
+            print(f"{n_rows:>8} {n_workers:>10} {sequential_seconds:>15.2f} {parallel_seconds:>13.2f} {sequential_seconds / parallel_seconds:>7.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara o processamento das colunas de texto (typos, limpeza, lematização e sentimento) sequencial "
+                    "e em pool de processos. Cada medição usa respostas replicadas com uma palavra única por texto, "
+                    "então tudo passa pelo spaCy. Usa um cache de lemmas temporário (também nos processos do pool); "
+                    "o cache do projeto não é lido nem alterado.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 5_000], help="Quantidades de participantes (respostas replicadas).")
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4], help="Quantidades de processos do pool.")
+    parser.add_argument('--chunk-size', type=int, default=TEXT_PROCESSING_CHUNK_SIZE, help="Linhas de uma coluna por bloco.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Os processos do pool recebem o mesmo caminho (initargs de process_text_columns_parallel)
+        set_lemma_cache_path(os.path.join(cache_dir, 'lemma_cache.sqlite'))
+        try:
+            run_benchmark(args)
+        finally:
+            set_lemma_cache_path(os.path.join(cache_dir, 'fechado.sqlite')) # Fecha o cache temporário antes de apagar a pasta
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# transdevs_techexperience/benchmarks/benchmark_preprocessing.py
+
+import sys
+import os
+import argparse
+import logging
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from src.config import ORIGINAL_COL_NAMES, CONSCIENCIA_OPTIONS, EXCLUSION_CRITERIA
+from src.data_ingestion import load_raw_data
+from src.data_processing import preprocess_data
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger().setLevel(logging.WARNING)
+
+def build_raw_frame(n_rows: int) -> pd.DataFrame:
+    """Replica as respostas brutas reais (como lidas pela ingestão) até n_rows linhas."""
+    df = load_raw_data()
+    repeats = -(-n_rows // len(df)) # Divisão com arredondamento para cima
+    return pd.concat([df] * repeats, ignore_index=True).iloc[:n_rows]
+
+def legacy_chain(df: pd.DataFrame) -> tuple:
+    """Cadeia anterior: cada etapa começa com df.copy() e a visão de consciência é mais uma cópia."""
+    df_renamed = df.copy().rename(columns={k: v for k, v in ORIGINAL_COL_NAMES.items() if k in df.columns})
+    df_pii = df_renamed.copy()
+    df_pii['participant_id'] = df_pii.index + 1
+    pii_mapping_df = df_pii[['participant_id', 'nome_completo']].copy()
+    df_pii = df_pii.drop(columns=['nome_completo']).drop(columns=['telefone_whatsapp'])
+    df_conscience = df_pii.copy()
+    df_conscience['consciencia_escopo_padronizada'] = df_conscience['consciencia_escopo'].map(CONSCIENCIA_OPTIONS)
+    df_conscience['consciencia_escopo_padronizada'] = df_conscience['consciencia_escopo_padronizada'].fillna('Outros/Não Mapeado')
+    df_processed_for_conscience = df_conscience.copy()
+    df_copy = df_conscience.copy()
+    df_active = df_copy[df_copy['consciencia_escopo_padronizada'] != CONSCIENCIA_OPTIONS[EXCLUSION_CRITERIA]].copy()
+    return df_processed_for_conscience, df_active, pii_mapping_df
+
+def fused(df: pd.DataFrame) -> tuple:
+    """Motor atual: preprocess_data com copy-on-write."""
+    return preprocess_data(df, save_pii_mapping=False)
+
+PATHS = {'cadeia antiga': legacy_chain, 'copy-on-write': fused}
+
+def _run_in_child(path_name: str, n_rows: int) -> tuple:
+    df = build_raw_frame(n_rows)
+    start = time.perf_counter()
+    PATHS[path_name](df)
+    elapsed = time.perf_counter() - start
+
+    # Pico medido à parte: o tracemalloc deixa a execução mais lenta
+    tracemalloc.start()
+    PATHS[path_name](df)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak_bytes / 1024 ** 2
+
+def measure(path_name: str, n_rows: int) -> tuple:
+    """
+    Executa o pré-processamento em um processo novo e retorna (tempo em s, pico de memória alocada em MB).
+    O pico conta só o que o pré-processamento aloca além do DataFrame bruto de entrada.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_in_child, path_name, n_rows).result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a cadeia antiga de pré-processamento com o motor copy-on-write.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 400_000], help="Quantidades de respostas sintéticas.")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'caminho':>14} {'tempo (s)':>10} {'pico alocado (MB)':>18}")
+    for n_rows in args.rows:
+        for name in PATHS:
+            elapsed, peak_mb = measure(name, n_rows)
+            print(f"{n_rows:>8} {name:>14} {elapsed:>10.3f} {peak_mb:>18.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# transdevs_techexperience/benchmarks/benchmark_storage.py
+
+import sys
+import os
+import argparse
+import logging
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from src.config import EDA_FINAL_PATH
+from src.storage import read_dataset, read_dataset_columns, write_dataset, dataset_path
+from src.app.utils import DASHBOARD_EDA_COLUMNS
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger().setLevel(logging.WARNING)
+
+def build_eda_frame(n_rows: int) -> pd.DataFrame:
+    """Replica a saída real da EDA até n_rows participantes (com participant_id único)."""
+    df = read_dataset(EDA_FINAL_PATH)
+    repeats = -(-n_rows // len(df)) # Divisão com arredondamento para cima
+    df = pd.concat([df] * repeats, ignore_index=True).iloc[:n_rows]
+    df['participant_id'] = range(1, len(df) + 1)
+    return df
+
+def load_csv_legacy(base_path: str) -> pd.DataFrame:
+    """Caminho antigo do dashboard: CSV inteiro, listas continuam como texto."""
+    return pd.read_csv(dataset_path(base_path, 'csv'))
+
+def load_with_storage(base_path: str, storage_format: str) -> pd.DataFrame:
+    """Caminho novo do dashboard (load_dashboard_data): projeção de colunas, listas nativas e categorias."""
+    columns = [col for col in read_dataset_columns(base_path, storage_format) if col in DASHBOARD_EDA_COLUMNS or col.endswith('_sentiment')]
+    return read_dataset(base_path, columns=columns, as_category=True, storage_format=storage_format)
+
+LOADERS = {
+    'csv (legado)': load_csv_legacy,
+    'csv (storage)': lambda base_path: load_with_storage(base_path, 'csv'),
+    'parquet': lambda base_path: load_with_storage(base_path, 'parquet'),
+}
+
+def _run_in_child(loader_name: str, base_path: str) -> tuple:
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = LOADERS[loader_name](base_path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak_kb - baseline_kb) / 1024, df.memory_usage(deep=True).sum() / 1024 ** 2, df.shape[1]
+
+def measure(loader_name: str, base_path: str) -> tuple:
+    """
+    Carrega o dataset em um processo novo e retorna (tempo em s, aumento do pico de RSS em MB,
+    memória do DataFrame em MB, colunas carregadas).
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_in_child, loader_name, base_path).result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o carregamento da EDA pelo dashboard em CSV e em Parquet.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000], help="Quantidades de participantes sintéticos.")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'formato':>14} {'arquivo (MB)':>13} {'leitura (s)':>12} {'pico RSS (MB)':>14} {'DataFrame (MB)':>15} {'colunas':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path = os.path.join(tmp_dir, 'eda_final_data.csv')
+        for n_rows in args.rows:
+            df = build_eda_frame(n_rows)
+            sizes = {fmt: os.path.getsize(write_dataset(df, base_path, fmt)) / 1024 ** 2 for fmt in ('csv', 'parquet')}
+            for name in LOADERS:
+                elapsed, peak_mb, frame_mb, n_cols = measure(name, base_path)
+                file_mb = sizes['parquet' if name == 'parquet' else 'csv']
+                print(f"{n_rows:>8} {name:>14} {file_mb:>13.1f} {elapsed:>12.2f} {peak_mb:>14.1f} {frame_mb:>15.1f} {n_cols:>8}")
+
+if __name__ == "__main__":
+    main()
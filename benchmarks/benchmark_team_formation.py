@@ -0,0 +1,86 @@
+# transdevs_techexperience/benchmarks/benchmark_team_formation.py
+
+import sys
+import os
+import argparse
+import logging
+import time
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from src.config import NO_ALTERNATIVE_OPTION, GROUP_OPTIONS_SEPARATOR
+from src.analysis.leadership_analysis import group_options_matrix
+from src.analysis.team_formation import compute_team_costs, solve_team_assignment
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def build_participants(n_participants: int, groups: list, n_topics: int = 5, seed: int = 42) -> pd.DataFrame:
+    """
+    Participantes sintéticos: grupo principal concentrado nos primeiros grupos (como nas respostas reais),
+    de zero a dois grupos alternativos e tópico principal sorteado.
+    """
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, len(groups) + 1)
+    principal = rng.choice(groups, n_participants, p=popularity / popularity.sum())
+    alternatives = []
+    for n_alternatives in rng.integers(0, 3, n_participants):
+        options = rng.choice(groups, n_alternatives, replace=False)
+        alternatives.append(GROUP_OPTIONS_SEPARATOR.join(options) if n_alternatives else NO_ALTERNATIVE_OPTION)
+    return pd.DataFrame({
+        'participant_id': np.arange(1, n_participants + 1),
+        'grupo_principal': principal,
+        'grupo_alternativo': alternatives,
+        'main_topic': rng.integers(1, n_topics + 1, n_participants),
+    })
+
+def greedy_assignment(df: pd.DataFrame, groups: list, capacities: np.ndarray) -> np.ndarray:
+    """Alocação manual, na ordem das respostas: grupo principal e, se lotado, o primeiro alternativo com vaga."""
+    principal = group_options_matrix(df['grupo_principal'], groups)
+    alternative = group_options_matrix(df['grupo_alternativo'], groups)
+    free_slots = capacities.copy()
+    assignment = np.full(len(df), -1)
+    for i in range(len(df)):
+        for candidates in (principal[i], alternative[i]):
+            open_groups = np.flatnonzero(candidates & (free_slots > 0))
+            if len(open_groups):
+                assignment[i] = open_groups[0]
+                free_slots[open_groups[0]] -= 1
+                break
+    return assignment
+
+def summarize(assignment: np.ndarray, principal: np.ndarray) -> tuple:
+    """(alocados, no grupo principal)."""
+    assigned = assignment >= 0
+    return int(assigned.sum()), int(principal[np.flatnonzero(assigned), assignment[assigned]].sum())
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a formação de equipes de custo mínimo e compara com a alocação gulosa na ordem das respostas.")
+    parser.add_argument('--participants', type=int, nargs='+', default=[1_000, 10_000, 50_000], help="Quantidades de participantes sintéticos.")
+    parser.add_argument('--groups', type=int, nargs='+', default=[4, 40], help="Quantidades de grupos.")
+    parser.add_argument('--slack', type=float, default=1.05, help="Vagas totais / participantes (vagas iguais entre os grupos).")
+    args = parser.parse_args()
+
+    print(f"{'participantes':>13} {'grupos':>7} {'guloso (alocados/principal)':>28} {'ótimo (alocados/principal)':>27} {'ótimo (s)':>10}")
+    for n_groups in args.groups:
+        groups = [f'G{i + 1}' for i in range(n_groups)]
+        for n_participants in args.participants:
+            df = build_participants(n_participants, groups)
+            capacities = np.full(n_groups, int(np.ceil(args.slack * n_participants / n_groups)))
+            start = time.perf_counter()
+            direct_costs, open_costs, open_row, principal, _, _ = compute_team_costs(df, groups, topic_aptitude_map={})
+            optimal = solve_team_assignment(direct_costs, capacities, open_costs, open_row)
+            elapsed = time.perf_counter() - start
+            greedy = greedy_assignment(df, groups, capacities)
+            greedy_assigned, greedy_principal = summarize(greedy, principal)
+            optimal_assigned, optimal_principal = summarize(optimal, principal)
+            print(f"{n_participants:>13} {n_groups:>7} {f'{greedy_assigned}/{greedy_principal}':>28} "
+                  f"{f'{optimal_assigned}/{optimal_principal}':>27} {elapsed:>10.3f}")
+
+if __name__ == "__main__":
+    main()
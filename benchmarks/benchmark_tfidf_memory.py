@@ -0,0 +1,93 @@
+# transdevs_techexperience/benchmarks/benchmark_tfidf_memory.py
+
+import sys
+import os
+import argparse
+import logging
+import time
+import resource
+from concurrent.futures import ProcessPoolExecutor
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+
+from src.config import TEXT_COLUMNS_FOR_NLP, PROCESSED_DATA_PATH
+from src.storage import read_dataset
+from src.analysis.nlp_processing import correct_typos_and_standardize, clean_text, vectorize_text_tfidf, apply_topic_modeling_lda
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger().setLevel(logging.WARNING)
+
+def build_synthetic_responses(n_docs: int, seed: int = 42) -> pd.Series:
+    """
+    Gera n_docs respostas sintéticas sorteando palavras do vocabulário real das respostas processadas,
+    com o mesmo tamanho médio de texto combinado por participante.
+    """
+    df = read_dataset(PROCESSED_DATA_PATH)
+    cols = [col for col in TEXT_COLUMNS_FOR_NLP if col in df.columns]
+    combined = df[cols].fillna('').agg(' '.join, axis=1).apply(correct_typos_and_standardize).apply(clean_text)
+    words = np.array(' '.join(combined).split())
+    mean_len = max(int(combined.str.split().str.len().mean()), 1)
+
+    rng = np.random.default_rng(seed)
+    lengths = rng.poisson(mean_len, n_docs).clip(1)
+    tokens = rng.choice(words, lengths.sum())
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return pd.Series([' '.join(tokens[bounds[i]:bounds[i + 1]]) for i in range(n_docs)])
+
+def _run_in_child(path_name: str, texts: pd.Series, num_topics: int, max_iter: int) -> tuple:
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    PATHS[path_name](texts, num_topics, max_iter)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak_kb - baseline_kb) / 1024
+
+def measure(path_name: str, texts: pd.Series, num_topics: int, max_iter: int) -> tuple:
+    """
+    Executa um caminho em um processo novo e retorna (tempo em s, aumento do pico de RSS em MB).
+    Um processo por medição garante que o pico de um caminho não contamine o outro.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_in_child, path_name, texts, num_topics, max_iter).result()
+
+def dense_path(texts: pd.Series, num_topics: int, max_iter: int):
+    """Caminho antigo: TF-IDF densificado em um DataFrame de até 1000 colunas antes do LDA."""
+    vectorizer = TfidfVectorizer(max_features=1000)
+    tfidf_matrix = vectorizer.fit_transform(texts)
+    tfidf_df = pd.DataFrame(tfidf_matrix.toarray(), columns=vectorizer.get_feature_names_out())
+    lda_model = LatentDirichletAllocation(n_components=num_topics, random_state=42, learning_method='batch', max_iter=max_iter)
+    lda_model.fit(tfidf_df)
+    return lda_model.transform(tfidf_df)
+
+def sparse_path(texts: pd.Series, num_topics: int, max_iter: int):
+    """Caminho novo: CSR do vetorizador ao transform, usando as funções do projeto."""
+    vectorizer, tfidf_matrix, _ = vectorize_text_tfidf(texts, persist=False)
+    lda_model, _ = apply_topic_modeling_lda(tfidf_matrix, vectorizer.get_feature_names_out(), num_topics=num_topics, persist=False, max_iter=max_iter)
+    return lda_model.transform(tfidf_matrix)
+
+PATHS = {'denso': dense_path, 'esparso': sparse_path}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara memória e tempo do caminho TF-IDF -> LDA denso e esparso.")
+    parser.add_argument('--docs', type=int, nargs='+', default=[10_000, 100_000], help="Quantidades de respostas sintéticas.")
+    parser.add_argument('--topics', type=int, default=5)
+    parser.add_argument('--max-iter', type=int, default=1, help="Passadas do LDA (o pico de memória não depende disso; o tempo sim).")
+    args = parser.parse_args()
+
+    print(f"{'docs':>8} {'caminho':>8} {'tempo (s)':>10} {'pico RSS (MB)':>14}")
+    for n_docs in args.docs:
+        texts = build_synthetic_responses(n_docs)
+        for name in PATHS:
+            elapsed, peak_mb = measure(name, texts, args.topics, args.max_iter)
+            print(f"{n_docs:>8} {name:>8} {elapsed:>10.2f} {peak_mb:>14.1f}")
+
+if __name__ == "__main__":
+    main()
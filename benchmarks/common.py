@@ -0,0 +1,12 @@
+# transdevs_techexperience/benchmarks/common.py
+
+import string
+
+def unique_marker(position: int) -> str:
+    """Palavra sem sentido e única por posição (base 26), para nenhuma resposta replicada vir do cache de lemmas."""
+    letters = ''
+    while True:
+        position, remainder = divmod(position, 26)
+        letters = string.ascii_lowercase[remainder] + letters
+        if position == 0:
+            return 'zq' + letters
@@ -0,0 +1,171 @@
+# transdevs_techexperience/benchmarks/load_test_dashboard.py
+
+import sys
+import os
+import argparse
+import logging
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import SYNTHETIC_DATA_DIR, SYNTHETIC_DATA_SEED, TEXT_COLUMNS_FOR_NLP, DASHBOARD_LATENCY_BUDGET_MS
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger().setLevel(logging.ERROR) # Os estágios registram um aviso por participante em alguns casos (ex: líderes sem vaga)
+
+APP_PATH = os.path.join(project_root, 'src', 'app', 'main.py')
+CREDENTIALS = {'username': 'carga', 'password': 'carga'}
+NGRAM_RADIO_LABEL = "Selecione o tipo de unidade para a nuvem de palavras:"
+NGRAM_SECTION = 'Perfis e Tópicos'
+KINDS = list(DASHBOARD_LATENCY_BUDGET_MS)
+
+def prepare_dashboard_data(n_rows: int, seed: int = SYNTHETIC_DATA_SEED, rebuild: bool = False) -> tuple:
+    """
+    Gera o pacote de agregados do dashboard e o mapeamento de PII de uma exportação sintética de n_rows respostas,
+    em SYNTHETIC_DATA_DIR/dashboard_<n_rows>_seed<seed>/ (reaproveitados se já existirem na versão atual do pacote).
+    Os dados e o cache de lemmas do projeto não são tocados.
+
+    Returns:
+        tuple: (caminho do pacote, caminho base do mapeamento de PII).
+    """
+    from src.storage import write_dataset, dataset_exists
+    from src.synthetic_data import write_synthetic_survey
+    from src.data_ingestion import load_raw_data
+    from src.data_processing import preprocess_data
+    from src.analysis.eda import process_and_analyze_text_columns
+    from src.analysis.nlp_processing import set_lemma_cache_path
+    from src.analysis.leadership_analysis import analyze_leadership_potential
+    from src.analysis.team_formation import form_teams
+    from src.analysis.ngram_index import NgramIndex
+    from src.dashboard_bundle import build_dashboard_bundle, write_dashboard_bundle, read_dashboard_bundle
+
+    data_dir = os.path.join(SYNTHETIC_DATA_DIR, f'dashboard_{n_rows}_seed{seed}')
+    bundle_path = os.path.join(data_dir, 'dashboard_bundle.json')
+    pii_path = os.path.join(data_dir, 'anonymized_pii_mapping.csv')
+    if not rebuild and os.path.exists(bundle_path) and dataset_exists(pii_path):
+        try:
+            read_dashboard_bundle(bundle_path)
+            return bundle_path, pii_path
+        except ValueError: # Pacote de uma versão anterior do formato: gera de novo
+            pass
+
+    set_lemma_cache_path(os.path.join(SYNTHETIC_DATA_DIR, 'lemma_cache.sqlite'))
+    _, df_active, df_pii = preprocess_data(load_raw_data(write_synthetic_survey(n_rows, seed=seed)), save_pii_mapping=False)
+    df_eda = process_and_analyze_text_columns(df_active, TEXT_COLUMNS_FOR_NLP, topic_mode='batch', persist=False)
+    df_leadership = analyze_leadership_potential(df_eda, df_pii)
+    df_teams = form_teams(df_eda, df_leadership)
+    write_dashboard_bundle(build_dashboard_bundle(df_eda, df_leadership, df_teams, NgramIndex.build(df_eda)), bundle_path)
+    write_dataset(df_pii, pii_path)
+    return bundle_path, pii_path
+
+def session_steps(at):
+    """
+    Roteiro de uma sessão: abre o dashboard, entra pelo formulário de login (usuário e senha, um rerun cada, como no navegador),
+    visita todas as seções e, em 'Perfis e Tópicos', escolhe cada opção de n-gram da nuvem de palavras.
+    Cada passo prepara a interação e devolve o seu tipo; quem chama executa o rerun (at.run) e mede o tempo.
+    """
+    yield 'abertura'
+    at.text_input(key='username').input(CREDENTIALS['username'])
+    yield 'login'
+    at.text_input(key='password').input(CREDENTIALS['password'])
+    yield 'login'
+    if not at.session_state['password_correct']:
+        raise RuntimeError("Login recusado pelo check_password.")
+    for section in at.radio(key='dashboard_section').options:
+        at.radio(key='dashboard_section').set_value(section)
+        yield 'seção'
+    at.radio(key='dashboard_section').set_value(NGRAM_SECTION)
+    yield 'seção'
+    ngram_options = next(radio for radio in at.radio if radio.label == NGRAM_RADIO_LABEL).options
+    for option in [*ngram_options[1:], ngram_options[0]]: # A primeira opção já está selecionada: termina voltando a ela
+        next(radio for radio in at.radio if radio.label == NGRAM_RADIO_LABEL).set_value(option)
+        yield 'n-gram'
+
+def _run_sessions(bundle_path: str, pii_path: str, n_sessions: int) -> tuple:
+    """
+    Executa o roteiro em n_sessions sessões do dashboard (AppTest) neste processo, alternando um passo de cada sessão
+    (as sessões ficam abertas e compartilham os caches do Streamlit, como num servidor).
+
+    Returns:
+        tuple: ({tipo de interação: [latências do rerun em ms]}, pico de RSS do processo em MB, aumento do pico durante as sessões em MB).
+    """
+    # Avisos do Streamlit fora de um servidor: a cada sessão ('missing ScriptRunContext', ao preencher secrets fora de um rerun)
+    # e ao importar os caches do dashboard antes da primeira sessão ('No runtime found')
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').disabled = True
+    logging.getLogger('streamlit.runtime.caching.cache_data_api').disabled = True
+    from streamlit.testing.v1 import AppTest
+    from src.app.utils import set_dashboard_data_paths
+
+    set_dashboard_data_paths(bundle_path, pii_path)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = {kind: [] for kind in KINDS}
+    sessions = []
+    for _ in range(n_sessions):
+        at = AppTest.from_file(APP_PATH, default_timeout=300)
+        at.secrets['user_credentials'] = CREDENTIALS
+        sessions.append((at, session_steps(at)))
+    while sessions:
+        for at, steps in list(sessions):
+            kind = next(steps, None)
+            if kind is None:
+                sessions.remove((at, steps))
+                continue
+            start = time.perf_counter()
+            at.run()
+            latencies[kind].append((time.perf_counter() - start) * 1000)
+            if at.exception:
+                raise RuntimeError(f"Erro no dashboard ({kind}): {[e.value for e in at.exception]}")
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return latencies, peak_kb / 1024, (peak_kb - baseline_kb) / 1024
+
+def run_load_test(n_rows: int, n_sessions: int, seed: int = SYNTHETIC_DATA_SEED, rebuild: bool = False) -> tuple:
+    """
+    Prepara os dados sintéticos e executa as sessões, cada etapa em um processo novo: a memória medida é só a do dashboard
+    (sem o spaCy e os DataFrames da preparação) e os caches do Streamlit começam vazios a cada tamanho.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        bundle_path, pii_path = executor.submit(prepare_dashboard_data, n_rows, seed, rebuild).result()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_sessions, bundle_path, pii_path, n_sessions).result()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Teste de carga do dashboard sem navegador: sessões (AppTest) entram pelo login, trocam de seção e de n-gram "
+                    "sobre dados sintéticos de tamanhos crescentes; mostra os percentis de latência dos reruns e o pico de memória "
+                    "e falha se o p95 de algum tipo de interação passar do orçamento (DASHBOARD_LATENCY_BUDGET_MS).")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000], help="Tamanhos das exportações sintéticas.")
+    parser.add_argument('--sessions', type=int, default=5, help="Sessões abertas ao mesmo tempo, com passos alternados.")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="Orçamento de p95 (ms) para todos os tipos de interação (padrão: DASHBOARD_LATENCY_BUDGET_MS).")
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_DATA_SEED, help="Semente das exportações sintéticas.")
+    parser.add_argument('--rebuild', action='store_true', help="Gera de novo os dados do dashboard mesmo se já existirem.")
+    args = parser.parse_args()
+
+    budgets = {kind: args.budget_ms or budget for kind, budget in DASHBOARD_LATENCY_BUDGET_MS.items()}
+    over_budget = 0
+    print(f"{'linhas':>8} {'interação':>10} {'reruns':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'máx (ms)':>9} {'orçamento':>10} {'situação':>10}")
+    for n_rows in args.rows:
+        latencies, peak_mb, sessions_mb = run_load_test(n_rows, args.sessions, args.seed, args.rebuild)
+        for kind in KINDS:
+            values = np.array(latencies[kind])
+            if values.size == 0:
+                continue
+            p50, p95 = np.percentile(values, [50, 95])
+            status = 'ESTOURO' if p95 > budgets[kind] else 'ok'
+            over_budget += status == 'ESTOURO'
+            print(f"{n_rows:>8} {kind:>10} {values.size:>7} {p50:>9.0f} {p95:>9.0f} {values.max():>9.0f} {budgets[kind]:>10.0f} {status:>10}")
+        print(f"{n_rows:>8} {'memória':>10} pico RSS {peak_mb:.1f} MB, {sessions_mb:+.1f} MB durante as {args.sessions} sessões")
+
+    if over_budget:
+        print(f"\n{over_budget} tipo(s) de interação acima do orçamento de latência (p95).")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
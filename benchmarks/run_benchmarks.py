@@ -0,0 +1,216 @@
+# transdevs_techexperience/benchmarks/run_benchmarks.py
+
+import sys
+import os
+import argparse
+import gc
+import json
+import logging
+import platform
+import resource
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Adiciona o diretório raiz do projeto ao sys.path para que 'src' seja reconhecido como um pacote
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import TEXT_COLUMNS_FOR_NLP, TEXT_PROCESSING_N_WORKERS
+from src.storage import read_dataset, write_dataset
+from src.synthetic_data import write_synthetic_survey
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger().setLevel(logging.ERROR) # Os estágios registram um aviso por participante em alguns casos (ex: líderes sem vaga)
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Estágios na ordem do pipeline; cada um lê a saída do anterior, gravada na pasta de trabalho
+STAGES = ['load_raw_data', 'preprocess_data', 'process_and_analyze_text_columns', 'lda', 'analyze_leadership_potential']
+
+RSS_SAMPLE_INTERVAL = 0.005 # Segundos entre leituras do RSS durante um estágio
+
+def _prepare_and_run(stage: str, raw_path: str, work_dir: str, n_workers: int):
+    """
+    Prepara as entradas do estágio (fora da medição) e devolve uma função sem argumentos que executa o estágio
+    e grava a sua saída para o estágio seguinte.
+    """
+    from src.data_ingestion import load_raw_data
+    from src.data_processing import preprocess_data
+    from src.analysis.eda import process_and_analyze_text_columns, combine_cleaned_text, fit_topic_model
+    from src.analysis.nlp_processing import vectorize_text_tfidf, set_lemma_cache_path, get_nlp, get_sentiment_lexicon_index
+    from src.analysis.leadership_analysis import analyze_leadership_potential
+
+    active_path = os.path.join(work_dir, 'processed_participants.csv')
+    eda_path = os.path.join(work_dir, 'eda_final_data.csv')
+    if stage == 'load_raw_data':
+        return lambda: load_raw_data(raw_path)
+    if stage == 'preprocess_data':
+        df_raw = load_raw_data(raw_path)
+        return lambda: write_dataset(preprocess_data(df_raw, save_pii_mapping=False)[1], active_path)
+    if stage == 'process_and_analyze_text_columns':
+        # Cache de lemmas próprio e vazio a cada medição: mede o processamento a frio, sem mexer no cache do projeto
+        lemma_cache_path = os.path.join(work_dir, 'lemma_cache.sqlite')
+        if os.path.exists(lemma_cache_path):
+            os.remove(lemma_cache_path)
+        set_lemma_cache_path(lemma_cache_path)
+        get_nlp() # A carga do modelo spaCy não entra na medição
+        get_sentiment_lexicon_index()
+        df_active = read_dataset(active_path)
+        return lambda: write_dataset(process_and_analyze_text_columns(df_active, TEXT_COLUMNS_FOR_NLP, n_workers=n_workers, persist=False), eda_path)
+    if stage == 'lda':
+        df_eda = read_dataset(eda_path, columns=[f'{col}_cleaned' for col in TEXT_COLUMNS_FOR_NLP])
+        texts = combine_cleaned_text(df_eda)
+        def run_lda():
+            tfidf_vectorizer, tfidf_matrix, _ = vectorize_text_tfidf(texts, persist=False)
+            return fit_topic_model(tfidf_vectorizer, tfidf_matrix, persist=False)
+        return run_lda
+    if stage == 'analyze_leadership_potential':
+        df_eda = read_dataset(eda_path)
+        return lambda: analyze_leadership_potential(df_eda)
+    raise ValueError(f"Estágio desconhecido: '{stage}'. Use um de {STAGES}.")
+
+def _current_rss_kb() -> int:
+    """RSS atual do processo em KB (lido de /proc; None fora do Linux)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return None
+
+def _sample_peak_rss(peak: dict, stop: threading.Event):
+    while not stop.wait(RSS_SAMPLE_INTERVAL):
+        peak['kb'] = max(peak['kb'], _current_rss_kb())
+
+def _run_in_child(stage: str, raw_path: str, work_dir: str, n_workers: int) -> tuple:
+    run = _prepare_and_run(stage, raw_path, work_dir, n_workers)
+    gc.collect()
+    start_kb = _current_rss_kb()
+    maxrss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = {'kb': start_kb or 0}
+    stop = threading.Event()
+    sampler = threading.Thread(target=_sample_peak_rss, args=(peak, stop), daemon=True)
+    if start_kb is not None:
+        sampler.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if start_kb is not None:
+        sampler.join()
+    maxrss_after_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if start_kb is None: # Sem /proc: só o crescimento da marca máxima do processo (zero se o estágio ficar abaixo dela)
+        own_mb = (maxrss_after_kb - maxrss_before_kb) / 1024
+    else: # Se a marca máxima subiu, ela é o pico exato; senão vale o maior RSS amostrado
+        own_mb = (max(peak['kb'], maxrss_after_kb if maxrss_after_kb > maxrss_before_kb else 0) - start_kb) / 1024
+    # Processos do pool do processamento de texto (n_workers > 1): o maior pico entre eles, vezes n_workers (rodam juntos)
+    pool_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024 * n_workers
+    return elapsed, max(own_mb, 0.0) + pool_mb
+
+def measure(stage: str, raw_path: str, work_dir: str, n_workers: int) -> tuple:
+    """
+    Executa um estágio em um processo novo e retorna (tempo em s, pico de memória do estágio em MB).
+    O pico é o maior RSS durante o estágio (amostrado a cada RSS_SAMPLE_INTERVAL) menos o RSS no início,
+    então conta só o que o estágio aloca além das suas entradas e do spaCy (já carregados antes da medição).
+    Com o pool de processos (n_workers > 1), soma n_workers vezes o pico do maior processo do pool (limite superior).
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_in_child, stage, raw_path, work_dir, n_workers).result()
+
+def machine_info() -> dict:
+    return {'platform': platform.platform(), 'python': platform.python_version(), 'cpu_count': os.cpu_count()}
+
+def baseline_profile(n_workers: int) -> str:
+    """
+    Perfil das linhas de base: número de CPUs da máquina e processos do processamento de texto.
+    Tempo e memória absolutos só são comparados com linhas de base do mesmo perfil.
+    """
+    return f"{os.cpu_count()}cpu-{n_workers}workers"
+
+def load_baselines(file_path: str = BASELINES_PATH) -> dict:
+    """Linhas de base gravadas, por perfil: {perfil: {'machine': ..., 'results': {estágio: {linhas: {'seconds', 'peak_mb'}}}}}."""
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baselines(results: dict, profile: str, file_path: str = BASELINES_PATH) -> str:
+    """Grava as medições como novas linhas de base do perfil (mantém as de outros perfis e as de estágios e tamanhos não medidos agora)."""
+    baselines = load_baselines(file_path)
+    entry = baselines.setdefault(profile, {'results': {}})
+    for stage, by_rows in results.items():
+        entry['results'].setdefault(stage, {}).update(by_rows)
+    entry['machine'] = machine_info()
+    entry['generated_at'] = datetime.now().isoformat(timespec='seconds')
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2)
+    return file_path
+
+def compare(measured: dict, baseline: dict, tolerance: float, min_seconds: float, min_mb: float) -> str:
+    """
+    Situação de uma medição frente à linha de base: 'REGRESSÃO' se o tempo ou o pico de memória passarem
+    de (1 + tolerance) x a base e a diferença absoluta passar de min_seconds / min_mb (evita alarmes por ruído).
+    """
+    if baseline is None:
+        return 'sem base'
+    slower = measured['seconds'] > baseline['seconds'] * (1 + tolerance) and measured['seconds'] - baseline['seconds'] > min_seconds
+    heavier = measured['peak_mb'] > baseline['peak_mb'] * (1 + tolerance) and measured['peak_mb'] - baseline['peak_mb'] > min_mb
+    if slower or heavier:
+        return 'REGRESSÃO' + (' (tempo)' if slower and not heavier else ' (memória)' if heavier and not slower else '')
+    return 'ok'
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede tempo e pico de memória de cada estágio do pipeline sobre exportações sintéticas do formulário "
+                    "(src/synthetic_data.py) e compara com as linhas de base gravadas em benchmarks/baselines.json.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000],
+                        help="Tamanhos das exportações sintéticas (ex: 1000 10000 100000 1000000).")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES,
+                        help="Estágios medidos (os anteriores são executados sem medição para gerar as entradas).")
+    parser.add_argument('--repeat', type=int, default=1, help="Medições por estágio; vale a menor (menos ruído).")
+    parser.add_argument('--workers', type=int, default=TEXT_PROCESSING_N_WORKERS, help="Processos do processamento de texto.")
+    parser.add_argument('--tolerance', type=float, default=0.3, help="Piora relativa tolerada antes de acusar regressão.")
+    parser.add_argument('--min-seconds', type=float, default=0.05, help="Piora absoluta mínima de tempo para acusar regressão.")
+    parser.add_argument('--min-mb', type=float, default=20.0, help="Piora absoluta mínima de memória para acusar regressão.")
+    parser.add_argument('--save-baseline', action='store_true', help="Grava as medições como novas linhas de base.")
+    parser.add_argument('--baselines', default=BASELINES_PATH, help="Arquivo das linhas de base.")
+    args = parser.parse_args()
+
+    profile = baseline_profile(args.workers)
+    all_baselines = load_baselines(args.baselines)
+    baselines = all_baselines.get(profile, {}).get('results', {})
+    if not baselines:
+        print(f"Aviso: sem linhas de base para o perfil {profile} (gravadas: {', '.join(all_baselines) or 'nenhuma'}); "
+              f"use --save-baseline para gravá-las nesta máquina.\n")
+
+    last_stage = max(STAGES.index(stage) for stage in args.stages)
+    results = {}
+    regressions = 0
+    print(f"{'estágio':>33} {'linhas':>8} {'tempo (s)':>10} {'base (s)':>9} {'pico RSS (MB)':>14} {'base (MB)':>10} {'situação':>12}")
+    for n_rows in args.rows:
+        raw_path = write_synthetic_survey(n_rows)
+        with tempfile.TemporaryDirectory() as work_dir:
+            for stage in STAGES[:last_stage + 1]:
+                runs = [measure(stage, raw_path, work_dir, args.workers) for _ in range(args.repeat if stage in args.stages else 1)]
+                if stage not in args.stages:
+                    continue
+                measured = {'seconds': round(min(seconds for seconds, _ in runs), 4), 'peak_mb': round(min(mb for _, mb in runs), 1)}
+                results.setdefault(stage, {})[str(n_rows)] = measured
+                baseline = baselines.get(stage, {}).get(str(n_rows))
+                status = compare(measured, baseline, args.tolerance, args.min_seconds, args.min_mb)
+                regressions += status.startswith('REGRESSÃO')
+                base_seconds = f"{baseline['seconds']:.2f}" if baseline else '-'
+                base_mb = f"{baseline['peak_mb']:.1f}" if baseline else '-'
+                print(f"{stage:>33} {n_rows:>8} {measured['seconds']:>10.2f} {base_seconds:>9} {measured['peak_mb']:>14.1f} {base_mb:>10} {status:>12}")
+
+    if args.save_baseline:
+        print(f"\nLinhas de base do perfil {profile} gravadas em {save_baselines(results, profile, args.baselines)}")
+    if regressions:
+        print(f"\n{regressions} regressão(ões) acima de {args.tolerance:.0%} da linha de base.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# transdevs_techexperience/run_all.py
+
+import argparse
+import logging
+from src.tracing import tracing_session
+from src.pipeline import run_pipeline, STAGE_NAMES
+from src.config import PIPELINE_CACHE_DIR
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Executa o pipeline completo (ETL, NLP, tópicos, sentimento, liderança, equipes e pacote do dashboard) "
+                    "como um grafo de estágios. Estágios cujas entradas, código e configuração não mudaram são reaproveitados do cache.")
+    parser.add_argument('--until', nargs='+', choices=STAGE_NAMES, metavar='ESTÁGIO',
+                        help=f"Executa só esses estágios e as suas dependências. Estágios: {', '.join(STAGE_NAMES)}.")
+    parser.add_argument('--force', nargs='+', choices=STAGE_NAMES + ['all'], default=[], metavar='ESTÁGIO',
+                        help="Executa esses estágios mesmo com o cache válido ('all' para todos).")
+    parser.add_argument('--cache-dir', default=PIPELINE_CACHE_DIR, help="Pasta do cache dos estágios.")
+    parser.add_argument('--trace', nargs='?', const='', metavar='ARQUIVO',
+                        help="Grava um trace dos estágios e funções (tempo, CPU, memória e linhas) no formato do Chrome "
+                             "(chrome://tracing ou ui.perfetto.dev); sem ARQUIVO, grava em data/traces/.")
+    return parser.parse_args()
+
+def run(args):
+    """
+    Ponto de entrada único do pipeline: substitui executar run_pipeline.py e depois run_eda.py
+    (os dois continuam disponíveis para os modos incremental e de inferência).
+    """
+    logging.info("Iniciando o pipeline completo do TransDevs TechExperience.")
+    try:
+        report = run_pipeline(targets=args.until, force=args.force, cache_dir=args.cache_dir)
+    except (FileNotFoundError, ValueError) as e:
+        logging.error(f"Pipeline interrompido: {e}")
+        return
+
+    print(f"\n{'estágio':>12} {'situação':>12} {'tempo (s)':>10}")
+    for row in report:
+        print(f"{row['stage']:>12} {row['status']:>12} {row['seconds']:>10.2f}")
+    logging.info("Pipeline completo concluído.")
+
+def main():
+    args = parse_args()
+    with tracing_session(args.trace, label='all'):
+        run(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,54 @@
 # transdevs_techexperience/run_eda.py
 
+import argparse
 import logging
-from src.analysis.eda import load_processed_data, analyze_categorical_distributions, process_and_analyze_text_columns
+from src.tracing import tracing_session
+from src.analysis.eda import load_processed_data, analyze_categorical_distributions, process_and_analyze_text_columns, log_top_ngrams
 from src.analysis.leadership_analysis import analyze_leadership_potential, load_pii_mapping
-import os
+from src.analysis.team_formation import form_teams
+from src.analysis.ngram_index import NgramIndex
 import pandas as pd
-from src.config import PROCESSED_DATA_PATH, EDA_FINAL_PATH, LEADERSHIP_ANALYSIS_PATH
+from src.model_registry import load_manifest
+from src.storage import write_dataset
+from src.dashboard_bundle import build_dashboard_bundle, write_dashboard_bundle
+from src.incremental import select_delta_rows, merge_by_participant
+from src.config import (PROCESSED_DATA_PATH, EDA_FINAL_PATH, LEADERSHIP_ANALYSIS_PATH, TEAM_FORMATION_PATH, TOPIC_MODEL_MODE, LDA_ARTIFACT_NAME,
+                        TEXT_PROCESSING_N_WORKERS)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Executa a EDA avançada (NLP, tópicos, sentimento e liderança).")
+    parser.add_argument('--topic-mode', choices=['batch', 'incremental', 'inference'], default=TOPIC_MODEL_MODE,
+                        help="'batch' re-treina o LDA do zero; 'incremental' atualiza o modelo salvo só com participantes novos; "
+                             "'inference' reaproveita a última EDA e só aplica os modelos salvos (transform) nos participantes novos.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Processa só os participantes novos ou editados (hash do conteúdo) e mescla na última EDA. "
+                             "Os tópicos do delta usam os modelos salvos ('inference', ou partial_fit com --topic-mode incremental).")
+    parser.add_argument('--workers', type=int, default=TEXT_PROCESSING_N_WORKERS,
+                        help="Processos para limpeza, lematização e sentimento das colunas de texto (1 = sequencial).")
+    parser.add_argument('--trace', nargs='?', const='', metavar='ARQUIVO',
+                        help="Grava um trace dos estágios e funções (tempo, CPU, memória e linhas) no formato do Chrome "
+                             "(chrome://tracing ou ui.perfetto.dev); sem ARQUIVO, grava em data/traces/.")
+    return parser.parse_args()
+
+def split_rows_for_update(df_active_participants: pd.DataFrame, df_previous_eda: pd.DataFrame) -> tuple:
+    """
+    Separa os participantes ativos entre os que já estão na última saída da EDA com o mesmo conteúdo
+    (reaproveitados como estão) e os novos ou editados, que passam pelo pipeline de texto.
+
+    Returns:
+        tuple: (linhas reaproveitadas da EDA anterior, participantes a processar).
+    """
+    if df_previous_eda.empty:
+        return pd.DataFrame(), df_active_participants
+    delta_mask = select_delta_rows(df_active_participants, df_previous_eda)
+    df_delta = df_active_participants[delta_mask]
+    df_reused = df_previous_eda[df_previous_eda['participant_id'].isin(df_active_participants['participant_id'][~delta_mask])]
+    logging.info(f"{len(df_reused)} participantes reaproveitados da última EDA, {len(df_delta)} novos ou editados a processar.")
+    return df_reused, df_delta
+
+def run(args):
     """
     Função principal para executar a Análise Exploratória de Dados (EDA) avançada.
     """
@@ -28,26 +67,75 @@ def main():
 
     # 3. Processamento e análise das colunas de texto livre (NLP, Tópicos, Sentimento)
     logging.info("\n--- Processamento e Análise de Campos de Texto Livre (NLP, Tópicos, Sentimento) ---")
-    df_final_eda = process_and_analyze_text_columns(df_active_participants, ['objetivo_proposito', 'expectativas_experiencia', 'bagagem_contribuicao', 'contribuicao_grupo', 'compromisso_pessoal', 'expectativas_pos_projeto'])
-    
+    text_columns = ['objetivo_proposito', 'expectativas_experiencia', 'bagagem_contribuicao', 'contribuicao_grupo', 'compromisso_pessoal', 'expectativas_pos_projeto']
+    if args.topic_mode == 'inference' and load_manifest(LDA_ARTIFACT_NAME) is None:
+        logging.warning("Nenhum modelo LDA no registro. Executando a EDA completa em modo 'batch'.")
+        args.topic_mode = 'batch'
+
+    df_previous_eda = load_processed_data(EDA_FINAL_PATH) if (args.incremental or args.topic_mode != 'batch') else pd.DataFrame()
+    if args.incremental and ('main_topic' not in df_previous_eda.columns or load_manifest(LDA_ARTIFACT_NAME) is None):
+        logging.warning("Sem EDA anterior ou sem modelo LDA no registro. Executando a EDA completa.")
+        args.incremental = False
+
+    if args.incremental or args.topic_mode == 'inference':
+        # Só os participantes novos ou editados passam por limpeza, lematização, tópicos e sentimento;
+        # os tópicos do delta usam os modelos salvos (transform, ou partial_fit no modo 'incremental')
+        df_reused, df_delta = split_rows_for_update(df_active_participants, df_previous_eda)
+        delta_topic_mode = 'incremental' if args.topic_mode == 'incremental' else 'inference'
+        df_delta_eda = process_and_analyze_text_columns(df_delta, text_columns, topic_mode=delta_topic_mode,
+                                                        n_workers=args.workers) if not df_delta.empty else pd.DataFrame()
+        df_final_eda = merge_by_participant(df_reused, df_delta_eda, df_delta['participant_id'])
+    else:
+        new_rows_mask = None
+        if args.topic_mode == 'incremental' and not df_previous_eda.empty:
+            # Participantes novos ou editados desde a última saída da EDA são os documentos novos do LDA
+            new_rows_mask = select_delta_rows(df_active_participants, df_previous_eda)
+            logging.info(f"{int(new_rows_mask.sum())} participantes novos ou editados desde a última execução da EDA.")
+        df_final_eda = process_and_analyze_text_columns(df_active_participants, text_columns,
+                                                        topic_mode=args.topic_mode, new_rows_mask=new_rows_mask,
+                                                        n_workers=args.workers)
+
     # Salvar o DataFrame final da EDA para uso no Streamlit
-    os.makedirs(os.path.dirname(EDA_FINAL_PATH), exist_ok=True) # Garante que a pasta existe
-    df_final_eda.to_csv(EDA_FINAL_PATH, index=False)
-    logging.info(f"Dados finais da EDA (com NLP, tópicos, sentimento) salvos em: {EDA_FINAL_PATH}")
+    saved_path = write_dataset(df_final_eda, EDA_FINAL_PATH)
+    logging.info(f"Dados finais da EDA (com NLP, tópicos, sentimento) salvos em: {saved_path}")
 
     # 4. Análise de Potencial de Liderança
     logging.info("\n--- Análise de Potencial de Liderança ---")
+    # A atribuição de líderes depende de todos os participantes juntos, então é sempre recalculada sobre a EDA completa
     df_pii = load_pii_mapping() # Carrega PII mapping para referência interna segura
     df_leadership_insights = analyze_leadership_potential(df_final_eda, df_pii)
     
     if not df_leadership_insights.empty:
-        os.makedirs(os.path.dirname(LEADERSHIP_ANALYSIS_PATH), exist_ok=True) # Garante que a pasta existe
-        df_leadership_insights.to_csv(LEADERSHIP_ANALYSIS_PATH, index=False)
-        logging.info(f"Insights de liderança salvos em: {LEADERSHIP_ANALYSIS_PATH}")
+        saved_path = write_dataset(df_leadership_insights, LEADERSHIP_ANALYSIS_PATH)
+        logging.info(f"Insights de liderança salvos em: {saved_path}")
     else:
         logging.warning("Nenhum insight de liderança gerado.")
 
+    # 5. Formação de Equipes (todos os participantes, com os líderes já alocados nos seus grupos)
+    logging.info("\n--- Formação de Equipes ---")
+    df_teams = form_teams(df_final_eda, df_leadership_insights)
+    if not df_teams.empty:
+        saved_path = write_dataset(df_teams, TEAM_FORMATION_PATH)
+        logging.info(f"Equipes formadas salvas em: {saved_path}")
+    else:
+        logging.warning("Nenhuma equipe formada.")
+
+    # 6. Índice de n-grams (contagens por resposta, com facetas de grupo, sentimento e pergunta para a nuvem de palavras)
+    ngram_index = NgramIndex.build(df_final_eda)
+    log_top_ngrams(ngram_index)
+    saved_path = ngram_index.save()
+    logging.info(f"Índice de n-grams salvo em: {saved_path}")
+
+    # 7. Pacote de agregados do dashboard (contagens e tabelas prontas; o app só lê e desenha)
+    saved_path = write_dashboard_bundle(build_dashboard_bundle(df_final_eda, df_leadership_insights, df_teams, ngram_index))
+    logging.info(f"Pacote de agregados do dashboard salvo em: {saved_path}")
+
     logging.info("Análise Exploratória de Dados avançada concluída.")
 
+def main():
+    args = parse_args()
+    with tracing_session(args.trace, label='eda'):
+        run(args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
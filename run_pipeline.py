@@ -1,58 +1,115 @@
 # transdevs_techexperience/run_pipeline.py
 
+import argparse
 import pandas as pd
 import logging
 import os
-from src.data_ingestion import load_raw_data
-from src.data_processing import preprocess_data
-from src.config import PROCESSED_DATA_PATH # Importa o caminho para salvar os dados processados
+from src.tracing import tracing_session
+from src.data_ingestion import iter_raw_data_chunks
+from src.data_processing import preprocess_data, preprocess_data_in_chunks
+from src.storage import read_dataset, write_dataset, dataset_path
+from src.incremental import load_pipeline_state, save_pipeline_state, detect_changed_rows, responses_removed, merge_by_participant
+from src.config import PROCESSED_DATA_PATH, ANONYMIZED_PII_PATH, CONSCIENCE_SUMMARY_PATH # Importa o caminho para salvar os dados processados
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Executa o pipeline ETL inicial (carregamento, PII, consciência e filtro de ativos).")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Processa só as respostas novas ou editadas desde a última execução e mescla nas saídas existentes.")
+    parser.add_argument('--trace', nargs='?', const='', metavar='ARQUIVO',
+                        help="Grava um trace dos estágios e funções (tempo, CPU, memória e linhas) no formato do Chrome "
+                             "(chrome://tracing ou ui.perfetto.dev); sem ARQUIVO, grava em data/traces/.")
+    return parser.parse_args()
+
+def load_previous_output(file_path: str) -> pd.DataFrame:
+    """Carrega uma saída anterior do pipeline, ou um DataFrame vazio se ela ainda não existir."""
+    try:
+        return read_dataset(file_path)
+    except FileNotFoundError:
+        return pd.DataFrame()
+
+def read_changed_rows(df_state: pd.DataFrame):
+    """
+    Lê o CSV bruto em blocos e guarda só as respostas novas ou editadas desde a última execução.
+
+    Returns:
+        pd.DataFrame | None: Respostas a processar, ou None se for preciso reprocessar tudo
+                             (formulário sem respostas ou com respostas removidas).
+    """
+    delta_chunks = []
+    n_responses = 0
+    for chunk in iter_raw_data_chunks():
+        delta_chunks.append(chunk[detect_changed_rows(chunk, df_state)])
+        n_responses += len(chunk)
+    if n_responses == 0 or responses_removed(n_responses, df_state):
+        return None
+    return pd.concat(delta_chunks)
+
+def run(args):
     """
     Função principal para executar o pipeline de processamento de dados inicial.
     """
     logging.info("Iniciando o pipeline de processamento de dados do TransDevs TechExperience.")
 
-    # 1. Carregar dados brutos
-    raw_df = load_raw_data()
-    if raw_df.empty:
-        logging.error("Não foi possível carregar os dados brutos. Encerrando o pipeline.")
-        return
+    # 1. Carregar dados brutos em blocos e 2. pré-processar (renomear, PII, consciência, filtrar ativos)
+    # Cada resposta chega com o hash do seu conteúdo: acompanha a linha até as saídas e permite detectar edições
+    df_state = load_pipeline_state() if args.incremental else pd.DataFrame()
+    if args.incremental and df_state.empty:
+        logging.info("Sem estado anterior: todas as respostas serão processadas.")
+    raw_delta = read_changed_rows(df_state) if not df_state.empty else None
 
-    # 2. Pré-processar dados (renomear, PII, consciência, filtrar ativos)
-    # df_for_conscience_analysis: inclui todos, para análise da coluna 'consciencia_escopo'
-    # df_active_participants: apenas quem quer continuar, com PII tratadas
-    # pii_mapping: mapeamento de ID para nome (manter seguro!)
-    df_for_conscience_analysis, df_active_participants, pii_mapping = preprocess_data(raw_df)
-    
-    if df_active_participants.empty:
-        logging.warning("Nenhum participante ativo encontrado após o pré-processamento. Verifique os dados e critérios.")
-    
-    # 3. Salvar dados processados (participantes ativos)
-    if not df_active_participants.empty:
-        os.makedirs(os.path.dirname(PROCESSED_DATA_PATH), exist_ok=True) # Garante que a pasta existe
-        df_active_participants.to_csv(PROCESSED_DATA_PATH, index=False)
-        logging.info(f"Dados dos participantes ativos salvos em: {PROCESSED_DATA_PATH}")
+    if raw_delta is None:
+        # Execução completa em streaming: saídas gravadas bloco a bloco (participantes ativos, PII e estado)
+        n_responses, n_active, conscience_counts = preprocess_data_in_chunks(iter_raw_data_chunks())
+        if n_responses == 0:
+            logging.error("Não foi possível carregar os dados brutos. Encerrando o pipeline.")
+            return
+        if n_active == 0:
+            logging.warning("Nenhum participante ativo encontrado após o pré-processamento. Verifique os dados e critérios.")
+            logging.info("Nenhum dado de participante ativo para salvar.")
+        else:
+            logging.info(f"Dados dos participantes ativos salvos em: {dataset_path(PROCESSED_DATA_PATH)} ({n_active} participantes).")
+    elif raw_delta.empty:
+        logging.info("Nenhuma resposta nova ou editada desde a última execução. Saídas mantidas como estão.")
+        return
     else:
-        logging.info("Nenhum dado de participante ativo para salvar.")
+        # Só o delta passa pelo pré-processamento; o resultado substitui as linhas desses participantes nas saídas
+        # df_delta_conscience: inclui todos, para análise da coluna 'consciencia_escopo'
+        # df_delta_active: apenas quem quer continuar, com PII tratadas
+        # pii_delta: mapeamento de ID para nome (manter seguro!)
+        df_delta_conscience, df_delta_active, pii_delta = preprocess_data(raw_delta, save_pii_mapping=False)
+        delta_ids = df_delta_conscience['participant_id']
+        df_for_conscience_analysis = merge_by_participant(df_state, df_delta_conscience, delta_ids)
+        df_active_participants = merge_by_participant(load_previous_output(PROCESSED_DATA_PATH), df_delta_active, delta_ids)
+        pii_mapping = merge_by_participant(load_previous_output(ANONYMIZED_PII_PATH), pii_delta, delta_ids)
+        saved_path = write_dataset(pii_mapping, ANONYMIZED_PII_PATH)
+        logging.info(f"Mapeamento de PII atualizado com {len(pii_delta)} respostas em: {saved_path}. **MANTENHA ESTE ARQUIVO EXTREMAMENTE SEGURO!**")
+        save_pipeline_state(df_for_conscience_analysis)
+
+        # 3. Salvar dados processados (participantes ativos)
+        if not df_active_participants.empty:
+            saved_path = write_dataset(df_active_participants, PROCESSED_DATA_PATH)
+            logging.info(f"Dados dos participantes ativos salvos em: {saved_path}")
+        else:
+            logging.warning("Nenhum participante ativo encontrado após o pré-processamento. Verifique os dados e critérios.")
+        conscience_counts = df_for_conscience_analysis['consciencia_escopo_padronizada'].value_counts()
 
     # 4. Exemplo de análise da consciência (primeira análise quantitativa)
     logging.info("\n--- Resumo Quantitativo da Consciência do Escopo do Projeto ---")
-    if 'consciencia_escopo_padronizada' in df_for_conscience_analysis.columns:
-        conscience_counts = df_for_conscience_analysis['consciencia_escopo_padronizada'].value_counts()
-        logging.info(f"\n{conscience_counts}")
-        
-        # Salvar essa informação em um CSV separado para o dashboard
-        conscience_summary_path = os.path.join(os.path.dirname(PROCESSED_DATA_PATH), 'conscience_summary.csv')
-        os.makedirs(os.path.dirname(conscience_summary_path), exist_ok=True) # Garante que a pasta existe
-        conscience_counts.to_csv(conscience_summary_path)
-        logging.info(f"Resumo da consciência salvo em: {conscience_summary_path}")
-    else:
-        logging.warning("Coluna 'consciencia_escopo_padronizada' não encontrada para análise de consciência.")
+    logging.info(f"\n{conscience_counts}")
+
+    # Salvar essa informação em um CSV separado para o dashboard
+    os.makedirs(os.path.dirname(CONSCIENCE_SUMMARY_PATH), exist_ok=True) # Garante que a pasta existe
+    conscience_counts.to_csv(CONSCIENCE_SUMMARY_PATH)
+    logging.info(f"Resumo da consciência salvo em: {CONSCIENCE_SUMMARY_PATH}")
 
     logging.info("Pipeline de processamento de dados inicial concluído.")
 
+def main():
+    args = parse_args()
+    with tracing_session(args.trace, label='pipeline'):
+        run(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,46 +1,49 @@
 # transdevs_techexperience/src/analysis/eda.py
 
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
 import re
 import logging
-from collections import Counter
 from src.config import (
     PROCESSED_DATA_PATH, TEXT_COLUMNS_FOR_NLP, TYPO_CORRECTION_MAP,
-    OVERALL_SENTIMENT_COL # IMPORTADO CORRETAMENTE AQUI
+    OVERALL_SENTIMENT_COL, # IMPORTADO CORRETAMENTE AQUI
+    SPACY_BATCH_SIZE, SPACY_N_PROCESS, TOPIC_MODEL_MODE,
+    TEXT_PROCESSING_N_WORKERS, TEXT_PROCESSING_CHUNK_SIZE
 )
+from src.storage import read_dataset, dataset_path
 from src.analysis.nlp_processing import (
     correct_typos_and_standardize,
     clean_text,
-    tokenize_and_lemmatize,
-    extract_ngrams,
+    lemmatize_text_columns,
+    process_text_columns_parallel,
     vectorize_text_tfidf,
     apply_topic_modeling_lda,
-    analyze_sentiment,
-    get_ngram_text_for_wordcloud
+    describe_topics,
+    update_topic_model_incremental,
+    load_topic_model_artifacts,
+    score_sentiment_lemmas,
+    combine_sentiment_priority
 )
+from src.analysis.ngram_index import NgramIndex
+from src.tracing import traced
 import numpy as np
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-stop_words_pt = set(stopwords.words('portuguese'))
-
 
 def load_processed_data(file_path: str = PROCESSED_DATA_PATH) -> pd.DataFrame:
     """
-    Carrega o arquivo CSV com os dados já processados (participantes ativos).
+    Carrega um dataset processado (por padrão, os participantes ativos) pela camada de armazenamento (src/storage.py).
     """
     try:
-        logging.info(f"Tentando carregar dados processados de: {file_path}")
-        df = pd.read_csv(file_path)
+        logging.info(f"Tentando carregar dados processados de: {dataset_path(file_path)}")
+        df = read_dataset(file_path)
         logging.info(f"Dados processados carregados com sucesso. Total de {len(df)} registros.")
         return df
     except FileNotFoundError:
-        logging.error(f"Erro: Arquivo não encontrado em {file_path}. Verifique o caminho.")
+        logging.error(f"Erro: Arquivo não encontrado em {dataset_path(file_path)}. Verifique o caminho.")
         return pd.DataFrame()
     except Exception as e:
-        logging.error(f"Ocorreu um erro inesperado ao carregar o CSV de dados processados: {e}")
+        logging.error(f"Ocorreu um erro inesperado ao carregar os dados processados: {e}")
         return pd.DataFrame()
 
 def analyze_categorical_distributions(df: pd.DataFrame, columns: list) -> dict:
@@ -70,101 +73,174 @@ def analyze_categorical_distributions(df: pd.DataFrame, columns: list) -> dict:
             logging.warning(f"Coluna '{col}' não encontrada no DataFrame para análise de distribuição.")
     return results
 
-def process_and_analyze_text_columns(df: pd.DataFrame, text_columns: list) -> pd.DataFrame:
-    """
-    Aplica o pipeline de processamento de texto (limpeza, tokenização, lematização,
-    extração de n-grams, vetorização, modelagem de tópicos e análise de sentimento)
-    e retorna o DataFrame com as novas colunas de texto processado e insights.
-    """
-    df_processed_text = df.copy()
-
+@traced(category='texto')
+def clean_text_columns(df: pd.DataFrame, text_columns: list) -> pd.DataFrame:
+    """Colunas '{col}_cleaned' (typos corrigidos e texto limpo) de cada coluna de texto encontrada em df, com o mesmo índice."""
+    cleaned_df = pd.DataFrame(index=df.index)
     for col in text_columns:
-        if col in df_processed_text.columns:
-            df_processed_text[f'{col}_cleaned'] = df_processed_text[col].apply(correct_typos_and_standardize).apply(clean_text)
+        if col in df.columns:
+            cleaned_df[f'{col}_cleaned'] = df[col].apply(correct_typos_and_standardize).apply(clean_text)
         else:
             logging.warning(f"Coluna de texto '{col}' não encontrada para limpeza.")
+    return cleaned_df
 
-    for col in text_columns:
-        if f'{col}_cleaned' in df_processed_text.columns:
-            df_processed_text[f'{col}_lemmas'] = df_processed_text[f'{col}_cleaned'].apply(tokenize_and_lemmatize)
-        
-    logging.info("\n--- Análise de Palavras e N-grams Mais Comuns (Geral) ---")
-    combined_cleaned_text = df_processed_text[[f'{col}_cleaned' for col in text_columns if f'{col}_cleaned' in df_processed_text.columns]].fillna('').agg(' '.join, axis=1)
-    # combined_lemmas_list_of_lists agora é uma Series onde cada elemento é uma lista de lemmas de um participante
-    combined_lemmas_list_of_lists = df_processed_text[[f'{col}_lemmas' for col in text_columns if f'{col}_lemmas' in df_processed_text.columns]].apply(
-        lambda row: [lemma for sublist in row.values if isinstance(sublist, list) for lemma in sublist], axis=1
-    )
+def combine_lemma_columns(lemmas_df: pd.DataFrame) -> pd.Series:
+    """Lemmas de todas as respostas de cada participante (coluna 'all_lemmas_combined'), a partir das colunas '{col}_lemmas'."""
+    return lemmas_df.apply(lambda row: [lemma for sublist in row.values if isinstance(sublist, list) for lemma in sublist], axis=1)
 
+def combine_cleaned_text(cleaned_df: pd.DataFrame) -> pd.Series:
+    """Texto limpo de todas as respostas de cada participante, usado no TF-IDF e no LDA."""
+    return cleaned_df.fillna('').agg(' '.join, axis=1)
 
-    all_lemmas = [word for sublist in combined_lemmas_list_of_lists for word in sublist]
-    df_processed_text['all_lemmas_combined'] = combined_lemmas_list_of_lists # Guarda a lista de listas para uso futuro (nuvem de palavras)
-    
-    word_counts = Counter(all_lemmas)
-    logging.info(f"As 20 palavras mais comuns combinadas (lemmatized) são:\n{word_counts.most_common(20)}")
-
-    logging.info("\n--- Bigrams mais comuns (Geral) ---")
-    bigrams = extract_ngrams(combined_lemmas_list_of_lists.tolist(), n=2, top_n=15)
-    logging.info(f"Os 15 bigrams mais comuns combinados (lemmatized) são:\n{bigrams}")
-
-    logging.info("\n--- Trigrams mais comuns (Geral) ---")
-    trigrams = extract_ngrams(combined_lemmas_list_of_lists.tolist(), n=3, top_n=15)
-    logging.info(f"Os 15 trigrams mais comuns combinados (lemmatized) são:\n{trigrams}")
-
+@traced(category='lda')
+def fit_topic_model(tfidf_vectorizer, tfidf_matrix, max_topics: int = 5, persist: bool = True, vectorizer_version: str = None) -> tuple:
+    """
+    Treina o LDA em lote sobre a matriz TF-IDF (até max_topics tópicos, limitado pelo número de documentos).
+    Com persist=True o modelo é salvo no registro vinculado a vectorizer_version (a versão do vetorizador que gerou a matriz);
+    com persist=False não é salvo (benchmarks).
 
-    logging.info("\n--- Preparando para Modelagem de Tópicos ---")
-    text_for_topic_modeling = df_processed_text[[f'{col}_cleaned' for col in text_columns if f'{col}_cleaned' in df_processed_text.columns]].fillna('').agg(' '.join, axis=1)
-    
-    tfidf_vectorizer, tfidf_df = vectorize_text_tfidf(text_for_topic_modeling)
-    
-    num_topics = min(5, len(df_processed_text) - 1)
+    Returns:
+        tuple: (lda_model, topics, num_topics). lda_model é None se a matriz estiver vazia.
+    """
+    num_topics = min(max_topics, tfidf_matrix.shape[0] - 1)
     if num_topics < 2:
         logging.warning("Número insuficiente de documentos para modelagem de tópicos significativa. Definindo para 1 tópico para evitar erros.")
-        num_topics = 1 
-        lda_model = None
-        topics = []
-    
-    if not tfidf_df.empty and tfidf_df.shape[1] > 0:
-        lda_model, topics = apply_topic_modeling_lda(tfidf_df, num_topics=num_topics)
-        if lda_model:
-            topic_distribution = lda_model.transform(tfidf_df)
-            for i in range(num_topics):
-                df_processed_text[f'topic_{i+1}_score'] = topic_distribution[:, i]
-            df_processed_text['main_topic'] = topic_distribution.argmax(axis=1) + 1
-            logging.info("\nDistribuição dos principais tópicos pelos participantes:")
-            logging.info(df_processed_text['main_topic'].value_counts())
-    else:
+        num_topics = 1
+    if tfidf_matrix.shape[0] == 0 or tfidf_matrix.shape[1] == 0:
+        return None, [], num_topics
+    lda_model, topics = apply_topic_modeling_lda(tfidf_matrix, tfidf_vectorizer.get_feature_names_out(), num_topics=num_topics, persist=persist,
+                                                 vectorizer_version=vectorizer_version)
+    return lda_model, topics, num_topics
+
+@traced(category='lda')
+def topic_scores_frame(lda_model, tfidf_matrix, num_topics: int, index: pd.Index) -> pd.DataFrame:
+    """Colunas 'topic_{i}_score' e 'main_topic' de cada participante (NaN se não houver modelo ou a matriz estiver vazia)."""
+    if lda_model is None or tfidf_matrix.shape[0] == 0 or tfidf_matrix.shape[1] == 0:
         logging.warning("Matriz TF-IDF vazia ou sem features. Pulando Modelagem de Tópicos (LDA).")
-        for i in range(num_topics):
-            df_processed_text[f'topic_{i+1}_score'] = np.nan
-        df_processed_text['main_topic'] = np.nan
+        scores = {f'topic_{i+1}_score': np.nan for i in range(num_topics)}
+        return pd.DataFrame({**scores, 'main_topic': np.nan}, index=index)
+
+    # A matriz TF-IDF permanece esparsa (CSR) no transform
+    topic_distribution = lda_model.transform(tfidf_matrix)
+    df_topics = pd.DataFrame(topic_distribution[:, :num_topics], index=index, columns=[f'topic_{i+1}_score' for i in range(num_topics)])
+    df_topics['main_topic'] = topic_distribution.argmax(axis=1) + 1
+    logging.info("\nDistribuição dos principais tópicos pelos participantes:")
+    logging.info(df_topics['main_topic'].value_counts())
+    return df_topics
 
+@traced(category='sentimento')
+def compute_text_sentiment(lemmas_df: pd.DataFrame, text_columns: list, column_sentiment: dict = None) -> pd.DataFrame:
+    """
+    Sentimento de cada coluna de texto ('{col}_sentiment' e '{col}_sentiment_score') e o sentimento geral
+    por participante (OVERALL_SENTIMENT_COL e '{OVERALL_SENTIMENT_COL}_score'), a partir das colunas '{col}_lemmas'.
+    column_sentiment ({col: saída de score_sentiment_lemmas}) reaproveita scores já calculados, ex: pelo processamento paralelo.
+    """
     logging.info("\n--- Análise de Sentimento por Coluna ---")
+    # Score numérico (float32) e rótulo por coluna, calculados de forma vetorizada sobre os lemmas já extraídos
+    df_sentiment = pd.DataFrame(index=lemmas_df.index)
+    individual_sentiment_cols = []
     for col in text_columns:
-        if f'{col}_cleaned' in df_processed_text.columns:
-            df_processed_text[f'{col}_sentiment'] = analyze_sentiment(df_processed_text[f'{col}_cleaned'])
-            logging.info(f"Sentimento da coluna '{col}':\n{df_processed_text[f'{col}_sentiment'].value_counts()}")
+        if f'{col}_lemmas' in lemmas_df.columns:
+            if column_sentiment is not None and col in column_sentiment:
+                sentiment_df = column_sentiment[col]
+            else:
+                sentiment_df = score_sentiment_lemmas(lemmas_df[f'{col}_lemmas'])
+            df_sentiment[f'{col}_sentiment'] = sentiment_df['sentimento']
+            df_sentiment[f'{col}_sentiment_score'] = sentiment_df['score']
+            individual_sentiment_cols.append(col)
+            logging.info(f"Sentimento da coluna '{col}':\n{df_sentiment[f'{col}_sentiment'].value_counts()}")
 
     # NOVO: Calcular Sentimento Geral POR PARTICIPANTE, com prioridade para Negativo/Positivo
     logging.info("\n--- Calculando Sentimento Geral por Participante (Prioridade Negativa/Positiva) ---")
     
-    # Obter os nomes das colunas de sentimento geradas individualmente
-    individual_sentiment_cols = [f'{col}_sentiment' for col in text_columns if f'{col}_sentiment' in df_processed_text.columns]
+    # Matriz participantes x colunas com os scores individuais: algum Negativo -> Negativo;
+    # senão algum Positivo -> Positivo; senão Neutro
+    score_matrix = df_sentiment[[f'{col}_sentiment_score' for col in individual_sentiment_cols]].to_numpy(dtype=np.float32)
+    df_sentiment[OVERALL_SENTIMENT_COL] = combine_sentiment_priority(score_matrix)
+    df_sentiment[f'{OVERALL_SENTIMENT_COL}_score'] = score_matrix.mean(axis=1) if individual_sentiment_cols else np.float32(0.0)
+    logging.info(f"Sentimento Geral (por participante com prioridade negativa/positiva):\n{df_sentiment[OVERALL_SENTIMENT_COL].value_counts()}")
+    return df_sentiment
+
+@traced(category='eda')
+def assemble_eda_frame(df: pd.DataFrame, cleaned_df: pd.DataFrame, lemmas_df: pd.DataFrame, df_topics: pd.DataFrame,
+                       df_sentiment: pd.DataFrame) -> pd.DataFrame:
+    """Junta os participantes e as colunas de cada etapa do texto (limpeza, lemmas, tópicos e sentimento) no DataFrame final da EDA."""
+    df_processed_text = pd.concat([df, cleaned_df, lemmas_df], axis=1)
+    df_processed_text['all_lemmas_combined'] = combine_lemma_columns(lemmas_df) # Lemmas de todas as respostas do participante
+    return pd.concat([df_processed_text, df_topics, df_sentiment], axis=1)
+
+def log_top_ngrams(ngram_index: NgramIndex):
+    """Registra no log as palavras, bigrams e trigrams mais comuns (contados por resposta no índice de n-grams)."""
+    logging.info("\n--- Análise de Palavras e N-grams Mais Comuns (Geral) ---")
+    logging.info(f"As 20 palavras mais comuns (lemmatized) são:\n{ngram_index.top_k(1, k=20)}")
+    logging.info(f"Os 15 bigrams mais comuns (lemmatized) são:\n{ngram_index.top_k(2, k=15)}")
+    logging.info(f"Os 15 trigrams mais comuns (lemmatized) são:\n{ngram_index.top_k(3, k=15)}")
+
+@traced(category='eda')
+def process_and_analyze_text_columns(df: pd.DataFrame, text_columns: list, batch_size: int = SPACY_BATCH_SIZE, n_process: int = SPACY_N_PROCESS,
+                                     topic_mode: str = TOPIC_MODEL_MODE, new_rows_mask: pd.Series = None,
+                                     n_workers: int = TEXT_PROCESSING_N_WORKERS, chunk_size: int = TEXT_PROCESSING_CHUNK_SIZE,
+                                     persist: bool = True) -> pd.DataFrame:
+    """
+    Aplica o pipeline de processamento de texto (limpeza, tokenização, lematização,
+    extração de n-grams, vetorização, modelagem de tópicos e análise de sentimento)
+    e retorna o DataFrame com as novas colunas de texto processado e insights.
+    A lematização é feita em lote (nlp.pipe) com batch_size e n_process configuráveis.
+    As mesmas etapas formam os estágios do pipeline completo (src/pipeline.py).
+
+    Com topic_mode='incremental', o vetorizador e o LDA salvos são carregados e atualizados com
+    partial_fit apenas nas linhas marcadas em new_rows_mask (todas, se None), mantendo os IDs dos tópicos.
+    Com topic_mode='inference', o vetorizador e o LDA salvos são carregados do registro (memory-map)
+    e só aplicam transform, sem nenhum treino.
+    Sem modelos salvos, os dois modos voltam para 'batch'.
+
+    Com n_workers > 1, correção de typos, limpeza, lematização e sentimento rodam em um pool de processos,
+    em blocos de chunk_size linhas por coluna (process_text_columns_parallel), com resultado idêntico ao sequencial.
+    Com persist=False o vetorizador e o LDA treinados não são salvos no registro de modelos (benchmarks).
+    """
+    column_sentiment = None
+    if n_workers > 1:
+        cleaned_df, lemmas_df, column_sentiment = process_text_columns_parallel(df, text_columns, n_workers=n_workers,
+                                                                                chunk_size=chunk_size, batch_size=batch_size)
+    else:
+        cleaned_df = clean_text_columns(df, text_columns)
+        # Lematiza todas as colunas em um único fluxo do spaCy (nlp.pipe) em vez de uma chamada por célula
+        lemmas_df = lemmatize_text_columns(cleaned_df, text_columns, batch_size=batch_size, n_process=n_process)
+
+    logging.info("\n--- Preparando para Modelagem de Tópicos ---")
+    text_for_topic_modeling = combine_cleaned_text(cleaned_df)
     
-    def calculate_overall_sentiment_priority(row):
-        # Se algum sentimento individual é Negativo, o geral é Negativo
-        if any(row[col] == "Negativo" for col in individual_sentiment_cols):
-            return "Negativo"
-        # Se não há negativos, mas há algum Positivo, o geral é Positivo
-        elif any(row[col] == "Positivo" for col in individual_sentiment_cols):
-            return "Positivo"
-        # Se não há negativos nem positivos (apenas neutros), é Neutro
+    num_topics = min(5, len(df) - 1)
+    tfidf_vectorizer, lda_model, tfidf_matrix = None, None, None
+    if topic_mode == 'incremental':
+        # Só as respostas novas atualizam o modelo salvo; todas recebem scores com o modelo atualizado
+        new_texts = text_for_topic_modeling if new_rows_mask is None else text_for_topic_modeling[new_rows_mask]
+        tfidf_vectorizer, lda_model, _ = update_topic_model_incremental(new_texts, persist=persist)
+        if lda_model is not None:
+            num_topics = lda_model.n_components
+            tfidf_matrix = tfidf_vectorizer.transform(text_for_topic_modeling).tocsr()
+            describe_topics(lda_model, tfidf_vectorizer.get_feature_names_out())
         else:
-            return "Neutro"
+            logging.warning("Modelos de tópicos salvos não encontrados. Voltando para o treino em lote (batch).")
+    elif topic_mode == 'inference':
+        # Caminho rápido: nenhum treino, só transform com os modelos registrados
+        tfidf_vectorizer, lda_model = load_topic_model_artifacts(mmap=True)
+        if lda_model is not None:
+            num_topics = lda_model.n_components
+            tfidf_matrix = tfidf_vectorizer.transform(text_for_topic_modeling).tocsr()
+            describe_topics(lda_model, tfidf_vectorizer.get_feature_names_out())
+        else:
+            logging.warning("Modelos de tópicos salvos não encontrados. Voltando para o treino em lote (batch).")
+
+    if lda_model is None:
+        tfidf_vectorizer, tfidf_matrix, vectorizer_version = vectorize_text_tfidf(text_for_topic_modeling, persist=persist)
+        lda_model, _, num_topics = fit_topic_model(tfidf_vectorizer, tfidf_matrix, persist=persist, vectorizer_version=vectorizer_version)
+    df_topics = topic_scores_frame(lda_model, tfidf_matrix, num_topics, df.index)
 
-    # Aplicar a função para cada linha (participante)
-    df_processed_text[OVERALL_SENTIMENT_COL] = df_processed_text.apply(calculate_overall_sentiment_priority, axis=1)
-    logging.info(f"Sentimento Geral (por participante com prioridade negativa/positiva):\n{df_processed_text[OVERALL_SENTIMENT_COL].value_counts()}")
+    df_sentiment = compute_text_sentiment(lemmas_df, text_columns, column_sentiment)
 
+    df_processed_text = assemble_eda_frame(df, cleaned_df, lemmas_df, df_topics, df_sentiment)
+    # Os n-grams mais comuns são registrados por quem monta o índice de n-grams sobre a EDA completa (run_eda.py, src/pipeline.py)
     return df_processed_text
 
 
@@ -177,6 +253,7 @@ if __name__ == '__main__':
         analyze_categorical_distributions(df_active, categorical_cols)
 
         df_final_eda = process_and_analyze_text_columns(df_active, TEXT_COLUMNS_FOR_NLP)
+        log_top_ngrams(NgramIndex.build(df_final_eda))
 
         print("\n--- Exemplo de Dados com Novas Colunas de Sentimento e Tópicos ---")
         print(df_final_eda[[
@@ -2,11 +2,14 @@
 
 import pandas as pd
 import logging
-import os
 from collections import defaultdict
-from src.config import EDA_FINAL_PATH, ANONYMIZED_PII_PATH, LEADERSHIP_TYPES, GROUP_NAMES, LEADERSHIP_SENTIMENT_COLS, TOPIC_TO_GROUP_APTITUDE_MAP
+from src.config import (EDA_FINAL_PATH, ANONYMIZED_PII_PATH, LEADERSHIP_ANALYSIS_PATH, LEADERSHIP_TYPES, GROUP_NAMES, LEADERSHIP_SENTIMENT_COLS,
+                        TOPIC_TO_GROUP_APTITUDE_MAP, GROUP_LEADER_CAPACITY, DEFAULT_GROUP_LEADER_CAPACITY, GROUP_OPTIONS_SEPARATOR)
 from src.analysis.nlp_processing import tokenize_and_lemmatize
+from src.storage import read_dataset, write_dataset, dataset_path
+from src.tracing import traced
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -15,15 +18,15 @@ def load_eda_data(file_path: str = EDA_FINAL_PATH) -> pd.DataFrame:
     Carrega o DataFrame final da EDA, que inclui os insights de NLP.
     """
     try:
-        logging.info(f"Carregando dados finais da EDA de: {file_path}")
-        df = pd.read_csv(file_path)
+        logging.info(f"Carregando dados finais da EDA de: {dataset_path(file_path)}")
+        df = read_dataset(file_path)
         # Garantir que main_topic é int (se foi lido como float por NaN)
         if 'main_topic' in df.columns:
             df['main_topic'] = df['main_topic'].fillna(0).astype(int) # Preenche NaN com 0 antes de converter para int
         logging.info(f"Dados finais da EDA carregados com sucesso. Total de {len(df)} registros.")
         return df
     except FileNotFoundError:
-        logging.error(f"Erro: Arquivo EDA final não encontrado em {file_path}.")
+        logging.error(f"Erro: Arquivo EDA final não encontrado em {dataset_path(file_path)}.")
         return pd.DataFrame()
     except Exception as e:
         logging.error(f"Ocorreu um erro ao carregar os dados finais da EDA: {e}")
@@ -35,17 +38,130 @@ def load_pii_mapping(file_path: str = ANONYMIZED_PII_PATH) -> pd.DataFrame:
     Este arquivo DEVE SER TRATADO COM EXTREMA CAUTELA e NUNCA exposto publicamente.
     """
     try:
-        logging.info(f"Carregando mapeamento de PII de: {file_path}")
-        df_pii = pd.read_csv(file_path)
+        logging.info(f"Carregando mapeamento de PII de: {dataset_path(file_path)}")
+        df_pii = read_dataset(file_path)
         logging.info("Mapeamento de PII carregado com sucesso.")
         return df_pii
     except FileNotFoundError:
-        logging.warning(f"Aviso: Arquivo de mapeamento de PII não encontrado em {file_path}. Nomes originais não estarão disponíveis para referência.")
+        logging.warning(f"Aviso: Arquivo de mapeamento de PII não encontrado em {dataset_path(file_path)}. Nomes originais não estarão disponíveis para referência.")
         return pd.DataFrame()
     except Exception as e:
         logging.error(f"Ocorreu um erro ao carregar o mapeamento de PII: {e}")
         return pd.DataFrame()
 
+def build_topic_aptitude_table(groups: list, topic_aptitude_map: dict = TOPIC_TO_GROUP_APTITUDE_MAP) -> np.ndarray:
+    """
+    Converte o mapa tópico -> aptidão por grupo (TOPIC_TO_GROUP_APTITUDE_MAP) em uma tabela (tópico x grupo)
+    para consulta vetorizada. A linha t tem a aptidão do tópico t para cada grupo; tópicos fora do mapa ficam com aptidão 0.
+    """
+    n_topics = max(topic_aptitude_map, default=0) + 1
+    table = np.zeros((n_topics, len(groups)))
+    for topic_id, aptitudes in topic_aptitude_map.items():
+        table[topic_id] = [aptitudes.get(group, 0.0) for group in groups]
+    return table
+
+def group_options_matrix(values: pd.Series, groups: list) -> np.ndarray:
+    """
+    Máscara booleana (participantes x grupos) dos grupos marcados em uma resposta de grupo.
+    'grupo_alternativo' é de múltipla escolha (opções separadas por GROUP_OPTIONS_SEPARATOR);
+    uma resposta com um único grupo, como 'grupo_principal', funciona do mesmo jeito.
+    Respostas vazias e opções fora de groups (ex: NO_ALTERNATIVE_OPTION) não marcam nenhum grupo.
+    """
+    # Poucas respostas distintas se repetem entre os participantes: cada uma é separada uma vez só
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    group_index = {group: i for i, group in enumerate(groups)}
+    unique_mask = np.zeros((len(uniques) + 1, len(groups)), dtype=bool) # Última linha: resposta vazia
+    for row, answer in enumerate(uniques):
+        for option in str(answer).split(GROUP_OPTIONS_SEPARATOR):
+            if option.strip() in group_index:
+                unique_mask[row, group_index[option.strip()]] = True
+    return unique_mask[codes]
+
+def compute_topic_aptitude(df: pd.DataFrame, groups: list, topic_aptitude_map: dict = TOPIC_TO_GROUP_APTITUDE_MAP) -> np.ndarray:
+    """
+    Aptidão do tópico LDA principal ('main_topic') de cada participante para cada grupo (participantes x grupos).
+    Tópicos ausentes ou fora do mapa valem 0 para todos os grupos.
+    """
+    # Tópicos ausentes ou fora do mapa apontam para uma linha de zeros da tabela
+    topic_table = np.vstack([build_topic_aptitude_table(groups, topic_aptitude_map), np.zeros(len(groups))])
+    topic_ids = pd.to_numeric(df['main_topic'], errors='coerce').to_numpy(dtype=float)
+    in_table = np.isfinite(topic_ids) & (topic_ids >= 0) & (topic_ids < len(topic_table) - 1)
+    topic_rows = np.where(in_table, np.nan_to_num(topic_ids), len(topic_table) - 1).astype(int)
+    return topic_table[topic_rows]
+
+def compute_sentiment_scores(df: pd.DataFrame) -> np.ndarray:
+    """
+    Score de sentimento por participante (proatividade, engajamento): +1 por coluna de
+    LEADERSHIP_SENTIMENT_COLS 'Positivo' e -1 por coluna 'Negativo'. Não depende do grupo.
+    """
+    sentiment_cols = [col for col in LEADERSHIP_SENTIMENT_COLS if col in df.columns]
+    if not sentiment_cols:
+        return np.zeros(len(df))
+    sentiments = df[sentiment_cols].to_numpy()
+    return (sentiments == 'Positivo').sum(axis=1) - (sentiments == 'Negativo').sum(axis=1)
+
+def compute_aptitude_matrix(df: pd.DataFrame, groups: list, topic_aptitude_map: dict = TOPIC_TO_GROUP_APTITUDE_MAP) -> np.ndarray:
+    """
+    Calcula a matriz de aptidão participantes x grupos, de uma vez, em NumPy:
+    1. Alinhamento de preferência: 0.5 se o grupo é o principal, senão 0.3 se é um dos alternativos.
+    2. Alinhamento de tópicos: aptidão do tópico LDA principal para o grupo (TOPIC_TO_GROUP_APTITUDE_MAP) x 0.7.
+    3. Sentimento ponderado: compute_sentiment_scores x 0.1 (igual para todos os grupos).
+    Valores não finitos viram 0.
+
+    Args:
+        df (pd.DataFrame): Participantes (uma linha por participante), com 'grupo_principal',
+                           'grupo_alternativo' e 'main_topic'.
+        groups (list): Grupos avaliados (colunas da matriz, na mesma ordem).
+        topic_aptitude_map (dict): Aptidão de cada tópico LDA por grupo (por padrão, TOPIC_TO_GROUP_APTITUDE_MAP).
+
+    Returns:
+        np.ndarray: Matriz (len(df), len(groups)) de scores de aptidão.
+    """
+    principal = group_options_matrix(df['grupo_principal'], groups)
+    alternative = group_options_matrix(df['grupo_alternativo'], groups)
+    preference_scores = np.where(principal, 0.5, np.where(alternative, 0.3, 0.0))
+    topic_scores = compute_topic_aptitude(df, groups, topic_aptitude_map) * 0.7
+
+    aptitude = preference_scores + topic_scores + compute_sentiment_scores(df)[:, None] * 0.1
+    aptitude[~np.isfinite(aptitude)] = 0.0
+    return aptitude
+
+def get_group_leader_capacities(groups: list) -> np.ndarray:
+    """Vagas de liderança de cada grupo (GROUP_LEADER_CAPACITY, ou DEFAULT_GROUP_LEADER_CAPACITY)."""
+    return np.array([GROUP_LEADER_CAPACITY.get(group, DEFAULT_GROUP_LEADER_CAPACITY) for group in groups], dtype=int)
+
+def solve_leader_assignment(aptitude: np.ndarray, eligible: np.ndarray, capacities: np.ndarray) -> np.ndarray:
+    """
+    Aloca candidatos a grupos de forma global, como uma atribuição de custo mínimo
+    (scipy.optimize.linear_sum_assignment) sobre a matriz de aptidão.
+    Cada grupo vira capacities[g] vagas (colunas); cada candidato ocupa no máximo uma vaga.
+    O objetivo prioriza o número de candidatos alocados e, entre as alocações com esse número,
+    a maior soma de aptidão. Pares não elegíveis nunca são usados.
+
+    Args:
+        aptitude (np.ndarray): Matriz (candidatos x grupos) de compute_aptitude_matrix.
+        eligible (np.ndarray): Máscara booleana (candidatos x grupos) dos pares permitidos.
+        capacities (np.ndarray): Vagas disponíveis em cada grupo.
+
+    Returns:
+        np.ndarray: Índice do grupo atribuído a cada candidato, ou -1 se ficou sem vaga.
+    """
+    assignment = np.full(aptitude.shape[0], -1)
+    slot_groups = np.repeat(np.arange(len(capacities)), np.maximum(capacities, 0))
+    if aptitude.shape[0] == 0 or len(slot_groups) == 0:
+        return assignment
+
+    slot_eligible = eligible[:, slot_groups]
+    # Cada par elegível vale um bônus maior que qualquer diferença de aptidão: primeiro cobre o máximo
+    # de vagas, depois maximiza a aptidão. Pares não elegíveis custam 0 e são descartados após a solução.
+    coverage_bonus = 1.0 + np.ptp(aptitude) * min(aptitude.shape[0], len(slot_groups))
+    cost = np.where(slot_eligible, -(coverage_bonus + aptitude[:, slot_groups]), 0.0)
+    rows, slots = linear_sum_assignment(cost)
+    used = slot_eligible[rows, slots]
+    assignment[rows[used]] = slot_groups[slots[used]]
+    return assignment
+
+@traced(category='liderança')
 def analyze_leadership_potential(df_eda: pd.DataFrame, df_pii: pd.DataFrame = None) -> pd.DataFrame:
     """
     Analisa o potencial de liderança dos participantes com base nas preferências de grupo,
@@ -75,43 +191,42 @@ def analyze_leadership_potential(df_eda: pd.DataFrame, df_pii: pd.DataFrame = No
     df_leadership_processed['justificativa_sentimento'] = obj_sentiment + "/" + bag_sentiment
 
 
-    # 1. Atribuir líderes diretos e marcar seus status
+    group_array = np.asarray(GROUP_NAMES, dtype=object)
+    capacities = get_group_leader_capacities(GROUP_NAMES)
+
+    # 1. Atribuir líderes diretos (só aos seus grupos principal ou alternativo), de forma global:
+    # a alocação não depende da ordem das respostas e respeita as vagas de cada grupo
     direct_leaders_mask = df_leadership_processed['interesse_lideranca'] == LEADERSHIP_TYPES['DIRETA']
-    direct_leaders_to_process = df_leadership_processed[direct_leaders_mask].copy() # Trabalha apenas com quem quer liderar diretamente
+    direct_leaders_to_process = df_leadership_processed[direct_leaders_mask] # Trabalha apenas com quem quer liderar diretamente
 
-    group_leadership_status = {group: {'leader_id': None, 'leader_name': None, 'type': None, 'preferred_by_direct': []} for group in GROUP_NAMES}
+    direct_aptitude = compute_aptitude_matrix(direct_leaders_to_process, GROUP_NAMES)
+    is_principal = group_options_matrix(direct_leaders_to_process['grupo_principal'], GROUP_NAMES)
+    is_alternative = group_options_matrix(direct_leaders_to_process['grupo_alternativo'], GROUP_NAMES)
+    direct_assignment = solve_leader_assignment(direct_aptitude, is_principal | is_alternative, capacities)
 
-    for idx, row in direct_leaders_to_process.iterrows():
-        participant_id = row['participant_id']
+    assigned = direct_assignment >= 0
+    rows = np.arange(len(direct_assignment))
+    assigned_to_principal = assigned & is_principal[rows, np.maximum(direct_assignment, 0)]
+    assigned_groups = np.where(assigned, group_array[np.maximum(direct_assignment, 0)], 'N/A')
+    df_leadership_processed.loc[direct_leaders_to_process.index, 'sugestao_lideranca_grupo'] = assigned_groups
+    df_leadership_processed.loc[direct_leaders_to_process.index, 'status_lideranca_final'] = np.select(
+        [assigned_to_principal, assigned],
+        ['Líder Direto Atribuído (Direta (Principal))', 'Líder Direto Atribuído (Direta (Alternativa))'],
+        default='Líder Direto (sem atribuição)')
+    df_leadership_processed.loc[direct_leaders_to_process.index, 'aptidao_score_geral'] = np.where(
+        assigned, np.round(direct_aptitude[rows, np.maximum(direct_assignment, 0)], 2), 0.0)
+
+    for participant_id, group, pref_group, alt_group in zip(direct_leaders_to_process['participant_id'], assigned_groups,
+                                                            direct_leaders_to_process['grupo_principal'], direct_leaders_to_process['grupo_alternativo']):
         name = id_to_name.get(participant_id, f"ID_{participant_id}")
-        pref_group = row['grupo_principal']
-        alt_group = row['grupo_alternativo']
-
-        assigned_group = None
-        if pref_group in GROUP_NAMES and group_leadership_status[pref_group]['leader_id'] is None:
-            group_leadership_status[pref_group]['leader_id'] = participant_id
-            group_leadership_status[pref_group]['leader_name'] = name
-            group_leadership_status[pref_group]['type'] = 'Direta (Principal)'
-            assigned_group = pref_group
-            logging.info(f"Líder Direto '{name}' (ID: {participant_id}) atribuído ao grupo '{pref_group}' (preferência principal).")
-        elif alt_group != 'Não tenho interesse por nenhuma outra opção' and alt_group in GROUP_NAMES and group_leadership_status[alt_group]['leader_id'] is None:
-            group_leadership_status[alt_group]['leader_id'] = participant_id
-            group_leadership_status[alt_group]['leader_name'] = name
-            group_leadership_status[alt_group]['type'] = 'Direta (Alternativa)'
-            assigned_group = alt_group
-            logging.info(f"Líder Direto '{name}' (ID: {participant_id}) atribuído ao grupo alternativo '{alt_group}'.")
+        if group != 'N/A':
+            logging.info(f"Líder Direto '{name}' (ID: {participant_id}) atribuído ao grupo '{group}' ({'preferência principal' if group == pref_group else 'alternativa'}).")
         else:
-            if pref_group in GROUP_NAMES:
-                group_leadership_status[pref_group]['preferred_by_direct'].append({'id': participant_id, 'name': name})
             logging.warning(f"Líder Direto '{name}' (ID: {participant_id}) não pôde ser atribuído a um grupo. Preferências: Principal='{pref_group}', Alternativa='{alt_group}'.")
-        
-        # ATUALIZA O DF PRINCIPAL COM O STATUS DO LÍDER DIRETO
-        df_leadership_processed.loc[idx, 'status_lideranca_final'] = f"Líder Direto Atribuído ({group_leadership_status[assigned_group]['type']})" if assigned_group else "Líder Direto (sem atribuição)"
-        df_leadership_processed.loc[idx, 'sugestao_lideranca_grupo'] = assigned_group if assigned_group else 'N/A'
 
-
-    # 2. Identificar grupos que *realmente* precisam de líderes agora (após a atribuição direta)
-    groups_needing_leaders = [group for group, status in group_leadership_status.items() if status['leader_id'] is None]
+    # 2. Identificar grupos que *realmente* precisam de líderes agora (vagas que sobraram após a atribuição direta)
+    open_slots = capacities - np.bincount(direct_assignment[assigned], minlength=len(GROUP_NAMES))
+    groups_needing_leaders = [group for group, slots in zip(GROUP_NAMES, open_slots) if slots > 0]
     logging.info(f"Grupos ainda sem liderança direta (após 1ª rodada): {groups_needing_leaders}")
 
     # 3. Processar Potenciais Líderes de Suporte
@@ -119,57 +234,32 @@ def analyze_leadership_potential(df_eda: pd.DataFrame, df_pii: pd.DataFrame = No
     support_leaders_mask = (df_leadership_processed['interesse_lideranca'] == LEADERSHIP_TYPES['SUPORTE']) & \
                            (df_leadership_processed['status_lideranca_final'] == 'Participante Comum') # Não é um líder direto
 
-    support_leaders_candidates_df = df_leadership_processed[support_leaders_mask].copy()
+    support_leaders_candidates_df = df_leadership_processed[support_leaders_mask]
 
     if not support_leaders_candidates_df.empty and groups_needing_leaders:
         logging.info(f"Avaliando {len(support_leaders_candidates_df)} candidatos a líder de suporte para os grupos {groups_needing_leaders}.")
 
-        for idx, row in support_leaders_candidates_df.iterrows():
-            participant_id = row['participant_id']
-            
-            best_aptitude_score_for_needing_group = -1
-            best_suggested_group = 'N/A'
-
-            for group_needed in groups_needing_leaders:
-                aptitude_score_for_group = 0.0
-
-                # 1. Alinhamento de Preferência Direta
-                if row['grupo_principal'] == group_needed:
-                    aptitude_score_for_group += 0.5
-                elif row['grupo_alternativo'] == group_needed:
-                    aptitude_score_for_group += 0.3
-
-                # 2. Alinhamento de Tópicos (usando TOPIC_TO_GROUP_APTITUDE_MAP)
-                main_topic_id = row['main_topic'] if not pd.isna(row['main_topic']) else None
-                if main_topic_id is not None and int(main_topic_id) in TOPIC_TO_GROUP_APTITUDE_MAP: # Garante que a chave é int
-                    topic_aptitude = TOPIC_TO_GROUP_APTITUDE_MAP[int(main_topic_id)].get(group_needed, 0.0)
-                    aptitude_score_for_group += topic_aptitude * 0.7
-
-                # 3. Score de Sentimento Ponderado (Proatividade, Engajamento)
-                sentiment_score_val = 0
-                for col in LEADERSHIP_SENTIMENT_COLS:
-                    if col in row and row[col] == 'Positivo':
-                        sentiment_score_val += 1
-                    elif col in row and row[col] == 'Negativo':
-                        sentiment_score_val -= 1
-                aptitude_score_for_group += sentiment_score_val * 0.1
-                
-                if not np.isfinite(aptitude_score_for_group):
-                    aptitude_score_for_group = 0.0
-
-
-                if aptitude_score_for_group > best_aptitude_score_for_needing_group:
-                    best_aptitude_score_for_needing_group = aptitude_score_for_group
-                    best_suggested_group = group_needed
-            
-            if best_aptitude_score_for_needing_group > 0:
-                df_leadership_processed.loc[idx, 'sugestao_lideranca_grupo'] = best_suggested_group
-                df_leadership_processed.loc[idx, 'tipo_sugestao'] = 'Potencial Líder (Sugestão Algorítmica)'
-                df_leadership_processed.loc[idx, 'status_lideranca_final'] = 'Potencial Líder para Suporte'
-                df_leadership_processed.loc[idx, 'aptidao_score_geral'] = round(best_aptitude_score_for_needing_group, 2)
-            else:
-                df_leadership_processed.loc[idx, 'status_lideranca_final'] = 'Participante com Interesse em Suporte (sem match forte)'
-                df_leadership_processed.loc[idx, 'aptidao_score_geral'] = 0.0
+        # Matriz candidatos x grupos sem líder; as vagas restantes são preenchidas de forma global
+        # (cada vaga recebe no máximo um candidato), só com pares de aptidão positiva
+        needing_idx = np.flatnonzero(open_slots > 0)
+        aptitude = compute_aptitude_matrix(support_leaders_candidates_df, groups_needing_leaders)
+        support_assignment = solve_leader_assignment(aptitude, aptitude > 0, open_slots[needing_idx])
+        has_match = support_assignment >= 0
+        best_scores = aptitude.max(axis=1)
+
+        matched_idx = support_leaders_candidates_df.index[has_match]
+        df_leadership_processed.loc[matched_idx, 'sugestao_lideranca_grupo'] = np.asarray(groups_needing_leaders, dtype=object)[support_assignment[has_match]]
+        df_leadership_processed.loc[matched_idx, 'tipo_sugestao'] = 'Potencial Líder (Sugestão Algorítmica)'
+        df_leadership_processed.loc[matched_idx, 'status_lideranca_final'] = 'Potencial Líder para Suporte'
+        df_leadership_processed.loc[matched_idx, 'aptidao_score_geral'] = np.round(aptitude[has_match, support_assignment[has_match]], 2)
+
+        # Sem vaga: tinham aptidão positiva, mas as vagas ficaram com candidatos de maior aptidão
+        no_slot = ~has_match & (best_scores > 0)
+        df_leadership_processed.loc[support_leaders_candidates_df.index[no_slot], 'status_lideranca_final'] = 'Participante com Interesse em Suporte (sem vaga)'
+        df_leadership_processed.loc[support_leaders_candidates_df.index[no_slot], 'aptidao_score_geral'] = np.round(best_scores[no_slot], 2)
+        no_match_idx = support_leaders_candidates_df.index[best_scores <= 0]
+        df_leadership_processed.loc[no_match_idx, 'status_lideranca_final'] = 'Participante com Interesse em Suporte (sem match forte)'
+        df_leadership_processed.loc[no_match_idx, 'aptidao_score_geral'] = 0.0
 
     
     logging.info("Análise de potencial de liderança aprimorada concluída.")
@@ -214,6 +304,5 @@ if __name__ == '__main__':
         logging.info("\n--- Resumo de Líderes Atribuídos/Potenciais ---")
         logging.info(df_leadership_insights['status_lideranca_final'].value_counts())
 
-        os.makedirs(os.path.dirname(LEADERSHIP_ANALYSIS_PATH), exist_ok=True)
-        df_leadership_insights.to_csv(LEADERSHIP_ANALYSIS_PATH, index=False)
-        logging.info(f"Insights de liderança salvos em: {LEADERSHIP_ANALYSIS_PATH}")
\ No newline at end of file
+        saved_path = write_dataset(df_leadership_insights, LEADERSHIP_ANALYSIS_PATH)
+        logging.info(f"Insights de liderança salvos em: {saved_path}")
\ No newline at end of file
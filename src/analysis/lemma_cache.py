@@ -0,0 +1,180 @@
+# transdevs_techexperience/src/analysis/lemma_cache.py
+
+import atexit
+import sqlite3
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from src.config import LEMMA_CACHE_PATH, LEMMA_CACHE_MAX_ENTRIES, LEMMA_CACHE_WRITE_BATCH, LEMMA_CACHE_MEMORY_ENTRIES
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class LemmaCache:
+    """
+    Cache persistente (SQLite) de lemmas, endereçado pelo conteúdo do texto limpo.
+    A chave é um hash do texto + nome e versão do modelo spaCy, então respostas que não mudaram
+    nunca são re-processadas, e uma troca de modelo invalida o cache automaticamente.
+    O tamanho é limitado a max_entries, removendo as entradas menos usadas recentemente (LRU).
+    Gravações e horários de acesso das consultas de um texto só (get/put) ficam num buffer e vão para o SQLite
+    em lotes de write_batch, num único commit (flush; também ao fechar o cache e ao fim do processo).
+    Os textos usados mais recentemente ficam também em memória (até memory_entries, também LRU); um acerto em memória
+    atualiza o horário de acesso no SQLite como um acerto no arquivo.
+    Com read_only=True (processos do pool de processamento paralelo), o cache só é consultado: nada é gravado,
+    nem o horário de acesso, e quem criou o pool grava os lemmas novos depois.
+    """
+
+    def __init__(self, model_name: str, model_version: str, path: str = LEMMA_CACHE_PATH, max_entries: int = LEMMA_CACHE_MAX_ENTRIES,
+                 read_only: bool = False, write_batch: int = LEMMA_CACHE_WRITE_BATCH, memory_entries: int = LEMMA_CACHE_MEMORY_ENTRIES):
+        self.model_name = model_name
+        self.model_version = model_version
+        self.path = path
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self.write_batch = write_batch
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict() # texto -> (chave, lemmas) dos textos usados mais recentemente nesta execução
+        self._pending_rows = {} # chave -> (lemmas em JSON, horário de acesso), ainda não gravados
+        self._pending_access = {} # chave -> horário de acesso das entradas encontradas, ainda não gravado
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None and self.read_only:
+            if not os.path.exists(self.path):
+                return None
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lemmas (key TEXT PRIMARY KEY, lemmas TEXT NOT NULL, last_access INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_lemmas_last_access ON lemmas (last_access)")
+            self._conn.commit()
+            self._clock, self._count = self._conn.execute("SELECT COALESCE(MAX(last_access), 0), COUNT(*) FROM lemmas").fetchone()
+            atexit.register(self.flush) # Grava o buffer se o processo terminar sem fechar o cache (removido em close)
+        return self._conn
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def make_key(self, text: str) -> str:
+        """Gera a chave de conteúdo de um texto limpo para o modelo atual."""
+        payload = f"{self.model_name}\x00{self.model_version}\x00{text}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _remember(self, text: str, key: str, lemmas: list):
+        self._memory[text] = (key, lemmas)
+        self._memory.move_to_end(text)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: list) -> dict:
+        """
+        Busca os lemmas de vários textos. Retorna um dicionário texto -> lemmas apenas para os encontrados.
+        """
+        found = {}
+        pending = {}
+        hit_keys = []
+        for text in set(texts):
+            entry = self._memory.get(text)
+            if entry is not None:
+                self._memory.move_to_end(text)
+                key, found[text] = entry
+                hit_keys.append(key)
+            else:
+                pending[self.make_key(text)] = text
+
+        conn = self._connect() if pending else None
+        if conn is not None:
+            keys = list(pending)
+            # SQLite limita a quantidade de parâmetros por consulta, então consulta em blocos
+            for start in range(0, len(keys), 900):
+                block = keys[start:start + 900]
+                placeholders = ','.join('?' * len(block))
+                for key, lemmas in conn.execute(f"SELECT key, lemmas FROM lemmas WHERE key IN ({placeholders})", block):
+                    text = pending[key]
+                    found[text] = json.loads(lemmas)
+                    self._remember(text, key, found[text])
+                    hit_keys.append(key)
+        if hit_keys and not self.read_only:
+            self._pending_access.update((key, self._tick()) for key in hit_keys)
+            self._flush_if_full()
+
+        self.hits += len(found)
+        self.misses += len(set(texts)) - len(found)
+        return found
+
+    def get(self, text: str):
+        """Busca os lemmas de um único texto. Retorna None se não estiver no cache."""
+        return self.get_many([text]).get(text)
+
+    def _buffer(self, lemmas_by_text: dict):
+        if self._conn is None:
+            self._connect() # Inicia o relógio LRU a partir do que já está gravado
+        for text, lemmas in lemmas_by_text.items():
+            key = self.make_key(text)
+            self._remember(text, key, lemmas)
+            self._pending_rows[key] = (json.dumps(lemmas, ensure_ascii=False), self._tick())
+
+    def put_many(self, lemmas_by_text: dict):
+        """Grava lemmas recém-calculados (com o que estiver no buffer) e aplica a política de remoção LRU."""
+        if not lemmas_by_text or self.read_only:
+            return
+        self._buffer(lemmas_by_text)
+        self.flush()
+
+    def put(self, text: str, lemmas: list):
+        """Guarda os lemmas de um único texto no buffer, gravado a cada write_batch textos."""
+        if self.read_only:
+            return
+        self._buffer({text: lemmas})
+        self._flush_if_full()
+
+    def _flush_if_full(self):
+        if len(self._pending_rows) + len(self._pending_access) >= self.write_batch:
+            self.flush()
+
+    def flush(self):
+        """Grava no SQLite os lemmas e horários de acesso do buffer, num único commit."""
+        if self.read_only or not (self._pending_rows or self._pending_access):
+            return
+        conn = self._connect()
+        conn.executemany("INSERT OR REPLACE INTO lemmas (key, lemmas, last_access) VALUES (?, ?, ?)",
+                         [(key, lemmas, last_access) for key, (lemmas, last_access) in self._pending_rows.items()])
+        conn.executemany("UPDATE lemmas SET last_access = ? WHERE key = ?",
+                         [(last_access, key) for key, last_access in self._pending_access.items()])
+        # Contagem estimada por cima (INSERT OR REPLACE de uma chave existente não cresce a tabela): só acima do limite se conta de fato
+        self._count += len(self._pending_rows)
+        self._pending_rows, self._pending_access = {}, {}
+        if self._count > self.max_entries:
+            self._evict(conn)
+        conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        self._count = conn.execute("SELECT COUNT(*) FROM lemmas").fetchone()[0]
+        excess = self._count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM lemmas WHERE key IN (SELECT key FROM lemmas ORDER BY last_access ASC LIMIT ?)", (excess,)
+            )
+            self._count -= excess
+            logging.info(f"Cache de lemmas: {excess} entradas menos usadas removidas (limite de {self.max_entries}).")
+
+    def __len__(self) -> int:
+        self.flush()
+        conn = self._connect()
+        return conn.execute("SELECT COUNT(*) FROM lemmas").fetchone()[0] if conn is not None else 0
+
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            if not self.read_only:
+                atexit.unregister(self.flush) # Sem isso, o atexit mantém vivo todo cache já fechado até o fim do processo
@@ -0,0 +1,169 @@
+# transdevs_techexperience/src/analysis/ngram_index.py
+
+import hashlib
+import logging
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from src.config import (TEXT_COLUMNS_FOR_NLP, NGRAM_INDEX_SIZES, NGRAM_FACET_COLUMNS, NGRAM_COUNTS_PATH, NGRAM_VOCABULARY_PATH,
+                        EDA_FINAL_PATH)
+from src.storage import read_dataset, write_dataset
+from src.tracing import traced
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class NgramIndex:
+    """
+    Contagens de n-grams por documento, com facetas, para consultas de top-k sem reprocessar os tokens.
+    - Documento: a resposta de um participante em uma coluna de texto ('<coluna>_lemmas'). N-grams nunca
+      atravessam respostas nem participantes.
+    - Tokens viram IDs inteiros (vocabulary[id] é o lemma); cada n-gram é guardado como IDs em 'token_1'..'token_N'
+      (-1 nas posições que sobram para n menor que N).
+    - Facetas de cada contagem: 'text_column', 'sentiment' (sentimento da própria resposta, '<coluna>_sentiment')
+      e as colunas de NGRAM_FACET_COLUMNS (ex: 'grupo_principal').
+
+    Uso:
+        index = NgramIndex.build(df_eda)
+        index.top_k(2, k=15, grupo_principal='G1 - Automações Wix', sentiment='Positivo')
+    """
+
+    def __init__(self, vocabulary: np.ndarray, counts: pd.DataFrame, facet_columns: list = None):
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self.counts = counts
+        self.facet_columns = ['text_column', 'sentiment'] + list(NGRAM_FACET_COLUMNS if facet_columns is None else facet_columns)
+        self.token_columns = [col for col in counts.columns if col.startswith('token_')]
+
+    @classmethod
+    @traced(category='ngrams')
+    def build(cls, df: pd.DataFrame, text_columns: list = TEXT_COLUMNS_FOR_NLP, ngram_sizes: tuple = NGRAM_INDEX_SIZES,
+              facet_columns: list = NGRAM_FACET_COLUMNS, min_token_length: int = 2) -> 'NgramIndex':
+        """
+        Conta os n-grams de todas as respostas de uma vez (NumPy), a partir das colunas '<coluna>_lemmas'.
+
+        Args:
+            df (pd.DataFrame): Participantes com as colunas de lemmas (e, se existirem, '<coluna>_sentiment' e as facetas).
+            text_columns (list): Colunas de texto indexadas. Por padrão, TEXT_COLUMNS_FOR_NLP.
+            ngram_sizes (tuple): Tamanhos de n-gram contados. Por padrão, NGRAM_INDEX_SIZES.
+            facet_columns (list): Colunas do participante usadas como faceta. Por padrão, NGRAM_FACET_COLUMNS.
+            min_token_length (int): Lemmas mais curtos são ignorados (como na nuvem de palavras).
+        """
+        facet_columns = [col for col in facet_columns if col in df.columns]
+        text_columns = [col for col in text_columns if f'{col}_lemmas' in df.columns]
+        tokens, rows, column_codes = [], [], []
+        for code, col in enumerate(text_columns):
+            kept = [[lemma for lemma in lemmas if len(lemma) >= min_token_length] if isinstance(lemmas, list) else []
+                    for lemmas in df[f'{col}_lemmas']]
+            lengths = np.fromiter((len(lemmas) for lemmas in kept), dtype=np.int64, count=len(kept))
+            tokens.append(list(chain.from_iterable(kept)))
+            rows.append(np.repeat(np.arange(len(df)), lengths))
+            column_codes.append(np.full(lengths.sum(), code))
+
+        token_ids, vocabulary = pd.factorize(pd.Series(list(chain.from_iterable(tokens)), dtype=object))
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        column_codes = np.concatenate(column_codes) if column_codes else np.zeros(0, dtype=np.int64)
+        documents = column_codes * max(len(df), 1) + rows # Respostas ficam contíguas: ordenadas por coluna e participante
+
+        max_n = max(ngram_sizes)
+        sentiments = np.empty((len(df), len(text_columns)), dtype=object) # Sentimento de cada resposta (participante x coluna)
+        for code, col in enumerate(text_columns):
+            if f'{col}_sentiment' in df.columns:
+                sentiments[:, code] = df[f'{col}_sentiment'].astype(object).to_numpy()
+        parts = []
+        for n in ngram_sizes:
+            starts = np.arange(max(len(token_ids) - n + 1, 0))
+            starts = starts[documents[starts] == documents[starts + n - 1]] # O n-gram termina na mesma resposta em que começa
+            grams = pd.DataFrame({'n': np.full(len(starts), n, dtype=np.int8)})
+            for position in range(max_n):
+                grams[f'token_{position + 1}'] = token_ids[starts + position].astype(np.int32) if position < n else np.int32(-1)
+            grams['text_column'] = np.asarray(text_columns, dtype=object)[column_codes[starts]]
+            grams['sentiment'] = sentiments[rows[starts], column_codes[starts]]
+            for col in facet_columns:
+                grams[col] = df[col].astype(object).to_numpy()[rows[starts]]
+            parts.append(grams)
+
+        key_columns = ['n'] + [f'token_{position + 1}' for position in range(max_n)] + ['text_column', 'sentiment'] + facet_columns
+        counts = (pd.concat(parts, ignore_index=True).groupby(key_columns, dropna=False, sort=False).size()
+                  .reset_index(name='count'))
+        for col in ['text_column', 'sentiment'] + facet_columns:
+            counts[col] = counts[col].astype('category')
+        logging.info(f"Índice de n-grams: {len(token_ids)} tokens em {len(np.unique(documents))} respostas, "
+                     f"{len(vocabulary)} lemmas distintos, {len(counts)} contagens.")
+        return cls(vocabulary, counts, facet_columns)
+
+    def _filter(self, n: int, facets: dict) -> pd.DataFrame:
+        mask = (self.counts['n'] == n).to_numpy()
+        for facet, value in facets.items():
+            if value is None:
+                continue
+            if facet not in self.facet_columns:
+                raise ValueError(f"Faceta desconhecida: '{facet}'. Use uma de {self.facet_columns}.")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.counts[facet].isin(values).to_numpy()
+        return self.counts[mask]
+
+    def top_k(self, n: int, k: int = 10, **facets) -> list:
+        """
+        N-grams de tamanho n mais frequentes, somando as contagens que atendem às facetas
+        (ex: text_column='objetivo_proposito', sentiment='Positivo', grupo_principal=[...]; None ignora a faceta).
+        Empates seguem a ordem de primeira ocorrência, como Counter.most_common.
+
+        Returns:
+            list: [(tupla de lemmas, contagem), ...] com no máximo k itens (k=None devolve todos).
+        """
+        token_columns = self.token_columns[:n]
+        totals = self._filter(n, facets).groupby(token_columns, sort=True)['count'].sum()
+        # IDs seguem a ordem de primeira ocorrência; a ordenação estável preserva essa ordem nos empates
+        totals = totals.sort_values(ascending=False, kind='stable')
+        if k is not None:
+            totals = totals.iloc[:k]
+        ids = np.array(totals.index.tolist(), dtype=np.int64).reshape(len(totals), n)
+        return [(tuple(self.vocabulary[row]), int(count)) for row, count in zip(ids, totals.to_numpy())]
+
+    def frequencies(self, n: int, k: int = None, separator: str = '_', **facets) -> dict:
+        """top_k como dicionário {'lemma1_lemma2': contagem}, pronto para WordCloud.generate_from_frequencies."""
+        return {separator.join(gram): count for gram, count in self.top_k(n, k, **facets)}
+
+    def facet_values(self, facet: str) -> list:
+        """Valores existentes de uma faceta (ex: para montar filtros no dashboard)."""
+        return [value for value in self.counts[facet].cat.categories if value is not None]
+
+    def fingerprint(self) -> str:
+        """Impressão digital do conteúdo do índice (muda quando qualquer contagem muda)."""
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(self.counts, index=False).to_numpy().tobytes())
+        digest.update('\x00'.join(self.vocabulary).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def save(self, counts_path: str = NGRAM_COUNTS_PATH, vocabulary_path: str = NGRAM_VOCABULARY_PATH) -> str:
+        """Grava as contagens e o vocabulário pela camada de armazenamento. Retorna o caminho das contagens."""
+        write_dataset(pd.DataFrame({'token_id': np.arange(len(self.vocabulary)), 'lemma': self.vocabulary}), vocabulary_path)
+        return write_dataset(self.counts, counts_path)
+
+    @classmethod
+    def load(cls, counts_path: str = NGRAM_COUNTS_PATH, vocabulary_path: str = NGRAM_VOCABULARY_PATH) -> 'NgramIndex':
+        """
+        Carrega um índice gravado por save.
+
+        Raises:
+            FileNotFoundError: Se o índice ainda não foi gerado (run_eda.py).
+        """
+        vocabulary = read_dataset(vocabulary_path).sort_values('token_id')['lemma'].to_numpy(dtype=object)
+        counts = read_dataset(counts_path)
+        facet_columns = [col for col in counts.columns if col not in ('n', 'count', 'text_column', 'sentiment') and not col.startswith('token_')]
+        for col in ['text_column', 'sentiment'] + facet_columns:
+            counts[col] = counts[col].astype('category')
+        return cls(vocabulary, counts, facet_columns)
+
+if __name__ == '__main__':
+    logging.info("Executando ngram_index.py para teste.")
+    df_eda_test = read_dataset(EDA_FINAL_PATH)
+    index_test = NgramIndex.build(df_eda_test)
+    print("\n--- Top 10 bigrams (geral) ---")
+    print(index_test.top_k(2, k=10))
+    for group in index_test.facet_values('grupo_principal'):
+        print(f"\n--- Top 5 unigrams com sentimento positivo, {group} ---")
+        print(index_test.top_k(1, k=5, grupo_principal=group, sentiment='Positivo'))
+    saved_path = index_test.save()
+    logging.info(f"Índice de n-grams salvo em: {saved_path}")
@@ -1,21 +1,29 @@
 # transdevs_techexperience/src/analysis/nlp_processing.py
 
 import pandas as pd
-import spacy
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize # Mantido para fallback se spaCy falhar
 import re
 from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-import pickle
+from functools import lru_cache
+from typing import TYPE_CHECKING
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import sys # Necessário para adicionar project_root ao sys.path, especialmente em notebooks
 import os
 import numpy as np
 
-from src.config import TYPO_CORRECTION_MAP, TEXT_COLUMNS_FOR_NLP, POSITIVE_WORDS, NEGATIVE_WORDS, TOPIC_MODEL_PATH, TFIDF_VECTORIZER_PATH
+from src.analysis.lemma_cache import LemmaCache
+from src.model_registry import save_artifact, load_artifact, load_manifest, find_version_by_fingerprint, compute_data_fingerprint, compute_matrix_fingerprint
+from src.config import LEMMA_CACHE_PATH, TYPO_CORRECTION_MAP, TEXT_COLUMNS_FOR_NLP, POSITIVE_WORDS, NEGATIVE_WORDS, TFIDF_ARTIFACT_NAME, LDA_ARTIFACT_NAME, SPACY_BATCH_SIZE, SPACY_N_PROCESS, SPACY_MODEL_NAME, SPACY_EXCLUDED_COMPONENTS, LDA_PARTIAL_FIT_BATCH_SIZE, TEXT_PROCESSING_N_WORKERS, TEXT_PROCESSING_CHUNK_SIZE
+from src.tracing import traced
+
+# spaCy, NLTK e scikit-learn são importados sob demanda: quem só precisa de funções leves
+# (ex: o dashboard com get_ngram_text_for_wordcloud) não paga o custo de carregá-los.
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.decomposition import LatentDirichletAllocation
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -25,23 +33,69 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-# Carrega o modelo de português do spaCy
-try:
-    nlp = spacy.load("pt_core_news_sm")
-    logging.info("Modelo spaCy 'pt_core_news_sm' carregado com sucesso.")
-except OSError:
-    logging.error("Modelo spaCy 'pt_core_news_sm' não encontrado. Por favor, execute: python -m spacy download pt_core_news_sm")
-    logging.error("A lematização e tokenização podem não funcionar corretamente.")
-    nlp = None # Define nlp como None para evitar erros posteriores
-
-# Inicializa as stopwords do NLTK (assumimos que já foram baixadas pelo script)
-# Se falhar aqui, o problema é de download/path do NLTK.
-try:
-    stop_words_pt = set(stopwords.words('portuguese'))
-    logging.info("Stopwords do NLTK carregadas com sucesso.")
-except LookupError:
-    logging.error("Recurso 'stopwords' do NLTK não encontrado. Verifique a execução de nltk_download_script.py.")
-    stop_words_pt = set() # Fallback para set vazio para não quebrar
+@lru_cache(maxsize=None)
+@traced(category='spacy')
+def get_nlp():
+    """
+    Carrega o modelo de português do spaCy uma única vez por processo, no primeiro uso.
+    Componentes que o projeto não usa (SPACY_EXCLUDED_COMPONENTS, ex: parser e NER) são excluídos,
+    o que reduz o tempo de carga e de processamento.
+    Retorna None se o modelo não estiver instalado.
+    """
+    import spacy
+    try:
+        nlp = spacy.load(SPACY_MODEL_NAME, exclude=SPACY_EXCLUDED_COMPONENTS)
+        logging.info(f"Modelo spaCy '{SPACY_MODEL_NAME}' carregado com sucesso. Componentes ativos: {nlp.pipe_names}")
+        return nlp
+    except OSError:
+        logging.error(f"Modelo spaCy '{SPACY_MODEL_NAME}' não encontrado. Por favor, execute: python -m spacy download {SPACY_MODEL_NAME}")
+        logging.error("A lematização e tokenização podem não funcionar corretamente.")
+        return None
+
+@lru_cache(maxsize=None)
+def get_stopwords_pt() -> frozenset:
+    """
+    Carrega as stopwords em português do NLTK uma única vez por processo, no primeiro uso
+    (assumimos que já foram baixadas pelo nltk_download_script.py).
+    """
+    from nltk.corpus import stopwords
+    try:
+        stop_words_pt = frozenset(stopwords.words('portuguese'))
+        logging.info("Stopwords do NLTK carregadas com sucesso.")
+        return stop_words_pt
+    except LookupError:
+        logging.error("Recurso 'stopwords' do NLTK não encontrado. Verifique a execução de nltk_download_script.py.")
+        return frozenset() # Fallback para set vazio para não quebrar
+
+# Arquivo do cache de lemmas deste processo (ver set_lemma_cache_path)
+_lemma_cache_path = LEMMA_CACHE_PATH
+
+@lru_cache(maxsize=None)
+def get_lemma_cache():
+    """
+    Retorna o cache persistente de lemmas, compartilhado pela lematização e pela análise de sentimento.
+    Só existe com o spaCy carregado (o fallback do NLTK não lematiza); caso contrário retorna None.
+    A chave do cache inclui os componentes ativos do pipeline, além do nome e da versão do modelo.
+    """
+    nlp = get_nlp()
+    if nlp is None:
+        return None
+    return _make_lemma_cache(nlp, _lemma_cache_path)
+
+def _make_lemma_cache(nlp, path: str, read_only: bool = False) -> LemmaCache:
+    return LemmaCache(model_name=f"{SPACY_MODEL_NAME}[{','.join(nlp.pipe_names)}]", model_version=nlp.meta['version'],
+                      path=path, read_only=read_only)
+
+def set_lemma_cache_path(path: str):
+    """
+    Troca o arquivo do cache de lemmas usado por este processo (e pelos processos do pool que ele criar).
+    Usado pelos benchmarks, que medem com um cache próprio e descartável sem mexer no cache do projeto.
+    """
+    global _lemma_cache_path
+    if get_lemma_cache.cache_info().currsize and get_lemma_cache() is not None:
+        get_lemma_cache().close()
+    get_lemma_cache.cache_clear()
+    _lemma_cache_path = path
 
 
 def correct_typos_and_standardize(text: str) -> str:
@@ -71,30 +125,210 @@ def tokenize_and_lemmatize(text: str) -> list:
     Tokeniza o texto usando spaCy, remove stopwords (do spaCy) e aplica lematização.
     Prioriza spaCy. Se spaCy não estiver carregado, faz um fallback para NLTK para tokenização simples.
     """
+    nlp = get_nlp()
     if not isinstance(text, str) or nlp is None:
         if nlp is None:
             logging.warning("spaCy NLP model não carregado. Usando tokenização básica do NLTK sem lematização ou remoção de stopwords.")
+            from nltk.tokenize import word_tokenize
             tokens = [word for word in word_tokenize(text, language='portuguese') if len(word) > 1]
             return tokens
         return []
     
+    lemma_cache = get_lemma_cache()
+    if lemma_cache is not None:
+        cached = lemma_cache.get(text)
+        if cached is not None:
+            return list(cached)
+
     doc = nlp(text)
-    # Lematiza e filtra stopwords (do spaCy), pontuação e tokens de uma única letra
-    lemmas = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct and not token.is_space and len(token.lemma_) > 1]
+    lemmas = _lemmas_from_doc(doc)
+    if lemma_cache is not None:
+        lemma_cache.put(text, lemmas)
     return lemmas
 
-def extract_ngrams(token_list_of_lists: list, n: int = 2, top_n: int = 10) -> Counter:
+def _lemmas_from_doc(doc) -> list:
+    """
+    Extrai os lemmas de um Doc do spaCy, filtrando stopwords (do spaCy), pontuação,
+    espaços e tokens de uma única letra.
+    """
+    return [token.lemma_ for token in doc if not token.is_stop and not token.is_punct and not token.is_space and len(token.lemma_) > 1]
+
+@traced(category='spacy')
+def lemmatize_texts(texts: list, batch_size: int = SPACY_BATCH_SIZE, n_process: int = SPACY_N_PROCESS) -> list:
+    """
+    Lematiza uma sequência de textos em lote usando nlp.pipe do spaCy.
+    Produz o mesmo resultado de tokenize_and_lemmatize aplicado texto a texto, mas evita
+    uma chamada nlp(text) por resposta. Valores que não são texto viram lista vazia.
+    Textos repetidos ou já presentes no cache de lemmas não passam novamente pelo spaCy.
+
+    Args:
+        texts (list): Textos (já corrigidos e limpos) a lematizar.
+        batch_size (int): Quantidade de textos por lote enviado ao spaCy.
+        n_process (int): Número de processos usados pelo spaCy.
+
+    Returns:
+        list: Uma lista de lemmas para cada texto, na mesma ordem da entrada.
+    """
+    texts = list(texts)
+    lemma_cache = get_lemma_cache()
+    lemmas, computed = _lemmatize_with_cache(texts, lemma_cache, batch_size, n_process, log=True)
+    if lemma_cache is not None:
+        lemma_cache.put_many(computed)
+    return lemmas
+
+def _lemmatize_with_cache(texts: list, lemma_cache: LemmaCache, batch_size: int, n_process: int, log: bool = False) -> tuple[list, dict]:
+    """
+    Núcleo de lemmatize_texts: consulta o cache, envia ao spaCy só os textos ausentes e NÃO grava no cache.
+    Retorna (lemmas de cada texto, {texto: lemmas} dos textos que passaram pelo spaCy).
+    """
+    nlp = get_nlp()
+    if nlp is None:
+        return [tokenize_and_lemmatize(text) if isinstance(text, str) else [] for text in texts], {}
+
+    unique_texts = list(dict.fromkeys(text for text in texts if isinstance(text, str) and text))
+    cached = lemma_cache.get_many(unique_texts) if lemma_cache is not None else {}
+    missing = [text for text in unique_texts if text not in cached]
+    if log:
+        logging.info(f"Lematização: {len(unique_texts)} textos únicos, {len(cached)} vindos do cache, {len(missing)} enviados ao spaCy.")
+
+    docs = nlp.pipe(missing, batch_size=batch_size, n_process=n_process)
+    computed = {text: _lemmas_from_doc(doc) for text, doc in zip(missing, docs)}
+
+    lemmas_by_text = {**cached, **computed}
+    return [list(lemmas_by_text[text]) if isinstance(text, str) and text else [] for text in texts], computed
+
+@traced(category='spacy')
+def lemmatize_text_columns(df: pd.DataFrame, text_columns: list, batch_size: int = SPACY_BATCH_SIZE, n_process: int = SPACY_N_PROCESS) -> pd.DataFrame:
     """
-    Extrai n-grams (sequências de palavras) de uma lista de listas de tokens.
+    Lematiza as colunas '{col}_cleaned' de várias colunas de texto em um único fluxo do spaCy
+    e devolve as listas de lemmas redistribuídas nas colunas '{col}_lemmas'.
+
+    Args:
+        df (pd.DataFrame): DataFrame que contém as colunas '{col}_cleaned'.
+        text_columns (list): Colunas de texto original (ex: TEXT_COLUMNS_FOR_NLP).
+        batch_size (int): Quantidade de textos por lote enviado ao spaCy.
+        n_process (int): Número de processos usados pelo spaCy.
+
+    Returns:
+        pd.DataFrame: DataFrame com o mesmo índice de df e uma coluna '{col}_lemmas' por coluna encontrada.
+    """
+    cleaned_cols = [col for col in text_columns if f'{col}_cleaned' in df.columns]
+    stream = [text for col in cleaned_cols for text in df[f'{col}_cleaned'].tolist()]
+    logging.info(f"Lematizando {len(stream)} textos de {len(cleaned_cols)} colunas em lote (batch_size={batch_size}, n_process={n_process})...")
+    all_lemmas = lemmatize_texts(stream, batch_size=batch_size, n_process=n_process)
+
+    lemmas_df = pd.DataFrame(index=df.index)
+    n_rows = len(df)
+    for pos, col in enumerate(cleaned_cols):
+        lemmas_df[f'{col}_lemmas'] = pd.Series(all_lemmas[pos * n_rows:(pos + 1) * n_rows], index=df.index, dtype=object)
+    return lemmas_df
+
+# Estado de cada processo do pool de process_text_columns_parallel (preenchido por _init_text_worker)
+_WORKER_STATE = {}
+
+def _init_text_worker(lexicon_index: tuple, batch_size: int, lemma_cache_path: str):
+    """
+    Inicializador dos processos do pool: carrega o modelo spaCy uma única vez por processo (aquecimento)
+    e guarda o índice dos léxicos de sentimento (vindo do processo principal) e um cache de lemmas só de leitura.
+    """
+    nlp = get_nlp()
+    _WORKER_STATE['lexicon_index'] = lexicon_index
+    _WORKER_STATE['lemma_cache'] = _make_lemma_cache(nlp, lemma_cache_path, read_only=True) if nlp is not None else None
+    _WORKER_STATE['batch_size'] = batch_size
+
+def _process_text_chunk(texts: list) -> tuple[list, list, pd.DataFrame, dict]:
+    """
+    Processa um bloco de respostas de uma coluna dentro de um processo do pool: correção de typos, limpeza,
+    lematização e sentimento. Retorna (textos limpos, lemmas, sentimento, lemmas novos para o cache).
+    """
+    cleaned = [clean_text(correct_typos_and_standardize(text)) for text in texts]
+    lemmas, computed = _lemmatize_with_cache(cleaned, _WORKER_STATE['lemma_cache'], _WORKER_STATE['batch_size'], n_process=1)
+    sentiment = score_sentiment_lemmas(pd.Series(lemmas, dtype=object), lexicon_index=_WORKER_STATE['lexicon_index'])
+    return cleaned, lemmas, sentiment, computed
+
+@traced(category='spacy')
+def process_text_columns_parallel(df: pd.DataFrame, text_columns: list, n_workers: int = TEXT_PROCESSING_N_WORKERS,
+                                  chunk_size: int = TEXT_PROCESSING_CHUNK_SIZE, batch_size: int = SPACY_BATCH_SIZE) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """
+    Correção de typos, limpeza, lematização e sentimento das colunas de texto em um pool de processos.
+    O trabalho é dividido em blocos (coluna x faixa de chunk_size linhas); cada processo carrega o spaCy uma única vez
+    e os resultados são juntados na ordem dos blocos, então a saída é idêntica à do caminho sequencial
+    (clean_text_columns + lemmatize_text_columns + score_sentiment_lemmas), qualquer que seja n_workers.
+    Os processos só leem o cache de lemmas; os lemmas novos são gravados aqui, no processo principal.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as colunas de texto original.
+        text_columns (list): Colunas de texto a processar (ex: TEXT_COLUMNS_FOR_NLP).
+        n_workers (int): Número de processos do pool.
+        chunk_size (int): Linhas de uma coluna por bloco.
+        batch_size (int): Quantidade de textos por lote enviado ao spaCy em cada processo.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, dict]:
+            - Colunas '{col}_cleaned' (mesmo índice de df).
+            - Colunas '{col}_lemmas' (mesmo índice de df).
+            - {col: saída de score_sentiment_lemmas} de cada coluna processada.
+    """
+    for col in text_columns:
+        if col not in df.columns:
+            logging.warning(f"Coluna de texto '{col}' não encontrada para limpeza.")
+    columns = [col for col in text_columns if col in df.columns]
+    chunk_size = max(int(chunk_size), 1)
+    tasks = [(col, start) for col in columns for start in range(0, len(df), chunk_size)]
+    logging.info(f"Processando {len(columns)} colunas de texto em {len(tasks)} blocos de até {chunk_size} linhas "
+                 f"com {n_workers} processos...")
+
+    start_time = time.perf_counter()
+    lexicon_index = get_sentiment_lexicon_index()
+    # 'spawn' evita herdar do processo principal o modelo e a conexão SQLite do cache (e funciona igual em todos os sistemas)
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_text_worker, initargs=(lexicon_index, batch_size, _lemma_cache_path)) as executor:
+        results = list(executor.map(_process_text_chunk, [df[col].iloc[start:start + chunk_size].tolist() for col, start in tasks]))
+
+    cleaned_df = pd.DataFrame(index=df.index)
+    lemmas_df = pd.DataFrame(index=df.index)
+    column_sentiment = {}
+    computed = {}
+    for col in columns:
+        col_results = [result for (task_col, _), result in zip(tasks, results) if task_col == col]
+        cleaned_df[f'{col}_cleaned'] = pd.Series([text for result in col_results for text in result[0]], index=df.index, dtype=object)
+        lemmas_df[f'{col}_lemmas'] = pd.Series([lemmas for result in col_results for lemmas in result[1]], index=df.index, dtype=object)
+        sentiment = pd.concat([result[2] for result in col_results], ignore_index=True) if col_results else score_sentiment_lemmas(lemmas_df[f'{col}_lemmas'])
+        column_sentiment[col] = sentiment.set_axis(df.index)
+        for result in col_results:
+            computed.update(result[3])
+
+    lemma_cache = get_lemma_cache()
+    if lemma_cache is not None:
+        lemma_cache.put_many(computed)
+    logging.info(f"Processamento paralelo do texto concluído em {time.perf_counter() - start_time:.2f}s "
+                 f"({len(computed)} textos novos lematizados).")
+    return cleaned_df, lemmas_df, column_sentiment
+
+def extract_ngrams(token_list_of_lists: list, n: int = 2, top_n: int = 10) -> list:
+    """
+    Extrai os n-grams (sequências de palavras) mais comuns de uma lista de listas de tokens.
+    Cada sublista é um documento: os n-grams não atravessam o fim de uma sublista e o início da seguinte.
+    Para consultas repetidas ou com facetas, use src.analysis.ngram_index.NgramIndex.
     """
     if not token_list_of_lists:
-        return Counter()
-    
-    all_tokens = [token for sublist in token_list_of_lists for token in sublist]
-    ngrams_counts = Counter(nltk.ngrams(all_tokens, n))
-    
+        return []
+
+    ngrams_counts = Counter()
+    for sublist in token_list_of_lists:
+        if isinstance(sublist, list):
+            ngrams_counts.update(zip(*(sublist[i:] for i in range(n))))
+
     return ngrams_counts.most_common(top_n)
 
+def _wordcloud_ngrams(lemmas_list: list, n: int = 1) -> list:
+    """N-grams da nuvem de palavras (lemmas unidos por '_'), na ordem da lista de lemmas."""
+    # Os lemmas já vêm sem stopwords do spaSy e com len > 1, então apenas um filtro básico de len
+    filtered_lemmas = [lemma for lemma in lemmas_list if len(lemma) > 1]
+    if n < 1:
+        return []
+    return ["_".join(filtered_lemmas[i:i+n]) for i in range(len(filtered_lemmas) - n + 1)]
+
 def get_ngram_text_for_wordcloud(lemmas_list: list, n: int = 1) -> str:
     """
     Converte uma lista de lemmas em uma string formatada para WordCloud.
@@ -102,72 +336,270 @@ def get_ngram_text_for_wordcloud(lemmas_list: list, n: int = 1) -> str:
     """
     if not lemmas_list:
         return ""
+    return " ".join(_wordcloud_ngrams(lemmas_list, n))
 
-    # Os lemmas já vêm sem stopwords do spaSy e com len > 1, então apenas um filtro básico de len
-    filtered_lemmas = [lemma for lemma in lemmas_list if len(lemma) > 1]
-
-    if n == 1:
-        text = " ".join(filtered_lemmas)
-    elif n > 1:
-        ngrams = []
-        for i in range(len(filtered_lemmas) - n + 1):
-            ngram_tuple = filtered_lemmas[i:i+n]
-            if all(len(lemma) > 1 for lemma in ngram_tuple):
-                ngrams.append("_".join(ngram_tuple))
-        text = " ".join(ngrams)
-    else:
-        text = ""
-    
-    return text
-
-def vectorize_text_tfidf(texts: pd.Series, max_features: int = 1000) -> tuple[TfidfVectorizer, pd.DataFrame]:
+@traced(category='tfidf')
+def vectorize_text_tfidf(texts: pd.Series, max_features: int = 1000, persist: bool = True) -> tuple['TfidfVectorizer', 'sp.csr_matrix', str]:
     """
     Vetoriza uma série de textos usando TF-IDF.
-    Retorna o vetorizador treinado e o DataFrame TF-IDF.
+    Retorna o vetorizador treinado, a matriz TF-IDF esparsa (CSR), sem densificar, e a versão do vetorizador no registro.
+    Os nomes das features ficam no vetorizador (get_feature_names_out).
+    Com persist=True o vetorizador é salvo no registro de modelos (register_tfidf_vectorizer);
+    com persist=False não é salvo e a versão é None (útil para benchmarks e testes).
+    Passe a versão para apply_topic_modeling_lda, que a grava no manifesto do LDA treinado sobre essa matriz.
     """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     logging.info("Vetorizando textos com TF-IDF...")
     tfidf_vectorizer = TfidfVectorizer(max_features=max_features)
     texts_clean = texts.fillna("")
-    tfidf_matrix = tfidf_vectorizer.fit_transform(texts_clean)
-    tfidf_df = pd.DataFrame(tfidf_matrix.toarray(), columns=tfidf_vectorizer.get_feature_names_out())
-    logging.info(f"Textos vetorizados. Matriz TF-IDF com {tfidf_df.shape[0]} documentos e {tfidf_df.shape[1]} features.")
+    tfidf_matrix = tfidf_vectorizer.fit_transform(texts_clean).tocsr()
+    logging.info(f"Textos vetorizados. Matriz TF-IDF esparsa com {tfidf_matrix.shape[0]} documentos, {tfidf_matrix.shape[1]} features e {tfidf_matrix.nnz} valores não nulos.")
     
-    os.makedirs(os.path.dirname(TOPIC_MODEL_PATH), exist_ok=True)
-    with open(TOPIC_MODEL_PATH, 'wb') as f:
-        pickle.dump(tfidf_vectorizer, f)
-    logging.info(f"Vetorizador TF-IDF salvo em: {TFIDF_VECTORIZER_PATH}")
+    vectorizer_version = register_tfidf_vectorizer(tfidf_vectorizer, tfidf_matrix) if persist else None
+    return tfidf_vectorizer, tfidf_matrix, vectorizer_version
 
-    return tfidf_vectorizer, tfidf_df
+def compute_tfidf_fingerprint(tfidf_vectorizer: 'TfidfVectorizer', tfidf_matrix: 'sp.csr_matrix') -> str:
+    """Impressão digital de um vetorizador TF-IDF treinado: o vocabulário (na ordem das colunas) e a matriz que ele gerou."""
+    return compute_data_fingerprint([compute_matrix_fingerprint(tfidf_matrix), *tfidf_vectorizer.get_feature_names_out()])
 
-def apply_topic_modeling_lda(tfidf_matrix: pd.DataFrame, num_topics: int = 5, n_top_words: int = 10) -> tuple[LatentDirichletAllocation, list]:
+def register_tfidf_vectorizer(tfidf_vectorizer: 'TfidfVectorizer', tfidf_matrix: 'sp.csr_matrix') -> str:
+    """
+    Salva o vetorizador que gerou tfidf_matrix no registro de modelos e retorna a versão.
+    Se o mesmo vocabulário e a mesma matriz já estiverem registrados (compute_tfidf_fingerprint), reaproveita essa versão.
+    """
+    data_fingerprint = compute_tfidf_fingerprint(tfidf_vectorizer, tfidf_matrix)
+    return find_version_by_fingerprint(TFIDF_ARTIFACT_NAME, data_fingerprint) or save_artifact(
+        TFIDF_ARTIFACT_NAME, tfidf_vectorizer, data_fingerprint,
+        metadata_extra={'n_documents': tfidf_matrix.shape[0], 'n_features': tfidf_matrix.shape[1]})
+
+def get_top_words_per_topic(components: np.ndarray, feature_names: np.ndarray, n_top_words: int = 10) -> list:
+    """
+    Extrai as n_top_words palavras de maior peso de cada tópico a partir de components_ do LDA.
+    Retorna uma lista (um item por tópico) de listas de palavras.
+    """
+    feature_names = np.asarray(feature_names, dtype=object)
+    top_indices = np.argsort(components, axis=1)[:, :-n_top_words - 1:-1]
+    return feature_names[top_indices].tolist()
+
+@traced(category='lda')
+def apply_topic_modeling_lda(tfidf_matrix: 'sp.csr_matrix', feature_names: np.ndarray, num_topics: int = 5, n_top_words: int = 10, persist: bool = True, max_iter: int = 10,
+                             vectorizer_version: str = None) -> tuple['LatentDirichletAllocation', list]:
     """
     Aplica o modelo LDA para descobrir tópicos nos textos.
+    Recebe a matriz TF-IDF esparsa (CSR) e os nomes das features separadamente.
     Retorna o modelo LDA treinado e os tópicos com suas palavras-chave.
+    Com persist=True o modelo é salvo no registro, vinculado a vectorizer_version: a versão do vetorizador que gerou
+    tfidf_matrix (devolvida por vectorize_text_tfidf), não a mais recente do registro, que pode ser de outra execução.
+    Com persist=False não é salvo. max_iter é o número de passadas do LDA em lote.
     """
+    from sklearn.decomposition import LatentDirichletAllocation
+
     logging.info(f"Aplicando Modelagem de Tópicos (LDA) com {num_topics} tópicos...")
     if tfidf_matrix.shape[0] == 0 or tfidf_matrix.shape[1] == 0:
         logging.warning("Matriz TF-IDF vazia ou sem features para modelagem de tópicos.")
         return None, []
 
-    lda_model = LatentDirichletAllocation(n_components=num_topics, random_state=42, learning_method='batch')
-    lda_output = lda_model.fit_transform(tfidf_matrix)
+    # total_samples guarda o tamanho do corpus já visto; é o peso usado pelas atualizações incrementais (partial_fit)
+    lda_model = LatentDirichletAllocation(n_components=num_topics, random_state=42, learning_method='batch', max_iter=max_iter, total_samples=tfidf_matrix.shape[0])
+    lda_model.fit(tfidf_matrix)
     
-    os.makedirs(os.path.dirname(TOPIC_MODEL_PATH), exist_ok=True)
-    with open(TOPIC_MODEL_PATH, 'wb') as f:
-        pickle.dump(lda_model, f)
-    logging.info(f"Modelo LDA salvo em: {TOPIC_MODEL_PATH}")
-
-    feature_names = tfidf_matrix.columns
-    topics = []
-    for topic_idx, topic in enumerate(lda_model.components_):
-        top_words = [feature_names[i] for i in topic.argsort()[:-n_top_words - 1:-1]]
-        topics.append(f"Tópico {topic_idx + 1}: {' '.join(top_words)}")
+    if persist:
+        if vectorizer_version is None:
+            raise ValueError("vectorizer_version é obrigatório para salvar o LDA: sem ele o modelo não pode ser pareado com o seu vocabulário.")
+        save_artifact(LDA_ARTIFACT_NAME, lda_model, compute_matrix_fingerprint(tfidf_matrix),
+                      metadata_extra={'vectorizer_version': vectorizer_version, 'num_topics': num_topics})
+
+    topics = describe_topics(lda_model, feature_names, n_top_words)
+    return lda_model, topics
+
+def describe_topics(lda_model: 'LatentDirichletAllocation', feature_names: np.ndarray, n_top_words: int = 10) -> list:
+    """
+    Monta (e registra no log) a descrição 'Tópico N: palavras' de cada tópico do modelo LDA.
+    """
+    topics = [
+        f"Tópico {topic_idx + 1}: {' '.join(top_words)}"
+        for topic_idx, top_words in enumerate(get_top_words_per_topic(lda_model.components_, feature_names, n_top_words))
+    ]
     
     logging.info("Tópicos identificados:")
     for t in topics:
         logging.info(t)
     
-    return lda_model, topics
+    return topics
+
+@traced(category='lda')
+def load_topic_model_artifacts(mmap: bool = True) -> tuple:
+    """
+    Carrega do registro a versão mais recente do modelo LDA e a versão do vetorizador TF-IDF com que ele foi treinado.
+    Com mmap=True os arrays grandes (components_) são abertos com memory-map somente leitura, o caminho rápido
+    para inferência; use mmap=False para modelos que serão atualizados (partial_fit).
+    Retorna (None, None) se algum dos artefatos não existir ou não puder ser lido.
+    """
+    try:
+        lda_model, lda_manifest = load_artifact(LDA_ARTIFACT_NAME, mmap=mmap)
+        if lda_model is None:
+            return None, None
+        tfidf_vectorizer, _ = load_artifact(TFIDF_ARTIFACT_NAME, version=lda_manifest['metadata'].get('vectorizer_version'), mmap=mmap)
+        if tfidf_vectorizer is None:
+            return None, None
+    except Exception as e:
+        logging.error(f"Ocorreu um erro ao carregar os modelos de tópicos: {e}")
+        return None, None
+
+    if not hasattr(tfidf_vectorizer, 'vocabulary_') or not hasattr(lda_model, 'components_'):
+        logging.warning("Os artefatos de tópicos carregados não são um vetorizador e um LDA treinados.")
+        return None, None
+    return tfidf_vectorizer, lda_model
+
+def partial_fit_topic_model(lda_model: 'LatentDirichletAllocation', tfidf_matrix: 'sp.csr_matrix', batch_size: int = LDA_PARTIAL_FIT_BATCH_SIZE) -> list:
+    """
+    Atualiza um LDA já treinado com partial_fit, em mini-lotes de batch_size documentos.
+    Os tópicos são atualizados no lugar (as linhas de components_ não são reordenadas),
+    então o ID de cada tópico continua o mesmo e TOPIC_TO_GROUP_APTITUDE_MAP segue válido.
+
+    Returns:
+        list: A latência (em segundos) de cada mini-lote.
+    """
+    latencies = []
+    n_docs = tfidf_matrix.shape[0]
+    # O corpus efetivo cresce com os documentos novos, o que pondera cada mini-lote corretamente
+    lda_model.set_params(total_samples=lda_model.total_samples + n_docs, batch_size=batch_size)
+    for batch_idx, start in enumerate(range(0, n_docs, batch_size)):
+        batch = tfidf_matrix[start:start + batch_size]
+        t0 = time.perf_counter()
+        lda_model.partial_fit(batch)
+        latencies.append(time.perf_counter() - t0)
+        logging.info(f"LDA incremental: lote {batch_idx + 1} com {batch.shape[0]} documentos em {latencies[-1] * 1000:.1f} ms.")
+    return latencies
+
+@traced(category='lda')
+def update_topic_model_incremental(new_texts: pd.Series, batch_size: int = LDA_PARTIAL_FIT_BATCH_SIZE, persist: bool = True) -> tuple:
+    """
+    Incorpora apenas os documentos novos ao modelo de tópicos persistido, sem re-treinar do zero.
+    O vetorizador salvo é usado só para transform (vocabulário e IDF fixos, palavras novas são ignoradas),
+    e o LDA salvo é atualizado com partial_fit em mini-lotes.
+
+    Args:
+        new_texts (pd.Series): Textos limpos dos documentos novos.
+        batch_size (int): Documentos por mini-lote do partial_fit.
+        persist (bool): Se True, salva o LDA atualizado como nova versão no registro (o vetorizador não muda).
+
+    Returns:
+        tuple: (vetorizador, modelo LDA atualizado, latências por lote em segundos).
+               Retorna (None, None, []) se não houver artefatos persistidos.
+    """
+    tfidf_vectorizer, lda_model = load_topic_model_artifacts(mmap=False)
+    if tfidf_vectorizer is None:
+        return None, None, []
+    parent_manifest = load_manifest(LDA_ARTIFACT_NAME)
+    if len(new_texts) == 0:
+        logging.info("Nenhum documento novo; o modelo de tópicos salvo é usado sem atualização.")
+        return tfidf_vectorizer, lda_model, []
+
+    new_matrix = tfidf_vectorizer.transform(new_texts.fillna("")).tocsr()
+    logging.info(f"Atualizando o modelo de tópicos com {new_matrix.shape[0]} documentos novos (mini-lotes de {batch_size})...")
+    latencies = partial_fit_topic_model(lda_model, new_matrix, batch_size=batch_size)
+    if latencies:
+        logging.info(f"LDA incremental concluído: {len(latencies)} lotes, total {sum(latencies):.3f} s, média {np.mean(latencies) * 1000:.1f} ms por lote.")
+
+    if persist:
+        # A impressão digital encadeia a do modelo pai com a dos documentos novos
+        fingerprint = compute_data_fingerprint([parent_manifest['data_fingerprint'], compute_matrix_fingerprint(new_matrix)])
+        save_artifact(LDA_ARTIFACT_NAME, lda_model, fingerprint, metadata_extra={
+            'vectorizer_version': parent_manifest['metadata'].get('vectorizer_version'),
+            'parent_version': parent_manifest['version'],
+            'num_topics': lda_model.n_components,
+            'n_new_documents': new_matrix.shape[0],
+        })
+    return tfidf_vectorizer, lda_model, latencies
+
+SENTIMENT_LABELS = np.array(["Negativo", "Neutro", "Positivo"], dtype=object)
+
+@lru_cache(maxsize=None)
+@traced(category='sentimento')
+def get_sentiment_lexicon_index() -> tuple[dict, 'sp.csr_matrix']:
+    """
+    Lematiza os léxicos POSITIVE_WORDS e NEGATIVE_WORDS uma única vez e monta o índice de sentimento.
+
+    Returns:
+        tuple[dict, sp.csr_matrix]:
+            - Dicionário termo -> posição no vocabulário do léxico. Inclui a forma original de cada palavra
+              e o seu lemma, para casar com os lemmas produzidos pelo spaCy.
+            - Matriz esparsa (termos x 2) de pertencimento: coluna 0 = positivo, coluna 1 = negativo.
+    """
+    import scipy.sparse as sp
+
+    term_to_index = {}
+    rows, cols = [], []
+    for polarity, words in enumerate((POSITIVE_WORDS, NEGATIVE_WORDS)):
+        for word, lemmas in zip(words, lemmatize_texts(words)):
+            for term in dict.fromkeys([word, *lemmas]):
+                index = term_to_index.setdefault(term, len(term_to_index))
+                rows.append(index)
+                cols.append(polarity)
+    membership = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(term_to_index), 2))
+    membership.data[:] = 1.0 # Um termo repetido no mesmo léxico conta uma única vez
+    logging.info(f"Léxicos de sentimento indexados: {len(term_to_index)} termos (formas originais e lemmas).")
+    return term_to_index, membership
+
+@lru_cache(maxsize=None)
+def get_sentiment_lexicon_terms() -> tuple[frozenset, frozenset]:
+    """Termos (formas originais e lemmas) do léxico positivo e do negativo, tirados do índice de get_sentiment_lexicon_index."""
+    term_to_index, membership = get_sentiment_lexicon_index()
+    terms = np.array(list(term_to_index), dtype=object) # Na ordem das posições do índice
+    in_lexicon = membership.toarray() > 0
+    return frozenset(terms[in_lexicon[:, 0]]), frozenset(terms[in_lexicon[:, 1]])
+
+@traced(category='sentimento')
+def score_sentiment_lemmas(lemma_lists: pd.Series, lexicon_index: tuple = None) -> pd.DataFrame:
+    """
+    Calcula o sentimento de várias listas de lemmas de forma vetorizada.
+    As contagens de termos positivos e negativos saem de um único produto esparso
+    (documentos x termos do léxico) @ (termos do léxico x polaridade).
+
+    Args:
+        lemma_lists (pd.Series): Uma lista de lemmas por documento (ex: coluna '{col}_lemmas').
+        lexicon_index (tuple, optional): Saída de get_sentiment_lexicon_index. Se None, é obtida (e cacheada) aqui.
+
+    Returns:
+        pd.DataFrame: Com o mesmo índice da entrada e as colunas:
+            - 'positivos' / 'negativos': contagem de termos de cada léxico (int32).
+            - 'score': polaridade (positivos - negativos) / (positivos + negativos), em [-1, 1] (float32).
+            - 'sentimento': rótulo 'Positivo', 'Negativo' ou 'Neutro', pelo sinal do score.
+    """
+    import scipy.sparse as sp
+
+    term_to_index, membership = get_sentiment_lexicon_index() if lexicon_index is None else lexicon_index
+    lemma_lists = lemma_lists.apply(lambda lemmas: lemmas if isinstance(lemmas, list) else [])
+    lengths = lemma_lists.str.len().to_numpy(dtype=np.int64)
+    tokens = pd.Series([lemma for lemmas in lemma_lists for lemma in lemmas], dtype=object)
+
+    term_codes = tokens.map(term_to_index).to_numpy(dtype=np.float64)
+    doc_ids = np.repeat(np.arange(len(lemma_lists)), lengths)
+    in_lexicon = ~np.isnan(term_codes)
+    doc_term = sp.csr_matrix(
+        (np.ones(in_lexicon.sum(), dtype=np.float32), (doc_ids[in_lexicon], term_codes[in_lexicon].astype(np.int64))),
+        shape=(len(lemma_lists), len(term_to_index))
+    )
+    counts = np.asarray((doc_term @ membership).todense(), dtype=np.int32)
+    pos_counts, neg_counts = counts[:, 0], counts[:, 1]
+
+    scores = ((pos_counts - neg_counts) / np.maximum(pos_counts + neg_counts, 1)).astype(np.float32)
+    labels = SENTIMENT_LABELS[np.sign(scores).astype(np.int64) + 1]
+    return pd.DataFrame({'positivos': pos_counts, 'negativos': neg_counts, 'score': scores, 'sentimento': labels}, index=lemma_lists.index)
+
+def combine_sentiment_priority(score_matrix: np.ndarray) -> np.ndarray:
+    """
+    Combina os scores de sentimento de várias colunas (participantes x colunas) em um rótulo geral,
+    com prioridade para Negativo, depois Positivo, depois Neutro.
+    """
+    score_matrix = np.asarray(score_matrix, dtype=np.float32).reshape(len(score_matrix), -1)
+    return np.select(
+        [(score_matrix < 0).any(axis=1), (score_matrix > 0).any(axis=1)],
+        ["Negativo", "Positivo"],
+        default="Neutro"
+    ).astype(object)
 
 def get_sentiment_score_lexicon(text: str) -> str:
     """
@@ -176,28 +608,26 @@ def get_sentiment_score_lexicon(text: str) -> str:
     if not isinstance(text, str) or text.strip() == "":
         return "Neutro"
     
-    lemmas = tokenize_and_lemmatize(text) # Usa a lematização do spaCy (ou fallback simples)
-    
-    pos_score = sum(1 for word in lemmas if word in POSITIVE_WORDS)
-    neg_score = sum(1 for word in lemmas if word in NEGATIVE_WORDS)
-    
-    if pos_score > neg_score:
-        return "Positivo"
-    elif neg_score > pos_score:
-        return "Negativo"
-    else:
-        return "Neutro"
+    lemmas = tokenize_and_lemmatize(text) # Usa a lematização do spaCy (ou fallback simples), passando pelo cache de lemmas
+    return classify_sentiment_lemmas(lemmas)
+
+def classify_sentiment_lemmas(lemmas: list) -> str:
+    """
+    Classifica o sentimento de uma lista de lemmas já calculada, com os léxicos de palavras positivas e negativas.
+    Busca direta nos conjuntos de termos de cada léxico, com o mesmo resultado de score_sentiment_lemmas
+    (use a função em lote para muitas listas).
+    """
+    positive_terms, negative_terms = get_sentiment_lexicon_terms()
+    lemmas = lemmas if isinstance(lemmas, list) else []
+    balance = sum(lemma in positive_terms for lemma in lemmas) - sum(lemma in negative_terms for lemma in lemmas)
+    return SENTIMENT_LABELS[int(np.sign(balance)) + 1]
 
-def analyze_sentiment(texts: pd.Series) -> pd.Series:
+def analyze_sentiment(lemma_lists: pd.Series) -> pd.Series:
     """
-    Realiza a análise de sentimento em uma série de textos usando o léxico customizado.
-    Retorna uma série com a categoria de sentimento.
+    Categoria de sentimento de cada lista de lemmas já calculada (ex: coluna '{col}_lemmas'), com o léxico customizado.
+    Atalho para a coluna 'sentimento' de score_sentiment_lemmas; não lematiza de novo.
     """
-    logging.info("Realizando análise de sentimento com léxico customizado...")
-    sentiments = texts.fillna("").apply(get_sentiment_score_lexicon)
-    sentiment_series = pd.Series(sentiments, index=texts.index)
-    logging.info("Análise de sentimento concluída com léxico customizado.")
-    return sentiment_series
+    return score_sentiment_lemmas(lemma_lists)['sentimento']
 
 if __name__ == '__main__':
     logging.info("Executando nlp_processing.py para teste com spaCy e Léxico Customizado.")
@@ -240,10 +670,11 @@ if __name__ == '__main__':
 
     full_cleaned_text = test_df['text_col_1_cleaned'].fillna("") + " " + test_df['text_col_2_cleaned'].fillna("")
     if not full_cleaned_text.empty:
-        tfidf_vectorizer, tfidf_df = vectorize_text_tfidf(full_cleaned_text)
-        if not tfidf_df.empty:
-            lda_model, topics = apply_topic_modeling_lda(tfidf_df, num_topics=2)
+        tfidf_vectorizer, tfidf_matrix, vectorizer_version = vectorize_text_tfidf(full_cleaned_text)
+        if tfidf_matrix.nnz > 0:
+            lda_model, topics = apply_topic_modeling_lda(tfidf_matrix, tfidf_vectorizer.get_feature_names_out(), num_topics=2,
+                                                         vectorizer_version=vectorizer_version)
 
-    test_df['sentiment_text_col_1'] = analyze_sentiment(test_df['text_col_1_cleaned'])
+    test_df['sentiment_text_col_1'] = analyze_sentiment(test_df['text_col_1_lemmas'])
     print("\n--- Análise de Sentimento (Léxico Customizado) ---")
     print(test_df[['text_col_1', 'sentiment_text_col_1']].head())
\ No newline at end of file
@@ -0,0 +1,213 @@
+# transdevs_techexperience/src/analysis/team_formation.py
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+from src.config import (GROUP_NAMES, TOPIC_TO_GROUP_APTITUDE_MAP, NO_ALTERNATIVE_OPTION, TEAM_FORMATION_PATH, LEADERSHIP_ANALYSIS_PATH,
+                        TEAM_GROUP_CAPACITY, TEAM_CAPACITY_SLACK, TEAM_PREFERENCE_COSTS, TEAM_TOPIC_AFFINITY_WEIGHT)
+from src.analysis.leadership_analysis import load_eda_data, group_options_matrix, compute_topic_aptitude
+from src.storage import read_dataset, write_dataset
+from src.tracing import traced
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Status de liderança (src/analysis/leadership_analysis.py) que já reservam uma vaga no grupo sugerido
+LEADER_STATUS_PREFIXES = ('Líder Direto Atribuído', 'Potencial Líder para Suporte')
+
+def get_team_capacities(groups: list, n_participants: int) -> np.ndarray:
+    """
+    Vagas de participantes em cada grupo: TEAM_GROUP_CAPACITY, ou
+    ceil(TEAM_CAPACITY_SLACK * n_participants / len(groups)) para os grupos fora dele.
+    """
+    default_capacity = math.ceil(TEAM_CAPACITY_SLACK * n_participants / max(len(groups), 1))
+    return np.array([TEAM_GROUP_CAPACITY.get(group, default_capacity) for group in groups], dtype=int)
+
+def compute_team_costs(df: pd.DataFrame, groups: list, topic_aptitude_map: dict = TOPIC_TO_GROUP_APTITUDE_MAP) -> tuple:
+    """
+    Monta os custos (menor = preferido) da formação de equipes:
+    TEAM_PREFERENCE_COSTS conforme o grupo seja o principal, um dos alternativos ou outro,
+    menos TEAM_TOPIC_AFFINITY_WEIGHT x aptidão do tópico LDA principal para o grupo.
+    Os custos de 'outro' grupo só dependem do tópico, então ficam numa tabela compartilhada
+    (uma linha por perfil de tópico) em vez de repetidos por participante.
+    Quem respondeu NO_ALTERNATIVE_OPTION não pode ir para outros grupos.
+
+    Returns:
+        tuple: (custos diretos (participantes x grupos, infinito fora do principal e dos alternativos),
+                tabela de custos de 'outro' grupo, linha da tabela de cada participante (-1 se não aceita outros grupos),
+                máscara do grupo principal, máscara dos grupos alternativos, aptidão do tópico).
+    """
+    principal = group_options_matrix(df['grupo_principal'], groups)
+    alternative = group_options_matrix(df['grupo_alternativo'], groups) & ~principal
+    only_principal = df['grupo_alternativo'].astype(object).eq(NO_ALTERNATIVE_OPTION).to_numpy() & principal.any(axis=1)
+    topic_aptitude = compute_topic_aptitude(df, groups, topic_aptitude_map)
+    topic_discount = TEAM_TOPIC_AFFINITY_WEIGHT * topic_aptitude
+
+    direct_costs = np.select([principal, alternative], [TEAM_PREFERENCE_COSTS['principal'], TEAM_PREFERENCE_COSTS['alternativo']],
+                             default=np.inf) - topic_discount
+    open_discounts, open_row = np.unique(topic_discount, axis=0, return_inverse=True)
+    open_costs = TEAM_PREFERENCE_COSTS['outro'] - open_discounts
+    open_row = np.where(only_principal, -1, open_row.ravel())
+    return direct_costs, open_costs, open_row, principal, alternative, topic_aptitude
+
+def solve_team_assignment(direct_costs: np.ndarray, capacities: np.ndarray, open_costs: np.ndarray = None, open_row: np.ndarray = None) -> np.ndarray:
+    """
+    Aloca participantes a grupos com custo total mínimo, respeitando as vagas de cada grupo,
+    como um fluxo de custo mínimo resolvido por scipy.optimize.linprog (HiGHS):
+    - Participantes com os mesmos custos são intercambiáveis: cada perfil distinto vira um nó de oferta.
+    - Arestas diretas perfil -> grupo para os custos finitos de direct_costs (grupo principal e alternativos).
+    - Quem aceita qualquer grupo passa por um nó compartilhado (uma linha de open_costs), ligado a todos
+      os grupos. Assim o problema não cresce com perfis x grupos. Ir para o principal ou um alternativo
+      pelo nó compartilhado nunca sai mais barato que a aresta direta, então o ótimo não muda.
+    - Ficar sem vaga custa mais que qualquer troca de grupo: o solver aloca o máximo possível e,
+      entre essas alocações, minimiza o custo.
+    As restrições formam uma rede com ofertas e vagas inteiras, então o simplex devolve um fluxo inteiro.
+
+    Args:
+        direct_costs (np.ndarray): Custos (participantes x grupos); infinito onde não há aresta direta.
+        capacities (np.ndarray): Vagas disponíveis em cada grupo.
+        open_costs (np.ndarray, optional): Tabela (linhas x grupos) de custos para qualquer grupo.
+        open_row (np.ndarray, optional): Linha de open_costs de cada participante, ou -1 se não aceita outros grupos.
+
+    Returns:
+        np.ndarray: Índice do grupo atribuído a cada participante, ou -1 se ficou sem vaga.
+    """
+    n_participants, n_groups = direct_costs.shape
+    assignment = np.full(n_participants, -1)
+    capacities = np.maximum(np.asarray(capacities, dtype=int), 0)
+    if open_costs is None:
+        open_costs, open_row = np.zeros((0, n_groups)), np.full(n_participants, -1)
+    if n_participants == 0 or n_groups == 0 or capacities.sum() == 0:
+        return assignment
+
+    # Perfis distintos (custos diretos + nó compartilhado) e quantos participantes há em cada um
+    keys = np.column_stack([direct_costs, open_row])
+    profiles, profile_of, supply = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    profile_of = profile_of.ravel()
+    profile_open_row = profiles[:, -1].astype(int)
+    profiles = profiles[:, :-1]
+    n_profiles, n_hubs = len(profiles), len(open_costs)
+
+    # Variáveis: [perfil -> grupo (direto)] [perfil -> nó compartilhado] [nó compartilhado -> grupo] [perfil sem vaga]
+    direct_profile, direct_group = np.nonzero(np.isfinite(profiles))
+    hub_profile = np.flatnonzero(profile_open_row >= 0)
+    hub_of = profile_open_row[hub_profile]
+    out_hub, out_group = np.divmod(np.arange(n_hubs * n_groups), n_groups)
+    n_direct, n_in, n_out = len(direct_profile), len(hub_profile), n_hubs * n_groups
+    offsets = np.cumsum([0, n_direct, n_in, n_out])
+    n_vars = offsets[-1] + n_profiles
+
+    finite_costs = np.concatenate([profiles[direct_profile, direct_group], open_costs.ravel()])
+    unassigned_cost = 1.0 + (np.ptp(finite_costs) if len(finite_costs) else 0.0) * n_participants
+    objective = np.concatenate([profiles[direct_profile, direct_group], np.zeros(n_in), open_costs.ravel(), np.full(n_profiles, unassigned_cost)])
+
+    # Igualdade: cada perfil distribui todos os seus participantes; cada nó compartilhado repassa tudo o que recebe
+    eq_rows = np.concatenate([direct_profile, hub_profile, np.arange(n_profiles), n_profiles + hub_of, n_profiles + out_hub])
+    eq_cols = np.concatenate([np.arange(n_direct), offsets[1] + np.arange(n_in), offsets[3] + np.arange(n_profiles),
+                              offsets[1] + np.arange(n_in), offsets[2] + np.arange(n_out)])
+    eq_vals = np.concatenate([np.ones(n_direct + n_in + n_profiles + n_in), -np.ones(n_out)])
+    a_eq = sparse.csr_matrix((eq_vals, (eq_rows, eq_cols)), shape=(n_profiles + n_hubs, n_vars))
+    b_eq = np.concatenate([supply, np.zeros(n_hubs)])
+    # Desigualdade: cada grupo recebe no máximo as suas vagas (arestas diretas + saídas dos nós compartilhados)
+    ub_rows = np.concatenate([direct_group, out_group])
+    ub_cols = np.concatenate([np.arange(n_direct), offsets[2] + np.arange(n_out)])
+    a_ub = sparse.csr_matrix((np.ones(len(ub_rows)), (ub_rows, ub_cols)), shape=(n_groups, n_vars))
+
+    result = linprog(objective, A_ub=a_ub, b_ub=capacities, A_eq=a_eq, b_eq=b_eq, bounds=(0, None), method='highs-ds')
+    if not result.success:
+        logging.error(f"Não foi possível resolver a formação de equipes: {result.message}")
+        return assignment
+    flow = np.rint(result.x).astype(int)
+
+    # Vagas de cada perfil: primeiro as diretas, depois as recebidas do nó compartilhado (em ordem de grupo)
+    direct_flows = np.zeros((n_profiles, n_groups), dtype=int)
+    direct_flows[direct_profile, direct_group] = flow[:n_direct]
+    hub_inflow = np.zeros(n_profiles, dtype=int)
+    hub_inflow[hub_profile] = flow[offsets[1]:offsets[2]]
+    hub_slots = [np.repeat(np.arange(n_groups), row) for row in flow[offsets[2]:offsets[3]].reshape(n_hubs, n_groups)]
+    hub_used = np.zeros(n_hubs, dtype=int)
+
+    # Participantes de cada perfil recebem as vagas na ordem das respostas
+    members_by_profile = np.split(np.argsort(profile_of, kind='stable'), np.cumsum(supply)[:-1])
+    for profile, members in enumerate(members_by_profile):
+        slots = np.repeat(np.arange(n_groups), direct_flows[profile])
+        if hub_inflow[profile]:
+            hub = profile_open_row[profile]
+            slots = np.concatenate([slots, hub_slots[hub][hub_used[hub]:hub_used[hub] + hub_inflow[profile]]])
+            hub_used[hub] += hub_inflow[profile]
+        assignment[members[:len(slots)]] = slots
+    return assignment
+
+@traced(category='equipes')
+def form_teams(df_eda: pd.DataFrame, df_leadership: pd.DataFrame = None, groups: list = GROUP_NAMES) -> pd.DataFrame:
+    """
+    Distribui todos os participantes ativos entre os grupos de trabalho.
+    - Líderes atribuídos na análise de liderança (LEADER_STATUS_PREFIXES) ficam no grupo sugerido e ocupam uma vaga.
+    - Os demais são alocados por solve_team_assignment, respeitando as vagas (get_team_capacities),
+      as preferências principal e alternativas e a afinidade do tópico LDA com o grupo.
+
+    Args:
+        df_eda (pd.DataFrame): Dados finais da EDA (uma linha por participante ativo).
+        df_leadership (pd.DataFrame, optional): Saída de analyze_leadership_potential.
+        groups (list): Grupos de trabalho. Por padrão, GROUP_NAMES.
+
+    Returns:
+        pd.DataFrame: Uma linha por participante, com 'grupo_atribuido' ('N/A' se ficou sem vaga),
+                      'tipo_alocacao' (Liderança, Principal, Alternativa, Outro grupo ou Sem vaga)
+                      e 'afinidade_topico' (aptidão do tópico LDA para o grupo atribuído).
+    """
+    if df_eda.empty:
+        logging.error("DataFrame EDA está vazio. Não é possível formar as equipes.")
+        return pd.DataFrame()
+
+    logging.info(f"Formando equipes para {len(df_eda)} participantes em {len(groups)} grupos...")
+    df_teams = df_eda[['participant_id', 'grupo_principal', 'grupo_alternativo', 'main_topic']].reset_index(drop=True)
+    group_array = np.asarray(groups, dtype=object)
+    capacities = get_team_capacities(groups, len(df_teams))
+    direct_costs, open_costs, open_row, principal, alternative, topic_aptitude = compute_team_costs(df_teams, groups)
+
+    # Líderes já alocados reservam a vaga no grupo sugerido
+    assignment = np.full(len(df_teams), -1)
+    if df_leadership is not None and not df_leadership.empty:
+        leaders = df_leadership[df_leadership['status_lideranca_final'].astype(str).str.startswith(LEADER_STATUS_PREFIXES)]
+        leader_groups = leaders.set_index('participant_id')['sugestao_lideranca_grupo'].astype(object)
+        group_index = pd.Series(np.arange(len(groups)), index=group_array)
+        leader_idx = df_teams['participant_id'].map(leader_groups).map(group_index)
+        assignment = leader_idx.fillna(-1).astype(int).to_numpy()
+    is_leader = assignment >= 0
+    remaining = capacities - np.bincount(assignment[is_leader], minlength=len(groups))
+    logging.info(f"{is_leader.sum()} líderes mantidos nos grupos sugeridos. Vagas restantes: {dict(zip(groups, remaining.tolist()))}")
+
+    assignment[~is_leader] = solve_team_assignment(direct_costs[~is_leader], remaining, open_costs, open_row[~is_leader])
+
+    assigned = assignment >= 0
+    rows = np.arange(len(df_teams))
+    chosen = np.maximum(assignment, 0)
+    df_teams['grupo_atribuido'] = np.where(assigned, group_array[chosen], 'N/A')
+    df_teams['tipo_alocacao'] = np.select(
+        [is_leader, assigned & principal[rows, chosen], assigned & alternative[rows, chosen], assigned],
+        ['Liderança', 'Principal', 'Alternativa', 'Outro grupo'], default='Sem vaga')
+    df_teams['afinidade_topico'] = np.where(assigned, topic_aptitude[rows, chosen], 0.0)
+
+    logging.info(f"Formação de equipes concluída: {df_teams['tipo_alocacao'].value_counts().to_dict()}")
+    return df_teams
+
+if __name__ == '__main__':
+    logging.info("Executando team_formation.py para teste.")
+    df_eda_test = load_eda_data()
+    try:
+        df_leadership_test = read_dataset(LEADERSHIP_ANALYSIS_PATH)
+    except FileNotFoundError:
+        logging.warning("Insights de liderança não encontrados; os líderes não terão vaga reservada.")
+        df_leadership_test = None
+
+    df_teams_test = form_teams(df_eda_test, df_leadership_test)
+    if not df_teams_test.empty:
+        print("\n--- Equipes formadas ---")
+        print(df_teams_test.groupby('grupo_atribuido', observed=True)['tipo_alocacao'].value_counts().unstack(fill_value=0))
+        saved_path = write_dataset(df_teams_test, TEAM_FORMATION_PATH)
+        logging.info(f"Equipes salvas em: {saved_path}")
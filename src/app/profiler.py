@@ -0,0 +1,98 @@
+# transdevs_techexperience/src/app/profiler.py
+
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+import pandas as pd
+from src.config import DASHBOARD_PROFILER_QUERY_PARAM, DASHBOARD_PROFILER_HISTORY
+
+# Chaves do session_state: início e tempos do rerun atual, seções abertas (para os nomes aninhados) e histórico dos reruns da sessão
+_START_KEY = '_profiler_start'
+_CURRENT_KEY = '_profiler_current'
+_STACK_KEY = '_profiler_stack'
+_HISTORY_KEY = '_profiler_history'
+
+def profiling_enabled() -> bool:
+    """Profiler ligado por ?profile=1 (ou true) na URL ou por profiler = true no secrets.toml."""
+    if st.query_params.get(DASHBOARD_PROFILER_QUERY_PARAM, '').lower() in ('1', 'true'):
+        return True
+    try:
+        return bool(st.secrets.get('profiler', False))
+    except Exception: # Sem secrets.toml
+        return False
+
+def start_rerun():
+    """Início do rerun: zera os tempos do rerun atual (só com o profiler ligado)."""
+    if not profiling_enabled():
+        return
+    st.session_state[_START_KEY] = time.perf_counter()
+    st.session_state[_CURRENT_KEY] = {}
+    st.session_state[_STACK_KEY] = []
+
+@contextmanager
+def profile_section(name: str):
+    """
+    Mede o tempo de parede do bloco neste rerun. Seções dentro de seções ganham o nome do caminho (ex: 'Visão Geral › gráfico');
+    uma seção executada mais de uma vez no mesmo rerun soma os tempos. Sem o profiler ligado, não faz nada.
+    """
+    current = st.session_state.get(_CURRENT_KEY) if profiling_enabled() else None
+    if current is None:
+        yield
+        return
+    stack = st.session_state[_STACK_KEY]
+    stack.append(name)
+    path = ' › '.join(stack)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current[path] = current.get(path, 0.0) + (time.perf_counter() - start) * 1000
+        stack.pop()
+
+def profiled(name_from_args):
+    """Decorador de profile_section para funções de desenho; name_from_args monta o nome da seção a partir dos argumentos."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_section(name_from_args(*args, **kwargs)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def history_summary(history) -> pd.DataFrame:
+    """p50, p95, último tempo (ms) e número de reruns em que cada seção executou, da mais lenta (p95) à mais rápida."""
+    df = pd.DataFrame(list(history))
+    if df.empty:
+        return pd.DataFrame(columns=['seção', 'p50 (ms)', 'p95 (ms)', 'último (ms)', 'reruns'])
+    summary = pd.DataFrame({
+        'p50 (ms)': df.quantile(0.5),
+        'p95 (ms)': df.quantile(0.95),
+        'último (ms)': df.iloc[-1],
+        'reruns': df.count(),
+    })
+    summary.index.name = 'seção'
+    return summary.sort_values('p95 (ms)', ascending=False).round(1).reset_index()
+
+def finish_rerun():
+    """
+    Fim do rerun: guarda os tempos no histórico da sessão (últimos DASHBOARD_PROFILER_HISTORY reruns)
+    e mostra o painel do profiler na barra lateral.
+    """
+    current = st.session_state.get(_CURRENT_KEY) if profiling_enabled() else None
+    if current is None:
+        return
+    current['rerun (total)'] = (time.perf_counter() - st.session_state[_START_KEY]) * 1000
+    history = st.session_state.setdefault(_HISTORY_KEY, deque(maxlen=DASHBOARD_PROFILER_HISTORY))
+    history.append(current)
+    del st.session_state[_CURRENT_KEY]
+
+    with st.sidebar:
+        st.markdown('### Profiler do dashboard')
+        st.caption(f"Tempo de parede por seção e gráfico nos últimos {len(history)} reruns desta sessão "
+                   f"(máximo {DASHBOARD_PROFILER_HISTORY}). Seções não executadas num rerun ficam fora dos percentis.")
+        if st.button('Limpar histórico', key='_profiler_clear'):
+            history.clear()
+        st.dataframe(history_summary(history), hide_index=True, width='stretch')
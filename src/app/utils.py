@@ -2,10 +2,19 @@
 
 import streamlit as st
 import pandas as pd
+import hashlib
 import os
+from collections.abc import Mapping
+from io import BytesIO
+from types import MappingProxyType
+import pyarrow as pa
 import plotly.express as px
 import plotly.graph_objects as go
-from src.config import EDA_FINAL_PATH, LEADERSHIP_ANALYSIS_PATH, ANONYMIZED_PII_PATH
+from src.config import EDA_FINAL_PATH, LEADERSHIP_ANALYSIS_PATH, ANONYMIZED_PII_PATH, DASHBOARD_BUNDLE_PATH, WORDCLOUD_MAX_WORDS, GROUP_NAMES
+from src.storage import read_dataset
+from src.dashboard_bundle import read_dashboard_bundle, build_dashboard_bundle_from_datasets, frequencies_fingerprint
+from src.analysis.ngram_index import NgramIndex
+from src.app.profiler import profiled
 
 # --- IDENTIDADE VISUAL DIVERSIFICADEV ---
 # Paleta de Cores (ajustadas para alto contraste em fundo escuro)
@@ -31,25 +40,126 @@ FONT_PRINCIPAL = "Mona Sans, sans-serif"
 processed_data_path = EDA_FINAL_PATH
 leadership_data_path = LEADERSHIP_ANALYSIS_PATH
 pii_mapping_path = ANONYMIZED_PII_PATH
+dashboard_bundle_path = DASHBOARD_BUNDLE_PATH
 
-@st.cache_data(show_spinner=False) # Adiciona cache para evitar re-executar tudo se o estado do app mudar
-def load_dashboard_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+# Colunas das tabelas exibidas no dashboard (com o nome vindo do mapeamento de PII)
+DIRECT_LEADER_COLUMNS = ['nome_completo', 'grupo_principal_preferido', 'grupo_alternativo_preferido', 'sugestao_lideranca_grupo', 'tipo_sugestao']
+SUPPORT_SUGGESTION_COLUMNS = ['nome_completo', 'sugestao_lideranca_grupo', 'aptidao_score_geral', 'justificativa_bagagem', 'justificativa_topico_lda', 'justificativa_sentimento']
+TEAM_MEMBER_COLUMNS = ['nome_completo', 'tipo_alocacao', 'grupo_principal', 'grupo_alternativo', 'afinidade_topico']
+
+@st.cache_resource(show_spinner=False) # Uma cópia por processo, compartilhada (somente leitura) por todas as sessões
+def load_dashboard_data() -> tuple[Mapping, Mapping]:
     """
-    Carrega os DataFrames necessários para o dashboard.
+    Carrega os dados necessários para o dashboard.
     Esta função agora espera que os dados já estejam gerados ANTES da execução do app.
+    - Pacote de agregados (src/dashboard_bundle.py): contagens, distribuições de sentimento, tabelas de liderança e equipes
+      e frequências da nuvem de palavras. Se o pacote não existir, ele é montado a partir dos datasets processados.
+    - Tabelas de liderança e equipes já com os nomes do mapeamento de PII (ver build_display_tables).
+    Com st.cache_resource, todas as sessões leem os mesmos objetos, sem cópia (st.cache_data entregava uma cópia
+    desserializada a cada rerun de cada sessão). Por isso o pacote é congelado e as tabelas são pyarrow.Table, imutáveis.
+
+    Returns:
+        tuple: (pacote congelado, tabelas exibidas).
     """
     try:
-        df_eda = pd.read_csv(EDA_FINAL_PATH)
-        df_leadership = pd.read_csv(LEADERSHIP_ANALYSIS_PATH)
-        df_pii = pd.read_csv(ANONYMIZED_PII_PATH)
-        return df_eda, df_leadership, df_pii
+        try:
+            bundle = read_dashboard_bundle(dashboard_bundle_path)
+        except (FileNotFoundError, ValueError):
+            # Pacote ausente ou de outra versão: monta a partir dos datasets gravados (uma vez, fica no cache)
+            bundle = build_dashboard_bundle_from_datasets()
+        df_pii = read_dataset(pii_mapping_path, columns=['participant_id', 'nome_completo'])
+        return freeze(bundle), build_display_tables(bundle, df_pii)
     except FileNotFoundError as e:
         st.error(f"Erro ao carregar dados: {e}. Certifique-se de que os scripts de ETL e EDA foram executados no ambiente de deploy (ou localmente).", icon="❌")
         st.stop() # Interrompe o app se os dados essenciais não forem encontrados
     except Exception as e:
         st.error(f"Ocorreu um erro inesperado ao carregar os dados: {e}", icon="❗")
         st.stop()
-    return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    return freeze({}), freeze({})
+
+def set_dashboard_data_paths(bundle_path: str = DASHBOARD_BUNDLE_PATH, pii_path: str = ANONYMIZED_PII_PATH):
+    """
+    Troca o pacote de agregados e o mapeamento de PII lidos pelo dashboard neste processo e descarta os dados já carregados.
+    Usado pelo teste de carga (benchmarks/load_test_dashboard.py), que abre o dashboard sobre dados sintéticos sem mexer nos do projeto.
+    """
+    global dashboard_bundle_path, pii_mapping_path
+    dashboard_bundle_path, pii_mapping_path = bundle_path, pii_path
+    load_dashboard_data.clear()
+
+def freeze(obj):
+    """Cópia somente leitura de um objeto JSON: dicts viram MappingProxyType e listas viram tuplas (alterar levanta TypeError)."""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(value) for value in obj)
+    return obj
+
+def with_names(records: list, df_pii: pd.DataFrame) -> pd.DataFrame:
+    """Tabela do pacote de agregados (lista de registros) com a coluna 'nome_completo' do mapeamento de PII."""
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+    id_to_name = df_pii.set_index('participant_id')['nome_completo']
+    df.insert(0, 'nome_completo', df['participant_id'].map(id_to_name))
+    return df
+
+def _display_table(df: pd.DataFrame, columns: list) -> pa.Table:
+    return pa.Table.from_pandas(df.reindex(columns=columns), preserve_index=False)
+
+def build_display_tables(bundle: dict, df_pii: pd.DataFrame) -> Mapping:
+    """
+    Tabelas exibidas nas seções de liderança e equipes, montadas uma vez por processo: nomes do mapeamento de PII já juntados
+    e integrantes já separados por grupo. São pyarrow.Table (imutáveis; o st.dataframe as envia sem conversão).
+    Chaves: 'direct_leaders', 'support_suggestions' e 'team_members' ({grupo atribuído: tabela}, sem grupos vazios).
+    """
+    df_members = with_names(bundle['teams']['members'], df_pii) if bundle['teams'] else pd.DataFrame()
+    team_members = {}
+    if not df_members.empty:
+        for group in GROUP_NAMES + ['N/A']:
+            members = df_members[df_members['grupo_atribuido'] == group]
+            if not members.empty:
+                team_members[group] = _display_table(members, TEAM_MEMBER_COLUMNS)
+    return MappingProxyType({
+        'direct_leaders': _display_table(with_names(bundle['leadership']['direct_leaders'], df_pii), DIRECT_LEADER_COLUMNS),
+        'support_suggestions': _display_table(with_names(bundle['leadership']['support_suggestions'], df_pii), SUPPORT_SUGGESTION_COLUMNS),
+        'team_members': MappingProxyType(team_members),
+    })
+
+@st.cache_resource(show_spinner=False)
+def load_ngram_index() -> NgramIndex:
+    """
+    Índice de n-grams gravado pelo run_eda.py, compartilhado (somente leitura) entre as sessões.
+    Só é carregado quando a nuvem de palavras usa algum filtro; sem o índice gravado, é montado a partir da EDA.
+    """
+    try:
+        return NgramIndex.load()
+    except FileNotFoundError:
+        return NgramIndex.build(read_dataset(EDA_FINAL_PATH))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def faceted_wordcloud_frequencies(n: int, text_column: str = None, sentiment: str = None, group: str = None) -> tuple[dict, str]:
+    """
+    Frequências da nuvem de palavras com filtros (pergunta, sentimento da resposta, grupo principal; None = todos),
+    consultadas nas contagens do índice, e a impressão digital delas (chave de render_wordcloud_image).
+    """
+    frequencies = load_ngram_index().frequencies(n, k=WORDCLOUD_MAX_WORDS, text_column=text_column, sentiment=sentiment,
+                                                 grupo_principal=group)
+    return frequencies, frequencies_fingerprint(frequencies)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def render_wordcloud_image(n: int, fingerprint: str, _frequencies: dict) -> bytes:
+    """
+    Desenha a nuvem de palavras (PNG) a partir das frequências prontas (pacote de agregados ou índice de n-grams).
+    O cache é indexado por (n, fingerprint): trocar o tipo de n-gram só busca a imagem já desenhada,
+    e uma nova impressão digital (dados novos) gera uma nova imagem. _frequencies fica fora da chave do cache.
+    """
+    from wordcloud import WordCloud # Só carregado quando uma imagem nova precisa ser desenhada
+    wordcloud = WordCloud(width=800, height=400, background_color=COLORS["Solid Black"], colormap='magma',
+                          max_words=WORDCLOUD_MAX_WORDS, random_state=42).generate_from_frequencies(_frequencies)
+    buffer = BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
 
 
 def get_logo_path(logo_filename: str = "diversificadev_logo.png") -> str:
@@ -126,25 +236,26 @@ def apply_custom_css():
             color: {COLORS["Solid Black"]};
         }}
         
-        /* Abas (Tabs) */
-        .stTabs [data-baseweb="tab-list"] {{
+        /* Seletor de seção (rádio horizontal com visual de abas; só a seção escolhida é executada) */
+        .st-key-dashboard_section [role="radiogroup"] {{
             gap: 24px;
         }}
-        .stTabs [data-baseweb="tab-list"] button {{
+        .st-key-dashboard_section [role="radiogroup"] label {{
             background-color: {COLORS["Solid Black"]};
             border-radius: 4px;
             border: 1px solid {COLORS["Diverse Purple"]};
+            padding: 6px 12px;
         }}
-        .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {{
+        .st-key-dashboard_section [role="radiogroup"] label [data-testid="stMarkdownContainer"] p {{
             font-size: 1.2rem;
             color: {COLORS["Pure White"]};
             font-weight: 600;
         }}
-        .stTabs [data-baseweb="tab-list"] button[aria-selected="true"] {{
+        .st-key-dashboard_section [role="radiogroup"] label:has(input:checked) {{
             background-color: {COLORS["Inclusive Pink"]};
             border: 1px solid {COLORS["Inclusive Pink"]};
         }}
-        .stTabs [data-baseweb="tab-list"] button[aria-selected="true"] [data-testid="stMarkdownContainer"] p {{
+        .st-key-dashboard_section [role="radiogroup"] label:has(input:checked) [data-testid="stMarkdownContainer"] p {{
             color: {COLORS["Solid Black"]};
         }}
 
@@ -186,14 +297,19 @@ def apply_custom_css():
     """
     st.markdown(custom_css, unsafe_allow_html=True)
 
-def plot_bar_chart(df: pd.DataFrame, column: str, title: str, x_axis_title: str, y_axis_title: str):
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """Impressão digital das colunas e valores de uma tabela de contagens (chave do cache das figuras)."""
+    row_hashes = pd.util.hash_pandas_object(data, index=False).values
+    return hashlib.sha256(row_hashes.tobytes() + '|'.join(map(str, data.columns)).encode('utf-8')).hexdigest()[:16]
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def bar_figure(fingerprint: str, column: str, title: str, x_axis_title: str, y_axis_title: str, _data: pd.DataFrame) -> go.Figure:
     """
-    Gera um gráfico de barras com cores e fonte da identidade visual, adaptado para fundo escuro.
+    Gráfico de barras com cores e fonte da identidade visual, adaptado para fundo escuro.
+    _data traz as contagens prontas (colunas [column, 'count'], ex: counts_frame do pacote de agregados).
+    A figura fica em cache por (fingerprint dos dados, textos) e é compartilhada (somente leitura) entre as sessões.
     """
-    data = df[column].value_counts().reset_index()
-    data.columns = [column, 'count']
-    
-    fig = px.bar(data, 
+    fig = px.bar(_data, 
                  x=column, 
                  y='count', 
                  title=title,
@@ -215,16 +331,21 @@ def plot_bar_chart(df: pd.DataFrame, column: str, title: str, x_axis_title: str,
         hoverlabel=dict(bgcolor="white", font_size=16, font_family=FONT_PRINCIPAL, font_color="black")
     )
     fig.update_traces(textfont_color=COLORS["Pure White"])
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+@profiled(lambda data, column, title, *args, **kwargs: f'gráfico: {title}')
+def plot_bar_chart(data: pd.DataFrame, column: str, title: str, x_axis_title: str, y_axis_title: str):
+    """Desenha o gráfico de barras das contagens em data (ver bar_figure)."""
+    st.plotly_chart(bar_figure(data_fingerprint(data), column, title, x_axis_title, y_axis_title, data), width='stretch')
 
-def plot_pie_chart(df: pd.DataFrame, column: str, title: str):
+@st.cache_resource(show_spinner=False, max_entries=128)
+def pie_figure(fingerprint: str, column: str, title: str, _data: pd.DataFrame) -> go.Figure:
     """
-    Gera um gráfico de pizza com cores e fonte da identidade visual, adaptado para fundo escuro.
+    Gráfico de pizza com cores e fonte da identidade visual, adaptado para fundo escuro.
+    _data traz as contagens prontas (colunas [column, 'count'], ex: counts_frame do pacote de agregados).
+    A figura fica em cache por (fingerprint dos dados, textos) e é compartilhada (somente leitura) entre as sessões.
     """
-    data = df[column].value_counts().reset_index()
-    data.columns = [column, 'count']
-
-    fig = px.pie(data, 
+    fig = px.pie(_data, 
                  values='count', 
                  names=column, 
                  title=title,
@@ -241,5 +362,50 @@ def plot_pie_chart(df: pd.DataFrame, column: str, title: str):
         legend_font_color=COLORS["Pure White"],
         hoverlabel=dict(bgcolor="white", font_size=16, font_family=FONT_PRINCIPAL, font_color="black")
     )
-    fig.update_traces(textinfo='percent+label', textfont_color=COLORS["Pure White"], pull=[0.05 if i == data['count'].idxmax() else 0 for i in range(len(data))])
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    fig.update_traces(textinfo='percent+label', textfont_color=COLORS["Pure White"], pull=[0.05 if i == _data['count'].idxmax() else 0 for i in range(len(_data))])
+    return fig
+
+@profiled(lambda data, column, title, *args, **kwargs: f'gráfico: {title}')
+def plot_pie_chart(data: pd.DataFrame, column: str, title: str):
+    """Desenha o gráfico de pizza das contagens em data (ver pie_figure)."""
+    st.plotly_chart(pie_figure(data_fingerprint(data), column, title, data), width='stretch')
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def stacked_bar_figure(fingerprint: str, x_column: str, color_column: str, title: str, x_axis_title: str, y_axis_title: str,
+                       _data: pd.DataFrame) -> go.Figure:
+    """
+    Gráfico de barras empilhadas (contagem de x_column, dividida por color_column) com a identidade visual.
+    _data traz as contagens prontas (colunas [x_column, color_column, 'count']).
+    A figura fica em cache por (fingerprint dos dados, textos) e é compartilhada (somente leitura) entre as sessões.
+    """
+    fig = px.bar(_data,
+                 x=x_column,
+                 y='count',
+                 color=color_column,
+                 title=title,
+                 color_discrete_sequence=[COLORS["Diverse Purple"], COLORS["Inclusive Pink"], COLORS["Light Lavender"], COLORS["Dark Purple"], COLORS["Identity Blue"], COLORS["Gentle Pink"]],
+                 text_auto=True)
+
+    fig.update_layout(
+        title_font_family=FONT_PRINCIPAL,
+        title_font_color=COLORS["Inclusive Pink"],
+        title_font_size=24,
+        font_family=FONT_PRINCIPAL,
+        font_color=COLORS["Pure White"],
+        xaxis_title=x_axis_title,
+        yaxis_title=y_axis_title,
+        plot_bgcolor=COLORS["Solid Black"],
+        paper_bgcolor=COLORS["Solid Black"],
+        legend_font_color=COLORS["Pure White"],
+        xaxis=dict(showgrid=False, tickfont=dict(color=COLORS["Pure White"])),
+        yaxis=dict(showgrid=True, gridcolor='gray', tickfont=dict(color=COLORS["Pure White"])),
+        hoverlabel=dict(bgcolor="white", font_size=16, font_family=FONT_PRINCIPAL, font_color="black")
+    )
+    fig.update_traces(textfont_color=COLORS["Pure White"])
+    return fig
+
+@profiled(lambda data, x_column, color_column, title, *args, **kwargs: f'gráfico: {title}')
+def plot_stacked_bar_chart(data: pd.DataFrame, x_column: str, color_column: str, title: str, x_axis_title: str, y_axis_title: str):
+    """Desenha o gráfico de barras empilhadas das contagens em data (ver stacked_bar_figure)."""
+    st.plotly_chart(stacked_bar_figure(data_fingerprint(data), x_column, color_column, title, x_axis_title, y_axis_title, data),
+                    width='stretch')
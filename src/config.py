@@ -5,12 +5,27 @@ import os
 # Caminhos de arquivos
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RAW_DATA_PATH = os.path.join(BASE_DIR, 'data', 'raw', 'Checkin TransDevs TechExperience (respostas) - Respostas ao formulário 1.csv')
+# Datasets processados (participantes, PII, EDA, liderança, equipes, n-grams e estado do pipeline): os seus *_PATH são caminhos base.
+# O arquivo real é dataset_path(caminho) (src/storage.py), com a extensão de STORAGE_FORMAT; o '.csv' do caminho base é ignorado.
+# Os CSVs versionados em data/processed/ são saídas anteriores à troca para Parquet: só são lidos enquanto o Parquet não existir.
 PROCESSED_DATA_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'processed_participants.csv')
 ANONYMIZED_PII_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'anonymized_pii_mapping.csv')
 EDA_FINAL_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'eda_final_data.csv')
 LEADERSHIP_ANALYSIS_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'leadership_insights.csv')
+TEAM_FORMATION_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'team_assignments.csv')
+DASHBOARD_BUNDLE_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'dashboard_bundle.json')
+NGRAM_COUNTS_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'ngram_counts.csv')
+NGRAM_VOCABULARY_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'ngram_vocabulary.csv')
+# Pickles legados (anteriores ao registro de modelos); mantidos para os notebooks exploratórios
 TOPIC_MODEL_PATH = os.path.join(BASE_DIR, 'models', 'lda_model.pkl')
 TFIDF_VECTORIZER_PATH = os.path.join(BASE_DIR, 'models', 'tfidf_vectorizer.pkl')
+MODEL_REGISTRY_DIR = os.path.join(BASE_DIR, 'models', 'registry')
+LEMMA_CACHE_PATH = os.path.join(BASE_DIR, 'data', 'cache', 'lemma_cache.sqlite')
+PIPELINE_STATE_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'pipeline_state.csv')
+CONSCIENCE_SUMMARY_PATH = os.path.join(BASE_DIR, 'data', 'processed', 'conscience_summary.csv')
+PIPELINE_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache', 'pipeline')
+SYNTHETIC_DATA_DIR = os.path.join(BASE_DIR, 'data', 'synthetic')
+TRACE_DIR = os.path.join(BASE_DIR, 'data', 'traces')
 
 
 # Nomes originais das colunas do CSV
@@ -30,6 +45,30 @@ ORIGINAL_COL_NAMES = {
     '11. O quê você espera levar consigo após o final do projeto?': 'expectativas_pos_projeto',
 }
 
+# Armazenamento dos datasets processados (src/storage.py):
+# - 'parquet': tipado, com colunas de lista nativas (list<string>) e colunas categóricas com dicionário.
+# - 'csv': formato legado; listas são gravadas como texto e interpretadas de volta na leitura.
+# Os caminhos base dos datasets (acima) recebem a extensão do formato escolhido.
+STORAGE_FORMAT = 'parquet'
+LIST_COLUMN_SUFFIXES = ('_lemmas', '_lemmas_combined') # ex: 'objetivo_proposito_lemmas', 'all_lemmas_combined'
+CATEGORICAL_COLUMNS = [
+    'consciencia_escopo', 'consciencia_escopo_padronizada', 'grupo_principal', 'grupo_alternativo', 'interesse_lideranca',
+    'lideranca_interesse_declarado', 'grupo_principal_preferido', 'grupo_alternativo_preferido', 'tipo_sugestao', 'status_lideranca_final',
+    'grupo_atribuido', 'tipo_alocacao',
+]
+CATEGORICAL_COLUMN_SUFFIXES = ('_sentiment',) # ex: 'objetivo_proposito_sentiment', 'overall_sentiment'
+DATETIME_COLUMNS = ['timestamp'] # Gravadas como data/hora; em CSV voltam como texto e são convertidas na leitura
+
+# Formato do 'Carimbo de data/hora' exportado pelo Google Forms
+TIMESTAMP_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+# Leitura em streaming do CSV bruto (src/data_ingestion.py): respostas por bloco.
+# O pico de memória do ETL depende do tamanho do bloco, não do tamanho da exportação.
+RAW_DATA_CHUNK_SIZE = 10_000
+
+# Modo incremental: coluna com o hash do conteúdo de cada resposta bruta (detecta respostas novas ou editadas)
+ROW_HASH_COL = 'row_hash'
+
 # Resposta que indica que a pessoa não quer continuar no projeto
 EXCLUSION_CRITERIA = "Não quero continuar no projeto."
 
@@ -50,6 +89,54 @@ TEXT_COLUMNS_FOR_NLP = [
     'expectativas_pos_projeto'
 ]
 
+# Modelo spaCy usado na lematização. Só usamos tokenização, atributos léxicos (stopwords, pontuação)
+# e lemmas, então parser e NER são excluídos na carga do pipeline.
+SPACY_MODEL_NAME = "pt_core_news_sm"
+SPACY_EXCLUDED_COMPONENTS = ["parser", "ner"]
+
+# Parâmetros da lematização em lote (nlp.pipe do spaCy)
+SPACY_BATCH_SIZE = 256 # Quantidade de textos enviados por lote ao spaCy
+SPACY_N_PROCESS = 1 # Processos do spaCy; valores > 1 só compensam em ondas grandes de check-in
+
+# Processamento paralelo das colunas de texto (correção de typos, limpeza, lematização e sentimento):
+# o trabalho é dividido em blocos (coluna x faixa de linhas) e distribuído num pool de processos.
+# 1 = caminho sequencial (padrão); o pool só compensa com milhares de respostas, pela carga do spaCy em cada processo.
+TEXT_PROCESSING_N_WORKERS = 1
+TEXT_PROCESSING_CHUNK_SIZE = 2_000 # Linhas de uma coluna por bloco enviado a um processo
+
+# Modo da modelagem de tópicos:
+# - 'batch': re-treina o TF-IDF e o LDA do zero com todas as respostas.
+# - 'incremental': carrega os modelos salvos e só incorpora as respostas novas (partial_fit), mantendo os IDs dos tópicos.
+# - 'inference': carrega os modelos salvos (memory-map) e só aplica transform nas respostas novas, sem treinar.
+TOPIC_MODEL_MODE = 'batch'
+LDA_PARTIAL_FIT_BATCH_SIZE = 128 # Documentos por mini-lote no modo incremental
+
+# Limite de entradas do cache persistente de lemmas (as menos usadas recentemente são removidas)
+LEMMA_CACHE_MAX_ENTRIES = 200_000
+LEMMA_CACHE_WRITE_BATCH = 500 # Textos consultados ou gravados um a um acumulados antes de cada commit no SQLite
+LEMMA_CACHE_MEMORY_ENTRIES = 10_000 # Textos mais recentes mantidos também em memória por processo (LRU)
+
+# Registro de modelos: versões mantidas por artefato (as mais antigas são removidas a cada novo salvamento)
+MODEL_REGISTRY_KEEP_VERSIONS = 5
+TFIDF_ARTIFACT_NAME = 'tfidf_vectorizer'
+LDA_ARTIFACT_NAME = 'lda_model'
+
+# Pipeline completo (src/pipeline.py, run_all.py): cada estágio fica em cache, indexado pelo hash das suas entradas,
+# do seu código e das constantes deste arquivo que ele usa. Versões mantidas por estágio (as mais antigas são removidas).
+PIPELINE_CACHE_KEEP_VERSIONS = 3
+
+# Exportações sintéticas do formulário (src/synthetic_data.py), para medir como o pipeline escala (benchmarks/run_benchmarks.py)
+SYNTHETIC_DATA_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+SYNTHETIC_DATA_SEED = 42
+SYNTHETIC_TYPO_RATE = 0.15 # Fração das respostas de texto com erros de digitação de TYPO_CORRECTION_MAP
+SYNTHETIC_LEXICON_RATE = 0.6 # Fração das respostas de texto com palavras dos léxicos de sentimento
+SYNTHETIC_MISSING_RATE = 0.03 # Fração de respostas em branco em cada pergunta
+
+# Rastreamento (src/tracing.py): spans com tempo de parede e de CPU, pico de RSS, linhas e memória dos DataFrames
+# de cada função principal, exportados como trace do Chrome (--trace no run_all.py, run_pipeline.py e run_eda.py).
+TRACING_ENABLED = False
+TRACE_DEEP_MEMORY = True # memory_usage(deep=True): conta os bytes dos textos (mais lento em DataFrames grandes)
+
 # Dicionário para correção de erros de digitação (typos) e padronização.
 TYPO_CORRECTION_MAP = {
     'progamação': 'programação', 'experiecia': 'experiência', 'desenvolvimeno': 'desenvolvimento',
@@ -81,6 +168,26 @@ GROUP_NAMES = [
     'G1 - Automações Wix', 'G2 - API de Orquestração', 'G3 - Integração WhatsApp', 'G4 - SUPABASE (Banco de Dados)'
 ]
 
+# Vagas de liderança por grupo: preenchidas primeiro por líderes diretos e, nas que sobrarem,
+# por líderes de suporte sugeridos. Grupos fora de GROUP_LEADER_CAPACITY usam DEFAULT_GROUP_LEADER_CAPACITY.
+DEFAULT_GROUP_LEADER_CAPACITY = 1
+GROUP_LEADER_CAPACITY = {}
+
+# 'grupo_alternativo' é de múltipla escolha: as opções vêm separadas por GROUP_OPTIONS_SEPARATOR.
+# NO_ALTERNATIVE_OPTION indica que a pessoa só aceita o grupo principal.
+GROUP_OPTIONS_SEPARATOR = ', '
+NO_ALTERNATIVE_OPTION = 'Não tenho interesse por nenhuma outra opção'
+
+# Formação de equipes (src/analysis/team_formation.py): vagas de participantes por grupo (líderes incluídos).
+# Grupos fora de TEAM_GROUP_CAPACITY recebem ceil(TEAM_CAPACITY_SLACK * participantes / número de grupos).
+TEAM_GROUP_CAPACITY = {}
+TEAM_CAPACITY_SLACK = 1.2
+# Custo de alocar alguém em cada tipo de grupo (menor = preferido). 'outro' nunca é usado para quem
+# respondeu NO_ALTERNATIVE_OPTION. A afinidade do tópico LDA com o grupo (TOPIC_TO_GROUP_APTITUDE_MAP)
+# desconta TEAM_TOPIC_AFFINITY_WEIGHT x aptidão do custo.
+TEAM_PREFERENCE_COSTS = {'principal': 0.0, 'alternativo': 1.0, 'outro': 3.0}
+TEAM_TOPIC_AFFINITY_WEIGHT = 0.5
+
 # Critérios para liderança
 LEADERSHIP_TYPES = {
     'DIRETA': "Sim, me sinto a vontade estando a frente e guiando o grupo",
@@ -103,4 +210,22 @@ TOPIC_TO_GROUP_APTITUDE_MAP = {
 }
 
 # Nome da nova coluna de sentimento geral
-OVERALL_SENTIMENT_COL = 'overall_sentiment'
\ No newline at end of file
+OVERALL_SENTIMENT_COL = 'overall_sentiment'
+
+# Índice de n-grams (src/analysis/ngram_index.py): contagens por documento (uma resposta de uma coluna de texto),
+# sem n-grams que atravessam respostas ou participantes. Facetas: coluna de texto, sentimento da resposta e NGRAM_FACET_COLUMNS.
+NGRAM_INDEX_SIZES = (1, 2, 3)
+NGRAM_FACET_COLUMNS = ['grupo_principal']
+
+# Nuvem de palavras do dashboard: frequências dos n-grams pré-calculadas no pacote de agregados (src/dashboard_bundle.py)
+WORDCLOUD_NGRAM_SIZES = (1, 2, 3) # Unigrams, bigrams e trigrams
+WORDCLOUD_MAX_WORDS = 100 # Palavras desenhadas na nuvem; só as mais frequentes entram no pacote
+
+# Profiler do dashboard (src/app/profiler.py): desligado por padrão; ligado com ?profile=1 na URL ou profiler = true no secrets.toml.
+# Cada rerun mede as seções e gráficos; o painel da barra lateral mostra p50/p95 das últimas DASHBOARD_PROFILER_HISTORY execuções da sessão
+DASHBOARD_PROFILER_QUERY_PARAM = 'profile'
+DASHBOARD_PROFILER_HISTORY = 100
+
+# Teste de carga do dashboard (benchmarks/load_test_dashboard.py): p95 máximo (ms) do rerun de cada tipo de interação.
+# O primeiro login do processo carrega os dados e a primeira visita a cada seção monta as figuras (cache frio): ficam no p95
+DASHBOARD_LATENCY_BUDGET_MS = {'abertura': 1500, 'login': 3000, 'seção': 2000, 'n-gram': 2000}
@@ -0,0 +1,167 @@
+# transdevs_techexperience/src/dashboard_bundle.py
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from src.config import (DASHBOARD_BUNDLE_PATH, EDA_FINAL_PATH, LEADERSHIP_ANALYSIS_PATH, TEAM_FORMATION_PATH, NGRAM_COUNTS_PATH, GROUP_NAMES,
+                        OVERALL_SENTIMENT_COL, WORDCLOUD_NGRAM_SIZES, WORDCLOUD_MAX_WORDS)
+from src.storage import read_dataset, dataset_exists
+from src.analysis.ngram_index import NgramIndex
+from src.tracing import traced
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Versão do formato do pacote; o dashboard recusa pacotes de outra versão (basta re-executar o run_eda.py)
+BUNDLE_VERSION = 3
+
+# Colunas da EDA com contagens prontas no pacote (além das colunas '*_sentiment')
+BUNDLE_COUNT_COLUMNS = ['consciencia_escopo_padronizada', 'grupo_principal', 'interesse_lideranca', 'main_topic']
+
+def _records(df: pd.DataFrame) -> list:
+    """Linhas do DataFrame como lista de dicts com tipos nativos do JSON (NaN vira null)."""
+    return json.loads(df.to_json(orient='records', force_ascii=False))
+
+def value_counts_records(values: pd.Series) -> list:
+    """Contagem de cada valor (maior para a menor, sem vazios e sem categorias sem ocorrência): [{'valor': ..., 'count': ...}]."""
+    counts = values.astype(str).where(values.notna()).value_counts()
+    return [{'valor': value, 'count': int(count)} for value, count in counts.items()]
+
+def summarize_leadership(df_leadership: pd.DataFrame) -> dict:
+    """
+    Tabelas da aba de liderança: líderes diretos atribuídos, grupos ainda sem líder direto
+    e sugestões de líderes de suporte para esses grupos (ordenadas pelo score de aptidão).
+    """
+    if df_leadership is None or df_leadership.empty:
+        return {'direct_leaders': [], 'groups_needing_leaders': list(GROUP_NAMES), 'support_suggestions': []}
+
+    status = df_leadership['status_lideranca_final'].astype(str)
+    suggested_group = df_leadership['sugestao_lideranca_grupo'].astype(str)
+    direct_leaders = df_leadership[status.str.contains('Líder Direto Atribuído', regex=False)]
+    groups_with_leaders = set(direct_leaders['sugestao_lideranca_grupo'].astype(str))
+    groups_needing_leaders = [group for group in GROUP_NAMES if group not in groups_with_leaders]
+    support = df_leadership[(status == 'Potencial Líder para Suporte') & suggested_group.isin(groups_needing_leaders)]
+    support = support.sort_values(by='aptidao_score_geral', ascending=False)
+
+    return {
+        'direct_leaders': _records(direct_leaders[['participant_id', 'grupo_principal_preferido', 'grupo_alternativo_preferido',
+                                                   'sugestao_lideranca_grupo', 'tipo_sugestao']].astype({'participant_id': int})),
+        'groups_needing_leaders': groups_needing_leaders,
+        'support_suggestions': _records(support[['participant_id', 'sugestao_lideranca_grupo', 'aptidao_score_geral', 'justificativa_bagagem',
+                                                 'justificativa_topico_lda', 'justificativa_sentimento']]),
+    }
+
+def summarize_teams(df_teams: pd.DataFrame) -> dict:
+    """Resumo da formação de equipes: totais, composição (grupo x tipo de alocação) e integrantes por grupo. None se não houver equipes."""
+    if df_teams is None or df_teams.empty:
+        return None
+    allocation = df_teams['tipo_alocacao'].astype(str)
+    assigned = df_teams[df_teams['grupo_atribuido'].astype(str) != 'N/A']
+    composition = assigned.groupby([assigned['grupo_atribuido'].astype(str), assigned['tipo_alocacao'].astype(str)]).size().reset_index(name='count')
+    members = df_teams[['participant_id', 'grupo_atribuido', 'tipo_alocacao', 'grupo_principal', 'grupo_alternativo', 'afinidade_topico']]
+    return {
+        'n_participants': len(df_teams),
+        'n_assigned': len(assigned),
+        'n_principal': int((allocation == 'Principal').sum()),
+        'n_unassigned': int((allocation == 'Sem vaga').sum()),
+        'composition': _records(composition),
+        'members': _records(members.astype({col: str for col in ['grupo_atribuido', 'tipo_alocacao', 'grupo_principal', 'grupo_alternativo']})),
+    }
+
+def frequencies_fingerprint(frequencies: dict) -> str:
+    """Impressão digital de uma tabela de frequências da nuvem de palavras (chave do cache das imagens no dashboard)."""
+    return hashlib.sha256(json.dumps(frequencies, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def summarize_wordcloud(ngram_index: NgramIndex) -> dict:
+    """
+    Frequências dos n-grams da nuvem de palavras sem filtros (WORDCLOUD_NGRAM_SIZES, só os WORDCLOUD_MAX_WORDS mais frequentes),
+    a impressão digital de cada tabela e os valores de cada faceta do índice (filtros da nuvem no dashboard).
+    """
+    frequencies = {str(n): ngram_index.frequencies(n, k=WORDCLOUD_MAX_WORDS) for n in WORDCLOUD_NGRAM_SIZES}
+    return {
+        'frequencies': frequencies,
+        'fingerprints': {n: frequencies_fingerprint(freqs) for n, freqs in frequencies.items()},
+        'facets': {facet: ngram_index.facet_values(facet) for facet in ngram_index.facet_columns},
+    }
+
+@traced(category='dashboard')
+def build_dashboard_bundle(df_eda: pd.DataFrame, df_leadership: pd.DataFrame = None, df_teams: pd.DataFrame = None,
+                           ngram_index: NgramIndex = None) -> dict:
+    """
+    Monta o pacote de agregados do dashboard: tudo o que os gráficos e tabelas mostram, já contado e filtrado.
+    O tamanho do pacote depende do número de categorias e de líderes, não do número de participantes
+    (exceto a lista de integrantes das equipes). Não contém nomes: o dashboard usa o mapeamento de PII.
+
+    Args:
+        df_eda (pd.DataFrame): Dados finais da EDA (participantes ativos).
+        df_leadership (pd.DataFrame, optional): Saída de analyze_leadership_potential.
+        df_teams (pd.DataFrame, optional): Saída de form_teams.
+        ngram_index (NgramIndex, optional): Índice de n-grams da EDA. Se None, é montado a partir de df_eda.
+
+    Returns:
+        dict: Pacote serializável em JSON (ver write_dashboard_bundle).
+    """
+    sentiment_columns = [col for col in df_eda.columns if col.endswith('_sentiment') and col != OVERALL_SENTIMENT_COL]
+    count_columns = [col for col in BUNDLE_COUNT_COLUMNS + [OVERALL_SENTIMENT_COL] + sentiment_columns if col in df_eda.columns]
+    if ngram_index is None:
+        ngram_index = NgramIndex.build(df_eda)
+    return {
+        'version': BUNDLE_VERSION,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'n_active': len(df_eda),
+        'counts': {col: value_counts_records(df_eda[col]) for col in count_columns},
+        'sentiment_columns': sentiment_columns,
+        'leadership': summarize_leadership(df_leadership),
+        'teams': summarize_teams(df_teams),
+        'wordcloud': summarize_wordcloud(ngram_index),
+    }
+
+def write_dashboard_bundle(bundle: dict, file_path: str = DASHBOARD_BUNDLE_PATH) -> str:
+    """Grava o pacote em JSON (arquivo temporário + troca atômica, para o dashboard nunca ler um pacote pela metade)."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, ensure_ascii=False)
+    os.replace(tmp_path, file_path)
+    return file_path
+
+def read_dashboard_bundle(file_path: str = DASHBOARD_BUNDLE_PATH) -> dict:
+    """
+    Lê o pacote de agregados do dashboard.
+
+    Raises:
+        FileNotFoundError: Se o pacote não existir (o run_eda.py ainda não foi executado).
+        ValueError: Se o pacote foi gerado com outra versão do formato.
+    """
+    with open(file_path, encoding='utf-8') as f:
+        bundle = json.load(f)
+    if bundle.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"Pacote do dashboard na versão {bundle.get('version')}, esperada {BUNDLE_VERSION}. Re-execute o run_eda.py.")
+    return bundle
+
+def build_dashboard_bundle_from_datasets() -> dict:
+    """
+    Monta o pacote a partir das saídas já gravadas pelo run_eda.py (EDA, liderança e, se existirem, equipes e índice de n-grams).
+    Usado quando o pacote não existe, ex: dados gerados antes de o run_eda.py gravar o pacote.
+    """
+    df_eda = read_dataset(EDA_FINAL_PATH)
+    df_leadership = read_dataset(LEADERSHIP_ANALYSIS_PATH) if dataset_exists(LEADERSHIP_ANALYSIS_PATH) else None
+    df_teams = read_dataset(TEAM_FORMATION_PATH) if dataset_exists(TEAM_FORMATION_PATH) else None
+    ngram_index = NgramIndex.load() if dataset_exists(NGRAM_COUNTS_PATH) else None
+    return build_dashboard_bundle(df_eda, df_leadership, df_teams, ngram_index)
+
+def counts_frame(bundle: dict, column: str) -> pd.DataFrame:
+    """Contagens de uma coluna do pacote como DataFrame [column, 'count'] (vazio se a coluna não estiver no pacote)."""
+    records = bundle['counts'].get(column, [])
+    return pd.DataFrame({column: [r['valor'] for r in records], 'count': [r['count'] for r in records]})
+
+if __name__ == '__main__':
+    # Reconstrói o pacote a partir das saídas já gravadas pelo run_eda.py
+    bundle_test = build_dashboard_bundle_from_datasets()
+    saved_path = write_dashboard_bundle(bundle_test)
+    print(f"Pacote do dashboard gravado em {saved_path} ({os.path.getsize(saved_path) / 1024:.1f} KB)")
+    print(f"Contagens: {list(bundle_test['counts'])}")
@@ -1,34 +1,108 @@
 # transdevs_techexperience/src/data_ingestion.py
 
+from collections.abc import Iterator
+
 import pandas as pd
-from src.config import RAW_DATA_PATH # Importa o caminho do arquivo de configuração
+from src.config import RAW_DATA_PATH, ORIGINAL_COL_NAMES, TIMESTAMP_FORMAT, RAW_DATA_CHUNK_SIZE, ROW_HASH_COL # Importa o caminho do arquivo de configuração
+from src.tracing import traced
 import logging
 
 # Configura o logger para exibir mensagens de informação e erros no console
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def load_raw_data(file_path: str = RAW_DATA_PATH) -> pd.DataFrame:
+# Cabeçalho original do carimbo de data/hora (convertido para data/hora uma única vez, na leitura)
+RAW_TIMESTAMP_COL = next(original for original, renamed in ORIGINAL_COL_NAMES.items() if renamed == 'timestamp')
+
+def compute_row_hashes(raw_df: pd.DataFrame) -> pd.Series:
+    """
+    Calcula um hash do conteúdo de cada resposta bruta (todas as colunas, como texto).
+    Qualquer edição em uma resposta muda o seu hash; respostas intactas mantêm o hash entre execuções
+    (base do modo incremental, ver src/incremental.py).
+    """
+    as_text = raw_df.astype('string').fillna('')
+    return pd.util.hash_pandas_object(as_text, index=False).map('{:016x}'.format)
+
+def _question_prefix(header: str) -> str:
+    """Prefixo que identifica a pergunta no cabeçalho (ex: '7.', '4.a.', 'Carimbo')."""
+    return header.strip().split(' ', 1)[0]
+
+def match_raw_columns(raw_columns: list) -> dict:
     """
-    Carrega o arquivo CSV com os dados brutos da pasta local 'data/raw/'.
+    Associa os cabeçalhos do CSV bruto aos cabeçalhos esperados em ORIGINAL_COL_NAMES.
+    Primeiro pelo texto exato; se a pergunta foi reescrita no formulário, pelo número da pergunta
+    (ex: '7.'), para que a coluna continue sendo renomeada e analisada.
+
+    Returns:
+        dict: {cabeçalho no CSV: cabeçalho esperado no config}, só com as colunas encontradas.
+    """
+    by_prefix = {_question_prefix(col): col for col in raw_columns}
+    matched = {}
+    for expected in ORIGINAL_COL_NAMES:
+        if expected in raw_columns:
+            matched[expected] = expected
+        elif _question_prefix(expected) in by_prefix:
+            actual = by_prefix[_question_prefix(expected)]
+            logging.warning(f"Cabeçalho da pergunta '{_question_prefix(expected)}' difere do config; usando a coluna do CSV: {actual!r}")
+            matched[actual] = expected
+        else:
+            logging.warning(f"Coluna esperada não encontrada no CSV bruto: {expected!r}")
+    return matched
+
+def iter_raw_data_chunks(file_path: str = RAW_DATA_PATH, chunksize: int = RAW_DATA_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Lê o CSV bruto em blocos de tamanho fixo, sem carregar a exportação inteira em memória.
+    - Só as colunas de ORIGINAL_COL_NAMES são lidas (usecols), todas como texto.
+    - Os cabeçalhos ficam como no config (mesmo se a pergunta foi reescrita no formulário), prontos para rename_columns.
+    - A coluna ROW_HASH_COL recebe o hash do conteúdo de cada resposta (compute_row_hashes).
+    - O carimbo de data/hora é convertido para data/hora uma única vez, aqui.
+    - O índice segue a posição da resposta no arquivo, contínuo entre os blocos (base do participant_id).
 
     Args:
         file_path (str): Caminho para o arquivo CSV. Por padrão, usa RAW_DATA_PATH do config.
+        chunksize (int): Respostas por bloco. Por padrão, usa RAW_DATA_CHUNK_SIZE do config.
 
-    Returns:
-        pd.DataFrame: DataFrame contendo os dados brutos.
-                      Retorna um DataFrame vazio se o arquivo não for encontrado ou houver erro.
+    Yields:
+        pd.DataFrame: Bloco de respostas brutas. Nada é produzido se o arquivo não for encontrado ou não puder ser lido.
     """
     try:
-        logging.info(f"Tentando carregar dados brutos de: {file_path}")
-        df = pd.read_csv(file_path)
-        logging.info(f"Dados brutos carregados com sucesso. Total de {len(df)} registros.")
-        return df
+        logging.info(f"Lendo dados brutos em blocos de {chunksize} respostas de: {file_path}")
+        matched = match_raw_columns(pd.read_csv(file_path, nrows=0).columns.tolist())
     except FileNotFoundError:
         logging.error(f"Erro: Arquivo não encontrado em {file_path}. Verifique o caminho em src/config.py e a existência do arquivo.")
-        return pd.DataFrame()
+        return
     except Exception as e:
         logging.error(f"Ocorreu um erro inesperado ao carregar o CSV: {e}")
-        return pd.DataFrame()
+        return
+
+    # Erros no meio da leitura são propagados: quem grava as saídas em blocos descarta o resultado parcial
+    dtypes = {actual: str for actual, expected in matched.items() if expected != RAW_TIMESTAMP_COL}
+    total = 0
+    with pd.read_csv(file_path, usecols=list(matched), dtype=dtypes, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk = chunk.rename(columns=matched)
+            # O hash usa o texto exportado, antes da conversão do carimbo de data/hora
+            chunk[ROW_HASH_COL] = compute_row_hashes(chunk)
+            if RAW_TIMESTAMP_COL in chunk.columns:
+                chunk[RAW_TIMESTAMP_COL] = pd.to_datetime(chunk[RAW_TIMESTAMP_COL], format=TIMESTAMP_FORMAT, errors='coerce')
+            total += len(chunk)
+            yield chunk
+    logging.info(f"Dados brutos lidos com sucesso. Total de {total} registros.")
+
+@traced(category='etl')
+def load_raw_data(file_path: str = RAW_DATA_PATH) -> pd.DataFrame:
+    """
+    Carrega o arquivo CSV com os dados brutos da pasta local 'data/raw/' de uma vez
+    (mesmo tratamento de iter_raw_data_chunks). O pipeline ETL usa iter_raw_data_chunks.
+
+    Args:
+        file_path (str): Caminho para o arquivo CSV. Por padrão, usa RAW_DATA_PATH do config.
+
+    Returns:
+        pd.DataFrame: DataFrame contendo os dados brutos.
+                      Retorna um DataFrame vazio se o arquivo não for encontrado ou não puder ser lido.
+    """
+    chunks = list(iter_raw_data_chunks(file_path))
+    return pd.concat(chunks) if chunks else pd.DataFrame()
 
 if __name__ == '__main__':
     # Este bloco é executado apenas quando o script é chamado diretamente (para testes)
@@ -38,5 +112,6 @@ if __name__ == '__main__':
         print("\nPrimeiras 5 linhas dos dados brutos carregados:")
         print(raw_df.head())
         print(f"\nColunas originais: {raw_df.columns.tolist()}")
+        print(f"\nTipos: {raw_df.dtypes.value_counts().to_dict()}")
     else:
-        print("\nNão foi possível carregar os dados brutos para teste.")
\ No newline at end of file
+        print("\nNão foi possível carregar os dados brutos para teste.")
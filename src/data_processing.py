@@ -3,9 +3,11 @@
 import pandas as pd
 import numpy as np
 import logging
-import os # Necessário para o ANONYMIZED_PII_PATH
 
-from src.config import ORIGINAL_COL_NAMES, EXCLUSION_CRITERIA, CONSCIENCIA_OPTIONS, ANONYMIZED_PII_PATH
+from src.config import ORIGINAL_COL_NAMES, EXCLUSION_CRITERIA, CONSCIENCIA_OPTIONS, ANONYMIZED_PII_PATH, PROCESSED_DATA_PATH, PIPELINE_STATE_PATH
+from src.storage import write_dataset, DatasetWriter
+from src.incremental import STATE_COLUMNS
+from src.tracing import traced
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -13,20 +15,19 @@ def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Renomeia as colunas do DataFrame para nomes mais amigáveis e padronizados,
     com base no mapeamento ORIGINAL_COL_NAMES do config.
+    Com copy-on-write ativo (preprocess_data), o resultado compartilha os dados de df sem copiá-los.
     """
     logging.info("Renomeando colunas...")
-    
-    # Cria uma cópia para evitar SettingWithCopyWarning
-    df_renamed = df.copy() 
-    
+
     # Filtra apenas as colunas que existem no DataFrame para renomear
-    columns_to_rename = {k: v for k, v in ORIGINAL_COL_NAMES.items() if k in df_renamed.columns}
+    columns_to_rename = {k: v for k, v in ORIGINAL_COL_NAMES.items() if k in df.columns}
     
     if not columns_to_rename:
         logging.warning("Nenhuma coluna para renomear encontrada no DataFrame de acordo com ORIGINAL_COL_NAMES.")
-        return df_renamed
+        return df.copy()
 
-    df_renamed = df_renamed.rename(columns=columns_to_rename)
+    # rename devolve um novo DataFrame (o original não é alterado)
+    df_renamed = df.rename(columns=columns_to_rename)
     logging.info("Colunas renomeadas com sucesso.")
     return df_renamed
 
@@ -45,46 +46,57 @@ def handle_pii(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     logging.info("Iniciando tratamento de PII (Pseudonimização e Remoção)...")
 
-    df_copy = df.copy() # Trabalhe com uma cópia para não alterar o DF original diretamente
+    # assign/drop devolvem novos DataFrames, sem alterar o original
+    df_treated = df
 
-    # Geração de ID único para pseudonimização
-    if 'nome_completo' in df_copy.columns:
-        df_copy['participant_id'] = range(1, len(df_copy) + 1)
+    # Geração de ID único para pseudonimização: a posição da resposta no formulário (índice + 1),
+    # estável entre execuções e também quando só um subconjunto das respostas é processado (modo incremental)
+    if 'nome_completo' in df_treated.columns:
+        df_treated = df_treated.assign(participant_id=df_treated.index + 1)
         
         # Cria um DataFrame de mapeamento de PII (para uso *restrito* e seguro)
-        pii_mapping_df = df_copy[['participant_id', 'nome_completo']].copy()
+        pii_mapping_df = df_treated[['participant_id', 'nome_completo']]
         
         # Remove a coluna de nome completo do DF principal de análise
-        df_copy = df_copy.drop(columns=['nome_completo'])
+        df_treated = df_treated.drop(columns=['nome_completo'])
     else:
         logging.warning("Coluna 'nome_completo' não encontrada. Pulando pseudonimização de nome.")
         # Cria um DataFrame vazio se a coluna não existe para manter o tipo de retorno
         pii_mapping_df = pd.DataFrame(columns=['participant_id', 'nome_completo']) 
     
     # Remoção da coluna de telefone
-    if 'telefone_whatsapp' in df_copy.columns:
-        df_copy = df_copy.drop(columns=['telefone_whatsapp'])
+    if 'telefone_whatsapp' in df_treated.columns:
+        df_treated = df_treated.drop(columns=['telefone_whatsapp'])
     else:
         logging.warning("Coluna 'telefone_whatsapp' não encontrada. Pulando remoção de telefone.")
 
     logging.info("Tratamento de PII concluído. Nome pseudonimizado, telefone removido.")
-    return df_copy, pii_mapping_df
+    return df_treated, pii_mapping_df
 
 def process_conscience_column(df: pd.DataFrame) -> pd.DataFrame:
     """
     Padroniza a coluna de consciência do escopo do projeto, usando CONSCIENCIA_OPTIONS do config.
     """
     logging.info("Processando coluna 'consciencia_escopo'...")
-    df_copy = df.copy()
-    if 'consciencia_escopo' in df_copy.columns:
-        df_copy['consciencia_escopo_padronizada'] = df_copy['consciencia_escopo'].map(CONSCIENCIA_OPTIONS)
+    if 'consciencia_escopo' in df.columns:
         # Preenche valores NaN se alguma opção não foi mapeada (ex: um valor novo no formulário)
-        df_copy['consciencia_escopo_padronizada'] = df_copy['consciencia_escopo_padronizada'].fillna('Outros/Não Mapeado')
+        standardized = df['consciencia_escopo'].map(CONSCIENCIA_OPTIONS).fillna('Outros/Não Mapeado')
         logging.info("Coluna 'consciencia_escopo' padronizada.")
     else:
         logging.warning("Coluna 'consciencia_escopo' não encontrada para padronização. Criei uma coluna placeholder.")
-        df_copy['consciencia_escopo_padronizada'] = 'Não Informado'
-    return df_copy
+        standardized = 'Não Informado'
+    return df.assign(consciencia_escopo_padronizada=standardized)
+
+def active_participants_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Máscara booleana de quem continua no projeto (todos, se 'consciencia_escopo_padronizada' não existir).
+    Assume que 'consciencia_escopo_padronizada' já foi criada.
+    """
+    if 'consciencia_escopo_padronizada' not in df.columns:
+        logging.warning("Coluna 'consciencia_escopo_padronizada' não encontrada. Nenhum participante será filtrado.")
+        return pd.Series(True, index=df.index)
+    # Filtra quem NÃO é 'Não Quer Continuar'
+    return df['consciencia_escopo_padronizada'] != CONSCIENCIA_OPTIONS[EXCLUSION_CRITERIA]
 
 def filter_active_participants(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -92,19 +104,14 @@ def filter_active_participants(df: pd.DataFrame) -> pd.DataFrame:
     Assume que 'consciencia_escopo_padronizada' já foi criada.
     """
     logging.info("Filtrando participantes que não querem continuar no projeto...")
-    df_copy = df.copy()
-    if 'consciencia_escopo_padronizada' in df_copy.columns:
-        initial_count = len(df_copy)
-        # Filtra quem NÃO é 'Não Quer Continuar'
-        df_active = df_copy[df_copy['consciencia_escopo_padronizada'] != CONSCIENCIA_OPTIONS[EXCLUSION_CRITERIA]].copy()
-        removed_count = initial_count - len(df_active)
-        logging.info(f"Removidos {removed_count} participantes que não desejam continuar. Restam {len(df_active)} participantes ativos.")
-        return df_active
-    else:
-        logging.warning("Coluna 'consciencia_escopo_padronizada' não encontrada. Nenhum participante será filtrado.")
-        return df_copy
-
-def preprocess_data(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    active_mask = active_participants_mask(df)
+    # A seleção por máscara já devolve um novo DataFrame, só com as linhas ativas
+    df_active = df[active_mask]
+    logging.info(f"Removidos {len(df) - len(df_active)} participantes que não desejam continuar. Restam {len(df_active)} participantes ativos.")
+    return df_active
+
+@traced(category='etl')
+def preprocess_data(df: pd.DataFrame, save_pii_mapping: bool = True) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Executa o pipeline completo de pré-processamento de dados:
     1. Renomeia colunas.
@@ -113,8 +120,17 @@ def preprocess_data(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.Da
     4. Salva o mapeamento de PII.
     5. Retorna o DataFrame para análise de consciência, e o DataFrame de participantes ativos.
 
+    As etapas rodam com copy-on-write do pandas: renomear, remover colunas e criar as colunas novas
+    não copiam as colunas brutas. O DataFrame de consciência é o próprio resultado das etapas
+    (compartilha os dados com df); o de participantes ativos é uma seleção por máscara desse mesmo
+    DataFrame e o mapeamento de PII, uma projeção de duas colunas. As únicas cópias de dados são as
+    linhas ativas e as duas colunas novas (participant_id e consciencia_escopo_padronizada).
+    Como os resultados compartilham memória com df, não altere df in-place depois da chamada.
+
     Args:
-        df (pd.DataFrame): DataFrame bruto.
+        df (pd.DataFrame): DataFrame bruto (ou só as respostas novas/editadas, no modo incremental).
+        save_pii_mapping (bool): Se False, o mapeamento de PII não é gravado em ANONYMIZED_PII_PATH
+                                 (o modo incremental mescla o mapeamento do delta com o existente).
 
     Returns:
         tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
@@ -126,30 +142,67 @@ def preprocess_data(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.Da
         logging.error("DataFrame de entrada está vazio. Abortando pré-processamento.")
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
-    df_renamed = rename_columns(df)
-    
-    df_with_pii_treated, pii_mapping_df = handle_pii(df_renamed)
-
-    # Processa a coluna de consciência ANTES de filtrar, para que possamos analisá-la
-    df_with_pii_treated = process_conscience_column(df_with_pii_treated)
+    with pd.option_context('mode.copy_on_write', True):
+        df_renamed = rename_columns(df)
+        
+        df_with_pii_treated, pii_mapping_df = handle_pii(df_renamed)
 
-    # DataFrame para análise de consciência (inclui quem não quer continuar)
-    df_processed_for_conscience = df_with_pii_treated.copy()
-    
-    # Agora filtra os participantes ativos para análises de perfil e match
-    df_active_participants = filter_active_participants(df_with_pii_treated)
+        # Processa a coluna de consciência ANTES de filtrar, para que possamos analisá-la.
+        # O resultado é o DataFrame para análise de consciência (inclui quem não quer continuar)
+        df_processed_for_conscience = process_conscience_column(df_with_pii_treated)
+        
+        # Agora filtra os participantes ativos para análises de perfil e match
+        df_active_participants = filter_active_participants(df_processed_for_conscience)
 
     # Salvando o mapeamento de PII (manter MUITO SEGURO)
-    if not pii_mapping_df.empty:
-        os.makedirs(os.path.dirname(ANONYMIZED_PII_PATH), exist_ok=True)
-        pii_mapping_df.to_csv(ANONYMIZED_PII_PATH, index=False)
-        logging.info(f"Mapeamento de PII salvo em: {ANONYMIZED_PII_PATH}. **MANTENHA ESTE ARQUIVO EXTREMAMENTE SEGURO!**")
-    else:
-        logging.warning("Mapeamento de PII está vazio, não será salvo.")
+    if save_pii_mapping:
+        if not pii_mapping_df.empty:
+            saved_path = write_dataset(pii_mapping_df, ANONYMIZED_PII_PATH)
+            logging.info(f"Mapeamento de PII salvo em: {saved_path}. **MANTENHA ESTE ARQUIVO EXTREMAMENTE SEGURO!**")
+        else:
+            logging.warning("Mapeamento de PII está vazio, não será salvo.")
     
     logging.info("Pré-processamento de dados concluído.")
     return df_processed_for_conscience, df_active_participants, pii_mapping_df
 
+@traced(category='etl')
+def preprocess_data_in_chunks(chunks, processed_path: str = PROCESSED_DATA_PATH, pii_path: str = ANONYMIZED_PII_PATH,
+                              state_path: str = PIPELINE_STATE_PATH) -> tuple[int, int, pd.Series]:
+    """
+    Versão em streaming de preprocess_data para o ETL completo: cada bloco de respostas brutas
+    (iter_raw_data_chunks) é pré-processado e gravado em seguida, então o pico de memória depende
+    do tamanho do bloco e não do tamanho da exportação.
+    Grava os participantes ativos, o mapeamento de PII e o estado do pipeline (modo incremental).
+    Se a leitura falhar no meio, nenhuma saída anterior é substituída.
+
+    Args:
+        chunks: Blocos de iter_raw_data_chunks (índice contínuo entre os blocos, com ROW_HASH_COL).
+        processed_path, pii_path, state_path (str): Caminhos base das saídas (por padrão, os do config).
+
+    Returns:
+        tuple[int, int, pd.Series]:
+            - Total de respostas lidas.
+            - Total de participantes ativos gravados.
+            - Contagem de 'consciencia_escopo_padronizada' (todas as respostas, inclusive de quem não quer continuar).
+    """
+    conscience_counts = pd.Series(dtype='int64')
+    n_responses = 0
+    with DatasetWriter(processed_path) as processed_writer, DatasetWriter(pii_path) as pii_writer, DatasetWriter(state_path) as state_writer:
+        for chunk in chunks:
+            df_conscience, df_active, pii_mapping_df = preprocess_data(chunk, save_pii_mapping=False)
+            processed_writer.write(df_active)
+            pii_writer.write(pii_mapping_df)
+            state_writer.write(df_conscience[STATE_COLUMNS])
+            chunk_counts = df_conscience['consciencia_escopo_padronizada'].value_counts()
+            conscience_counts = chunk_counts if conscience_counts.empty else conscience_counts.add(chunk_counts, fill_value=0).astype('int64')
+            n_responses += len(chunk)
+        n_active = processed_writer.rows_written
+
+    if pii_writer.rows_written:
+        logging.info(f"Mapeamento de PII salvo em: {pii_writer.path}. **MANTENHA ESTE ARQUIVO EXTREMAMENTE SEGURO!**")
+    logging.info(f"Pré-processamento em blocos concluído: {n_responses} respostas, {n_active} participantes ativos.")
+    return n_responses, n_active, conscience_counts.sort_values(ascending=False, kind='stable')
+
 if __name__ == '__main__':
     # Este bloco é executado apenas quando o script é chamado diretamente (para testes)
     from src.data_ingestion import load_raw_data
@@ -0,0 +1,99 @@
+# transdevs_techexperience/src/incremental.py
+
+import pandas as pd
+import logging
+
+from src.config import PIPELINE_STATE_PATH, ROW_HASH_COL
+from src.storage import read_dataset, write_dataset, dataset_path
+from src.data_ingestion import RAW_TIMESTAMP_COL
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Colunas guardadas no estado do pipeline (uma linha por resposta bruta, inclusive de quem não quer continuar)
+STATE_COLUMNS = ['participant_id', 'timestamp', ROW_HASH_COL, 'consciencia_escopo_padronizada']
+
+def load_pipeline_state(file_path: str = PIPELINE_STATE_PATH) -> pd.DataFrame:
+    """
+    Carrega o estado da última execução do pipeline (participant_id, timestamp, hash e consciência de cada resposta).
+    Retorna um DataFrame vazio se ainda não houver estado salvo.
+    """
+    try:
+        return read_dataset(file_path)
+    except FileNotFoundError:
+        logging.info(f"Estado do pipeline não encontrado em {dataset_path(file_path)}.")
+        return pd.DataFrame(columns=STATE_COLUMNS)
+
+def save_pipeline_state(df_state: pd.DataFrame, file_path: str = PIPELINE_STATE_PATH):
+    """Salva o estado do pipeline (apenas as colunas de STATE_COLUMNS, ordenadas por participant_id)."""
+    saved_path = write_dataset(df_state[STATE_COLUMNS].sort_values('participant_id'), file_path)
+    logging.info(f"Estado do pipeline salvo em: {saved_path}")
+
+def detect_changed_rows(raw_df: pd.DataFrame, df_state: pd.DataFrame, timestamp_col: str = RAW_TIMESTAMP_COL):
+    """
+    Identifica as respostas brutas novas ou editadas desde a última execução.
+    - Novas: carimbo de data/hora posterior ao último já processado, ou posição ainda sem estado.
+    - Editadas: mesma posição no formulário, mas hash de conteúdo diferente do salvo no estado.
+    O participant_id de cada resposta é a sua posição no formulário (índice + 1), estável enquanto o
+    formulário só recebe respostas novas no final. raw_df pode ser um bloco de iter_raw_data_chunks;
+    respostas removidas do formulário são verificadas à parte (responses_removed), com o total lido.
+
+    Args:
+        raw_df (pd.DataFrame): Dados brutos lidos por iter_raw_data_chunks (carimbo já convertido e
+                               coluna ROW_HASH_COL já calculada).
+        df_state (pd.DataFrame): Estado salvo por save_pipeline_state.
+
+    Returns:
+        pd.Series | None: Máscara booleana (alinhada a raw_df) das respostas a processar,
+                          ou None se for preciso reprocessar tudo (sem estado).
+    """
+    if df_state.empty:
+        logging.info("Sem estado anterior: todas as respostas serão processadas.")
+        return None
+
+    participant_ids = pd.Series(raw_df.index + 1, index=raw_df.index)
+    previous = df_state.set_index('participant_id')
+    previous_hashes = participant_ids.map(previous[ROW_HASH_COL])
+    edited = previous_hashes.notna() & (previous_hashes != raw_df[ROW_HASH_COL])
+
+    last_timestamp = previous['timestamp'].max()
+    new = previous_hashes.isna() | (raw_df[timestamp_col] > last_timestamp)
+
+    logging.info(f"Modo incremental: {int(new.sum())} respostas novas (após {last_timestamp}) e {int((edited & ~new).sum())} editadas, de {len(raw_df)} lidas.")
+    return new | edited
+
+def responses_removed(n_raw_rows: int, df_state: pd.DataFrame) -> bool:
+    """Indica se o formulário tem menos respostas do que o estado salvo (exige reprocessar tudo)."""
+    if n_raw_rows < len(df_state):
+        logging.warning(f"O formulário tem menos respostas ({n_raw_rows}) do que o estado salvo ({len(df_state)}). Reprocessando tudo.")
+        return True
+    return False
+
+def select_delta_rows(df_current: pd.DataFrame, df_previous: pd.DataFrame) -> pd.Series:
+    """
+    Marca as linhas de df_current que não estão em df_previous com o mesmo conteúdo
+    (participant_id ausente ou ROW_HASH_COL diferente). Sem ROW_HASH_COL nas duas tabelas,
+    compara só o participant_id.
+    """
+    if df_previous.empty:
+        return pd.Series(True, index=df_current.index)
+    if ROW_HASH_COL in df_current.columns and ROW_HASH_COL in df_previous.columns:
+        previous_hashes = df_current['participant_id'].map(df_previous.set_index('participant_id')[ROW_HASH_COL])
+        return previous_hashes.isna() | (previous_hashes != df_current[ROW_HASH_COL])
+    return ~df_current['participant_id'].isin(df_previous['participant_id'])
+
+def merge_by_participant(df_previous: pd.DataFrame, df_delta: pd.DataFrame, delta_ids: pd.Series) -> pd.DataFrame:
+    """
+    Substitui em df_previous as linhas dos participantes em delta_ids pelas linhas de df_delta.
+    Participantes do delta que não aparecem em df_delta (ex: passaram a não querer continuar) são removidos.
+    O resultado mantém as colunas de df_previous (quando houver) e fica ordenado por participant_id.
+    """
+    if df_previous.empty:
+        return df_delta.sort_values('participant_id').reset_index(drop=True)
+    df_kept = df_previous[~df_previous['participant_id'].isin(delta_ids)]
+    if df_delta.empty:
+        return df_kept.reset_index(drop=True)
+    # Scores float32 recalculados no delta voltam do CSV (formato legado) como float64; alinha os tipos das linhas mantidas
+    float32_cols = {col: 'float32' for col, dtype in df_delta.dtypes.items() if dtype == 'float32' and col in df_kept.columns}
+    df_merged = pd.concat([df_kept.astype(float32_cols), df_delta], ignore_index=True)
+    columns = list(df_previous.columns) + [col for col in df_delta.columns if col not in df_previous.columns]
+    return df_merged.sort_values('participant_id').reset_index(drop=True)[columns]
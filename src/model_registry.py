@@ -0,0 +1,171 @@
+# transdevs_techexperience/src/model_registry.py
+
+import os
+import json
+import hashlib
+import logging
+import platform
+import shutil
+from datetime import datetime, timezone
+from importlib import metadata
+
+import joblib
+
+from src.config import MODEL_REGISTRY_DIR, MODEL_REGISTRY_KEEP_VERSIONS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Bibliotecas cujas versões ficam registradas no manifesto de cada artefato
+TRACKED_LIBRARIES = ['scikit-learn', 'numpy', 'scipy', 'joblib', 'pandas', 'spacy']
+
+ARTIFACT_FILENAME = 'artifact.joblib'
+MANIFEST_FILENAME = 'manifest.json'
+LATEST_FILENAME = 'LATEST'
+
+def compute_data_fingerprint(texts) -> str:
+    """
+    Calcula uma impressão digital (sha256) do conjunto de textos usado para treinar um artefato.
+    A ordem dos textos faz parte da impressão digital.
+    """
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(str(text).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+def compute_matrix_fingerprint(matrix) -> str:
+    """Calcula a impressão digital (sha256) de uma matriz esparsa CSR (ex: a matriz TF-IDF de treino do LDA)."""
+    digest = hashlib.sha256()
+    digest.update(str(matrix.shape).encode('utf-8'))
+    for array in (matrix.indptr, matrix.indices, matrix.data):
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+def get_library_versions() -> dict:
+    """Retorna as versões do Python e das bibliotecas relevantes para reproduzir um artefato."""
+    versions = {'python': platform.python_version()}
+    for library in TRACKED_LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+    return versions
+
+def _artifact_dir(name: str, registry_dir: str = MODEL_REGISTRY_DIR) -> str:
+    return os.path.join(registry_dir, name)
+
+def list_artifact_versions(name: str, registry_dir: str = MODEL_REGISTRY_DIR) -> list:
+    """Lista as versões salvas de um artefato, da mais antiga para a mais recente."""
+    artifact_dir = _artifact_dir(name, registry_dir)
+    if not os.path.isdir(artifact_dir):
+        return []
+    return sorted(
+        entry for entry in os.listdir(artifact_dir)
+        if os.path.isfile(os.path.join(artifact_dir, entry, MANIFEST_FILENAME))
+    )
+
+def get_latest_version(name: str, registry_dir: str = MODEL_REGISTRY_DIR):
+    """Retorna a versão mais recente de um artefato, ou None se não houver nenhuma."""
+    latest_path = os.path.join(_artifact_dir(name, registry_dir), LATEST_FILENAME)
+    if os.path.exists(latest_path):
+        with open(latest_path, encoding='utf-8') as f:
+            version = f.read().strip()
+        if version:
+            return version
+    versions = list_artifact_versions(name, registry_dir)
+    return versions[-1] if versions else None
+
+def find_version_by_fingerprint(name: str, data_fingerprint: str, registry_dir: str = MODEL_REGISTRY_DIR):
+    """Retorna a versão mais recente de um artefato treinado sobre os dados com essa impressão digital, ou None."""
+    for version in reversed(list_artifact_versions(name, registry_dir)):
+        if version.endswith(f'-{data_fingerprint[:8]}'):
+            manifest = load_manifest(name, version, registry_dir)
+            if manifest is not None and manifest['data_fingerprint'] == data_fingerprint:
+                return version
+    return None
+
+def save_artifact(name: str, obj, data_fingerprint: str, metadata_extra: dict = None, registry_dir: str = MODEL_REGISTRY_DIR) -> str:
+    """
+    Salva um artefato versionado em models/registry/<name>/<versão>/ com um manifesto.
+    O objeto é salvo com joblib sem compressão, então arrays NumPy grandes (ex: components_ do LDA)
+    podem ser abertos com memory-map na carga.
+
+    Args:
+        name (str): Nome do artefato (ex: 'tfidf_vectorizer', 'lda_model').
+        obj: Objeto a salvar.
+        data_fingerprint (str): Impressão digital dos dados de treino (compute_data_fingerprint).
+        metadata_extra (dict): Metadados adicionais gravados no manifesto (ex: versão do artefato pai).
+
+    Returns:
+        str: A versão criada.
+    """
+    created_at = datetime.now(timezone.utc)
+    version = f"{created_at.strftime('%Y%m%dT%H%M%S%f')}-{data_fingerprint[:8]}"
+    version_dir = os.path.join(_artifact_dir(name, registry_dir), version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    artifact_path = os.path.join(version_dir, ARTIFACT_FILENAME)
+    joblib.dump(obj, artifact_path)
+
+    manifest = {
+        'name': name,
+        'version': version,
+        'created_at': created_at.isoformat(),
+        'object_type': f"{type(obj).__module__}.{type(obj).__name__}",
+        'data_fingerprint': data_fingerprint,
+        'library_versions': get_library_versions(),
+        'artifact_file': ARTIFACT_FILENAME,
+        'artifact_size_bytes': os.path.getsize(artifact_path),
+        'metadata': metadata_extra or {},
+    }
+    with open(os.path.join(version_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(_artifact_dir(name, registry_dir), LATEST_FILENAME), 'w', encoding='utf-8') as f:
+        f.write(version)
+
+    logging.info(f"Artefato '{name}' salvo no registro como versão {version}.")
+    _prune_old_versions(name, registry_dir)
+    return version
+
+def _prune_old_versions(name: str, registry_dir: str):
+    versions = list_artifact_versions(name, registry_dir)
+    latest = get_latest_version(name, registry_dir)
+    for version in versions[:-MODEL_REGISTRY_KEEP_VERSIONS]:
+        if version != latest:
+            shutil.rmtree(os.path.join(_artifact_dir(name, registry_dir), version), ignore_errors=True)
+            logging.info(f"Versão antiga do artefato '{name}' removida: {version}")
+
+def load_manifest(name: str, version: str = None, registry_dir: str = MODEL_REGISTRY_DIR):
+    """Carrega o manifesto de uma versão (a mais recente se version=None). Retorna None se não existir."""
+    version = version or get_latest_version(name, registry_dir)
+    if version is None:
+        return None
+    manifest_path = os.path.join(_artifact_dir(name, registry_dir), version, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def load_artifact(name: str, version: str = None, mmap: bool = True, registry_dir: str = MODEL_REGISTRY_DIR) -> tuple:
+    """
+    Carrega um artefato do registro (a versão mais recente se version=None).
+    Com mmap=True, os arrays NumPy são abertos com memory-map somente leitura (caminho rápido de inferência);
+    use mmap=False quando o objeto for modificado (ex: partial_fit).
+
+    Returns:
+        tuple: (objeto, manifesto). Retorna (None, None) se o artefato não existir.
+    """
+    manifest = load_manifest(name, version, registry_dir)
+    if manifest is None:
+        logging.warning(f"Artefato '{name}' (versão {version or 'mais recente'}) não encontrado no registro {registry_dir}.")
+        return None, None
+
+    current_versions = get_library_versions()
+    for library, saved_version in manifest['library_versions'].items():
+        if current_versions.get(library) != saved_version and library in ('scikit-learn', 'numpy'):
+            logging.warning(f"Artefato '{name}' foi salvo com {library} {saved_version}, mas o ambiente usa {current_versions.get(library)}.")
+
+    artifact_path = os.path.join(_artifact_dir(name, registry_dir), manifest['version'], manifest['artifact_file'])
+    obj = joblib.load(artifact_path, mmap_mode='r' if mmap else None)
+    logging.info(f"Artefato '{name}' versão {manifest['version']} carregado{' (memory-map)' if mmap else ''}.")
+    return obj, manifest
@@ -0,0 +1,316 @@
+# transdevs_techexperience/src/pipeline.py
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from graphlib import TopologicalSorter
+from typing import Callable, NamedTuple
+
+import joblib
+import pandas as pd
+
+from src import config
+from src.config import (RAW_DATA_PATH, PROCESSED_DATA_PATH, ANONYMIZED_PII_PATH, PIPELINE_STATE_PATH, CONSCIENCE_SUMMARY_PATH, EDA_FINAL_PATH,
+                        LEADERSHIP_ANALYSIS_PATH, TEAM_FORMATION_PATH, NGRAM_COUNTS_PATH, NGRAM_VOCABULARY_PATH, DASHBOARD_BUNDLE_PATH,
+                        TEXT_COLUMNS_FOR_NLP, PIPELINE_CACHE_DIR, PIPELINE_CACHE_KEEP_VERSIONS)
+from src.data_ingestion import load_raw_data
+from src.data_processing import preprocess_data
+from src.incremental import save_pipeline_state
+from src.model_registry import get_library_versions
+from src.storage import write_dataset, dataset_path
+from src.analysis.nlp_processing import lemmatize_text_columns, vectorize_text_tfidf, register_tfidf_vectorizer, compute_tfidf_fingerprint
+from src.analysis.eda import (clean_text_columns, combine_cleaned_text, fit_topic_model, topic_scores_frame, compute_text_sentiment,
+                              assemble_eda_frame, log_top_ngrams)
+from src.analysis.ngram_index import NgramIndex
+from src.analysis.leadership_analysis import analyze_leadership_potential
+from src.analysis.team_formation import form_teams
+from src.dashboard_bundle import build_dashboard_bundle, write_dashboard_bundle
+from src.tracing import span
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class Stage(NamedTuple):
+    """
+    Um estágio do pipeline: run recebe os artefatos dos estágios de inputs (na mesma ordem) e devolve o seu artefato.
+    A chave de cache do estágio é o hash de: hashes de conteúdo dos artefatos de entrada, constantes de src/config.py
+    listadas em config, código de run e dos módulos em modules e conteúdo dos arquivos em sources.
+    """
+    name: str
+    run: Callable
+    inputs: tuple = ()
+    config: tuple = ()
+    modules: tuple = ()
+    sources: tuple = ()
+    publish: Callable = None # Grava as saídas lidas pelo dashboard e pelos outros scripts
+    outputs: tuple = () # Arquivos gravados por publish; se algum sumir, o estágio é republicado a partir do cache
+    fingerprint: Callable = None # Hash do conteúdo do artefato, quando compute_artifact_hash não é estável entre execuções
+
+# --- Estágios ---
+
+def _ingest() -> pd.DataFrame:
+    raw_df = load_raw_data()
+    if raw_df.empty:
+        raise ValueError(f"Nenhuma resposta bruta lida de {RAW_DATA_PATH}.")
+    return raw_df
+
+def _preprocess(raw_df: pd.DataFrame) -> tuple:
+    # (respostas com consciência padronizada, participantes ativos, mapeamento de PII)
+    return preprocess_data(raw_df, save_pii_mapping=False)
+
+def _publish_preprocess(preprocessed: tuple):
+    df_conscience, df_active, pii_mapping = preprocessed
+    logging.info(f"Dados dos participantes ativos salvos em: {write_dataset(df_active, PROCESSED_DATA_PATH)}")
+    saved_path = write_dataset(pii_mapping, ANONYMIZED_PII_PATH)
+    logging.info(f"Mapeamento de PII salvo em: {saved_path}. **MANTENHA ESTE ARQUIVO EXTREMAMENTE SEGURO!**")
+    save_pipeline_state(df_conscience) # Permite um run_pipeline.py --incremental depois do pipeline completo
+    os.makedirs(os.path.dirname(CONSCIENCE_SUMMARY_PATH), exist_ok=True)
+    df_conscience['consciencia_escopo_padronizada'].value_counts().to_csv(CONSCIENCE_SUMMARY_PATH)
+
+def _clean(preprocessed: tuple) -> pd.DataFrame:
+    return clean_text_columns(preprocessed[1], TEXT_COLUMNS_FOR_NLP)
+
+def _lemmatize(cleaned_df: pd.DataFrame) -> pd.DataFrame:
+    return lemmatize_text_columns(cleaned_df, TEXT_COLUMNS_FOR_NLP)
+
+def _tfidf(cleaned_df: pd.DataFrame) -> tuple:
+    # (vetorizador, matriz). A versão no registro fica fora do artefato: ela muda a cada registro e invalidaria o lda no cache
+    tfidf_vectorizer, tfidf_matrix, _ = vectorize_text_tfidf(combine_cleaned_text(cleaned_df), persist=False)
+    return tfidf_vectorizer, tfidf_matrix
+
+def _publish_tfidf(tfidf: tuple):
+    logging.info(f"Vetorizador TF-IDF registrado como versão {register_tfidf_vectorizer(*tfidf)}.")
+
+def _lda(cleaned_df: pd.DataFrame, tfidf: tuple) -> pd.DataFrame:
+    tfidf_vectorizer, tfidf_matrix = tfidf
+    # A versão registrada por _publish_tfidf é achada pela impressão digital do vetorizador (registrado de novo se já saiu do registro)
+    vectorizer_version = register_tfidf_vectorizer(tfidf_vectorizer, tfidf_matrix)
+    lda_model, _, num_topics = fit_topic_model(tfidf_vectorizer, tfidf_matrix, vectorizer_version=vectorizer_version)
+    return topic_scores_frame(lda_model, tfidf_matrix, num_topics, cleaned_df.index)
+
+def _sentiment(lemmas_df: pd.DataFrame) -> pd.DataFrame:
+    return compute_text_sentiment(lemmas_df, TEXT_COLUMNS_FOR_NLP)
+
+def _eda(preprocessed: tuple, cleaned_df: pd.DataFrame, lemmas_df: pd.DataFrame, df_topics: pd.DataFrame, df_sentiment: pd.DataFrame) -> pd.DataFrame:
+    return assemble_eda_frame(preprocessed[1], cleaned_df, lemmas_df, df_topics, df_sentiment)
+
+def _publish_eda(df_eda: pd.DataFrame):
+    logging.info(f"Dados finais da EDA (com NLP, tópicos, sentimento) salvos em: {write_dataset(df_eda, EDA_FINAL_PATH)}")
+
+def _ngrams(df_eda: pd.DataFrame) -> NgramIndex:
+    ngram_index = NgramIndex.build(df_eda)
+    log_top_ngrams(ngram_index)
+    return ngram_index
+
+def _publish_ngrams(ngram_index: NgramIndex):
+    logging.info(f"Índice de n-grams salvo em: {ngram_index.save()}")
+
+def _leadership(df_eda: pd.DataFrame, preprocessed: tuple) -> pd.DataFrame:
+    return analyze_leadership_potential(df_eda, preprocessed[2])
+
+def _publish_leadership(df_leadership: pd.DataFrame):
+    if not df_leadership.empty:
+        logging.info(f"Insights de liderança salvos em: {write_dataset(df_leadership, LEADERSHIP_ANALYSIS_PATH)}")
+
+def _teams(df_eda: pd.DataFrame, df_leadership: pd.DataFrame) -> pd.DataFrame:
+    return form_teams(df_eda, df_leadership)
+
+def _publish_teams(df_teams: pd.DataFrame):
+    if not df_teams.empty:
+        logging.info(f"Equipes formadas salvas em: {write_dataset(df_teams, TEAM_FORMATION_PATH)}")
+
+def _bundle(df_eda: pd.DataFrame, df_leadership: pd.DataFrame, df_teams: pd.DataFrame, ngram_index: NgramIndex) -> dict:
+    return build_dashboard_bundle(df_eda, df_leadership, df_teams, ngram_index)
+
+def _publish_bundle(bundle: dict):
+    logging.info(f"Pacote de agregados do dashboard salvo em: {write_dashboard_bundle(bundle)}")
+
+NLP_MODULES = ('src.analysis.nlp_processing', 'src.analysis.eda')
+GROUP_CONFIG = ('GROUP_NAMES', 'TOPIC_TO_GROUP_APTITUDE_MAP', 'GROUP_OPTIONS_SEPARATOR', 'NO_ALTERNATIVE_OPTION')
+
+STAGES = [
+    Stage('ingest', _ingest, config=('ORIGINAL_COL_NAMES', 'TIMESTAMP_FORMAT', 'ROW_HASH_COL'), modules=('src.data_ingestion',),
+          sources=(RAW_DATA_PATH,)),
+    Stage('preprocess', _preprocess, inputs=('ingest',), config=('ORIGINAL_COL_NAMES', 'EXCLUSION_CRITERIA', 'CONSCIENCIA_OPTIONS'),
+          modules=('src.data_processing',), publish=_publish_preprocess,
+          outputs=(dataset_path(PROCESSED_DATA_PATH), dataset_path(ANONYMIZED_PII_PATH), dataset_path(PIPELINE_STATE_PATH), CONSCIENCE_SUMMARY_PATH)),
+    Stage('clean', _clean, inputs=('preprocess',), config=('TEXT_COLUMNS_FOR_NLP', 'TYPO_CORRECTION_MAP'), modules=NLP_MODULES),
+    Stage('lemmatize', _lemmatize, inputs=('clean',), config=('TEXT_COLUMNS_FOR_NLP', 'SPACY_MODEL_NAME', 'SPACY_EXCLUDED_COMPONENTS'),
+          modules=NLP_MODULES + ('src.analysis.lemma_cache',)),
+    # O TfidfVectorizer treinado guarda id(stop_words), que muda a cada processo: o hash é o do vocabulário e da matriz
+    Stage('tfidf', _tfidf, inputs=('clean',), modules=NLP_MODULES, publish=_publish_tfidf,
+          fingerprint=lambda tfidf: compute_tfidf_fingerprint(*tfidf)),
+    Stage('lda', _lda, inputs=('clean', 'tfidf'), modules=NLP_MODULES),
+    Stage('sentiment', _sentiment, inputs=('lemmatize',),
+          config=('TEXT_COLUMNS_FOR_NLP', 'POSITIVE_WORDS', 'NEGATIVE_WORDS', 'OVERALL_SENTIMENT_COL', 'SPACY_MODEL_NAME'), modules=NLP_MODULES),
+    Stage('eda', _eda, inputs=('preprocess', 'clean', 'lemmatize', 'lda', 'sentiment'), modules=('src.analysis.eda',),
+          publish=_publish_eda, outputs=(dataset_path(EDA_FINAL_PATH),)),
+    Stage('ngrams', _ngrams, inputs=('eda',), config=('TEXT_COLUMNS_FOR_NLP', 'NGRAM_INDEX_SIZES', 'NGRAM_FACET_COLUMNS'),
+          modules=('src.analysis.ngram_index',), publish=_publish_ngrams, outputs=(dataset_path(NGRAM_COUNTS_PATH), dataset_path(NGRAM_VOCABULARY_PATH))),
+    Stage('leadership', _leadership, inputs=('eda', 'preprocess'),
+          config=GROUP_CONFIG + ('LEADERSHIP_TYPES', 'LEADERSHIP_SENTIMENT_COLS', 'GROUP_LEADER_CAPACITY', 'DEFAULT_GROUP_LEADER_CAPACITY'),
+          modules=('src.analysis.leadership_analysis',), publish=_publish_leadership, outputs=(dataset_path(LEADERSHIP_ANALYSIS_PATH),)),
+    Stage('teams', _teams, inputs=('eda', 'leadership'),
+          config=GROUP_CONFIG + ('TEAM_GROUP_CAPACITY', 'TEAM_CAPACITY_SLACK', 'TEAM_PREFERENCE_COSTS', 'TEAM_TOPIC_AFFINITY_WEIGHT'),
+          modules=('src.analysis.team_formation', 'src.analysis.leadership_analysis'), publish=_publish_teams, outputs=(dataset_path(TEAM_FORMATION_PATH),)),
+    Stage('bundle', _bundle, inputs=('eda', 'leadership', 'teams', 'ngrams'),
+          config=('GROUP_NAMES', 'OVERALL_SENTIMENT_COL', 'WORDCLOUD_NGRAM_SIZES', 'WORDCLOUD_MAX_WORDS'),
+          modules=('src.dashboard_bundle',), publish=_publish_bundle, outputs=(DASHBOARD_BUNDLE_PATH,)),
+]
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+# --- Chaves de cache ---
+
+def file_fingerprint(file_path: str) -> str:
+    """sha256 do conteúdo de um arquivo, lido em blocos."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+@lru_cache(maxsize=None)
+def _module_fingerprint(module_name: str) -> str:
+    return file_fingerprint(importlib.util.find_spec(module_name).origin)
+
+@lru_cache(maxsize=1)
+def _library_versions() -> dict:
+    return get_library_versions()
+
+def compute_stage_key(stage: Stage, input_hashes: list) -> str:
+    """Chave de cache do estágio (ver Stage). Não executa nada: só lê o código, a configuração e os arquivos de origem."""
+    payload = {
+        'stage': stage.name,
+        'inputs': input_hashes,
+        'config': {name: getattr(config, name) for name in stage.config},
+        'code': [inspect.getsource(stage.run)] + [_module_fingerprint(module) for module in stage.modules],
+        'sources': [file_fingerprint(path) for path in stage.sources],
+        'libraries': _library_versions(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=repr).encode('utf-8')).hexdigest()[:24]
+
+def compute_artifact_hash(artifact) -> str:
+    """Hash do conteúdo de um artefato. Entra na chave dos estágios seguintes: se um estágio re-executado produz o mesmo
+    artefato, os estágios que dependem dele continuam válidos no cache."""
+    return joblib.hash(artifact)
+
+# --- Cache em disco ---
+
+def _cache_paths(stage_name: str, key: str, cache_dir: str) -> tuple:
+    stage_dir = os.path.join(cache_dir, stage_name)
+    return os.path.join(stage_dir, f'{key}.joblib'), os.path.join(stage_dir, f'{key}.json')
+
+def load_cache_manifest(stage_name: str, key: str, cache_dir: str = PIPELINE_CACHE_DIR):
+    """Manifesto de uma entrada do cache (hash do artefato, duração, data), ou None se a entrada não existir."""
+    artifact_path, manifest_path = _cache_paths(stage_name, key, cache_dir)
+    if not (os.path.exists(manifest_path) and os.path.exists(artifact_path)):
+        return None
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def load_cached_artifact(stage_name: str, key: str, cache_dir: str = PIPELINE_CACHE_DIR):
+    return joblib.load(_cache_paths(stage_name, key, cache_dir)[0])
+
+def save_cached_artifact(stage_name: str, key: str, artifact, manifest: dict, cache_dir: str = PIPELINE_CACHE_DIR):
+    """Grava o artefato e, por último, o manifesto (uma entrada só vale com os dois). Mantém PIPELINE_CACHE_KEEP_VERSIONS entradas por estágio."""
+    artifact_path, manifest_path = _cache_paths(stage_name, key, cache_dir)
+    os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+    joblib.dump(artifact, artifact_path)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    stage_dir = os.path.dirname(manifest_path)
+    manifests = sorted((entry for entry in os.listdir(stage_dir) if entry.endswith('.json')),
+                       key=lambda entry: os.path.getmtime(os.path.join(stage_dir, entry)))
+    for entry in manifests[:-PIPELINE_CACHE_KEEP_VERSIONS]:
+        for path in _cache_paths(stage_name, entry[:-len('.json')], cache_dir):
+            if os.path.exists(path):
+                os.remove(path)
+
+# --- Execução ---
+
+def select_stages(targets: list = None) -> list:
+    """Estágios necessários para produzir targets (todos, se None), em ordem topológica."""
+    by_name = {stage.name: stage for stage in STAGES}
+    needed, pending = set(), list(targets or STAGE_NAMES)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(by_name[name].inputs)
+    order = TopologicalSorter({stage.name: stage.inputs for stage in STAGES}).static_order()
+    return [by_name[name] for name in order if name in needed]
+
+def run_pipeline(targets: list = None, force: list = (), cache_dir: str = PIPELINE_CACHE_DIR) -> list:
+    """
+    Executa os estágios necessários para targets (todos, se None), pulando os que já estão no cache com a mesma chave.
+    - Os artefatos passam de um estágio para o outro em memória; um estágio do cache só é carregado do disco
+      se algum estágio seguinte precisar ser executado (ou se as suas saídas publicadas tiverem sumido).
+    - Cada artefato é liberado da memória assim que o último estágio que o usa termina.
+    - Estágios em force são executados mesmo com o cache válido ('all' força todos).
+
+    Returns:
+        list: Um dict por estágio: {'stage', 'status' ('executado', 'cache' ou 'republicado'), 'seconds', 'key'}.
+    """
+    stages = select_stages(targets)
+    force = set(STAGE_NAMES) if 'all' in force else set(force)
+    remaining_uses = {stage.name: 0 for stage in stages}
+    for stage in stages:
+        for input_name in stage.inputs:
+            remaining_uses[input_name] += 1
+
+    artifacts, keys, hashes, report = {}, {}, {}, []
+
+    def get_artifact(name: str):
+        if name not in artifacts:
+            logging.info(f"Carregando do cache o artefato do estágio '{name}'.")
+            artifacts[name] = load_cached_artifact(name, keys[name], cache_dir)
+        return artifacts[name]
+
+    for stage in stages:
+        # Um span por estágio no trace (src/tracing.py); as funções chamadas pelo estágio aparecem aninhadas
+        with span(f'estágio {stage.name}', category='estágio') as stage_span:
+            start = time.perf_counter()
+            key = compute_stage_key(stage, [hashes[name] for name in stage.inputs])
+            keys[stage.name] = key
+            manifest = None if stage.name in force else load_cache_manifest(stage.name, key, cache_dir)
+            if manifest is None:
+                logging.info(f"--- Estágio '{stage.name}': executando ---")
+                artifact = stage.run(*[get_artifact(name) for name in stage.inputs])
+                artifacts[stage.name] = artifact
+                hashes[stage.name] = (stage.fingerprint or compute_artifact_hash)(artifact)
+                if stage.publish is not None:
+                    stage.publish(artifact)
+                seconds = time.perf_counter() - start
+                save_cached_artifact(stage.name, key, artifact, {
+                    'stage': stage.name, 'key': key, 'artifact_hash': hashes[stage.name], 'seconds': round(seconds, 3),
+                    'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                }, cache_dir)
+                status = 'executado'
+            else:
+                hashes[stage.name] = manifest['artifact_hash']
+                status = 'cache'
+                if stage.publish is not None and not all(os.path.exists(path) for path in stage.outputs):
+                    stage.publish(get_artifact(stage.name))
+                    status = 'republicado'
+                seconds = time.perf_counter() - start
+                logging.info(f"--- Estágio '{stage.name}': {status} (chave {key}) ---")
+            stage_span['status'] = status
+        report.append({'stage': stage.name, 'status': status, 'seconds': seconds, 'key': key})
+
+        for name in stage.inputs:
+            remaining_uses[name] -= 1
+            if remaining_uses[name] == 0:
+                artifacts.pop(name, None)
+
+    return report
+
+if __name__ == '__main__':
+    for row in run_pipeline():
+        print(f"{row['stage']:>12} {row['status']:>12} {row['seconds']:>8.2f} s")
@@ -0,0 +1,204 @@
+# transdevs_techexperience/src/storage.py
+
+import ast
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.config import (STORAGE_FORMAT, LIST_COLUMN_SUFFIXES, CATEGORICAL_COLUMNS, CATEGORICAL_COLUMN_SUFFIXES, DATETIME_COLUMNS,
+                        ROW_HASH_COL, TIMESTAMP_FORMAT)
+from src.tracing import traced
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+STORAGE_EXTENSIONS = {'parquet': '.parquet', 'csv': '.csv'}
+
+def dataset_path(base_path: str, storage_format: str = STORAGE_FORMAT) -> str:
+    """Retorna o caminho do dataset no formato escolhido (troca a extensão do caminho base do config)."""
+    if storage_format not in STORAGE_EXTENSIONS:
+        raise ValueError(f"Formato de armazenamento desconhecido: '{storage_format}'. Use um de {list(STORAGE_EXTENSIONS)}.")
+    return os.path.splitext(base_path)[0] + STORAGE_EXTENSIONS[storage_format]
+
+def is_list_column(column: str) -> bool:
+    return column.endswith(LIST_COLUMN_SUFFIXES)
+
+def is_categorical_column(column: str) -> bool:
+    return column in CATEGORICAL_COLUMNS or column.endswith(CATEGORICAL_COLUMN_SUFFIXES)
+
+def _parse_datetimes(values: pd.Series) -> pd.Series:
+    """
+    Converte datas gravadas como texto: ISO (CSV gravado por write_dataset) ou o formato do Google Forms
+    (saídas gravadas antes de a ingestão converter o carimbo de data/hora).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    return parsed.fillna(pd.to_datetime(values, format=TIMESTAMP_FORMAT, errors='coerce'))
+
+def _existing_path(base_path: str, storage_format: str) -> tuple:
+    """
+    Procura o dataset no formato escolhido e, se não existir, no outro formato
+    (ex: dados em CSV gerados antes da troca para Parquet). Retorna (caminho, formato).
+    """
+    preferred = dataset_path(base_path, storage_format)
+    if os.path.exists(preferred):
+        return preferred, storage_format
+    for other_format in STORAGE_EXTENSIONS:
+        other = dataset_path(base_path, other_format)
+        if other_format != storage_format and os.path.exists(other):
+            logging.info(f"Dataset não encontrado em {preferred}; lendo a versão '{other_format}' em {other}.")
+            return other, other_format
+    raise FileNotFoundError(f"Dataset não encontrado: {preferred}")
+
+def dataset_exists(base_path: str, storage_format: str = STORAGE_FORMAT) -> bool:
+    """Indica se o dataset existe em algum dos formatos suportados."""
+    try:
+        _existing_path(base_path, storage_format)
+        return True
+    except FileNotFoundError:
+        return False
+
+@traced(category='io')
+def write_dataset(df: pd.DataFrame, base_path: str, storage_format: str = STORAGE_FORMAT) -> str:
+    """
+    Grava um dataset processado no formato configurado e retorna o caminho gravado.
+    Em Parquet, as colunas de lista viram list<string> e as colunas categóricas são gravadas com dicionário.
+
+    Args:
+        df (pd.DataFrame): Dataset a gravar (o índice não é gravado).
+        base_path (str): Caminho base do config (ex: EDA_FINAL_PATH).
+        storage_format (str): 'parquet' ou 'csv'.
+    """
+    path = dataset_path(base_path, storage_format)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if storage_format == 'csv':
+        df.to_csv(path, index=False)
+        return path
+
+    df_typed = df.reset_index(drop=True)
+    for col in df_typed.columns:
+        if is_list_column(col):
+            # Células vazias viram listas vazias para a coluna ter um único tipo (list<string>)
+            df_typed[col] = [list(v) if isinstance(v, (list, np.ndarray)) else [] for v in df_typed[col]]
+        elif is_categorical_column(col) and df_typed[col].dtype == object:
+            df_typed[col] = df_typed[col].astype('category')
+    df_typed.to_parquet(path, index=False, engine='pyarrow')
+    return path
+
+class DatasetWriter:
+    """
+    Grava um dataset em blocos (ex: saída do ETL em streaming), sem manter o dataset inteiro em memória.
+    Em Parquet, cada bloco vira um row group; em CSV, os blocos são acrescentados ao arquivo.
+    O arquivo é gravado em um caminho temporário e só substitui o anterior ao final (close) sem erros.
+    Se nenhum bloco tiver linhas, nenhum arquivo é gravado.
+
+    Uso:
+        with DatasetWriter(PROCESSED_DATA_PATH) as writer:
+            for df_chunk in chunks:
+                writer.write(df_chunk)
+    """
+
+    def __init__(self, base_path: str, storage_format: str = STORAGE_FORMAT):
+        self.path = dataset_path(base_path, storage_format)
+        self.storage_format = storage_format
+        self.rows_written = 0
+        self._tmp_path = self.path + '.tmp'
+        self._parquet_writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        if self.rows_written == 0:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        if self.storage_format == 'csv':
+            df.to_csv(self._tmp_path, index=False, mode='w' if self.rows_written == 0 else 'a', header=self.rows_written == 0)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            df_typed = df.reset_index(drop=True)
+            for col in df_typed.columns:
+                if is_list_column(col):
+                    df_typed[col] = [list(v) if isinstance(v, (list, np.ndarray)) else [] for v in df_typed[col]]
+            if self._parquet_writer is None:
+                # O schema vem do primeiro bloco; colunas sem nenhum valor nele são tratadas como texto
+                schema = pa.Schema.from_pandas(df_typed, preserve_index=False)
+                for i, field in enumerate(schema):
+                    if pa.types.is_null(field.type):
+                        schema = schema.set(i, field.with_type(pa.string()))
+                self._schema = schema
+                self._parquet_writer = pq.ParquetWriter(self._tmp_path, schema)
+            self._parquet_writer.write_table(pa.Table.from_pandas(df_typed, schema=self._schema, preserve_index=False))
+        self.rows_written += len(df)
+
+    def close(self, commit: bool = True):
+        """Fecha o arquivo e o move para o caminho final (commit=True) ou descarta o temporário."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self.rows_written and commit:
+            os.replace(self._tmp_path, self.path)
+        elif os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(commit=exc_type is None)
+        return False
+
+def read_dataset_columns(base_path: str, storage_format: str = STORAGE_FORMAT) -> list:
+    """Lista as colunas de um dataset sem carregar os dados (só o schema, no caso do Parquet)."""
+    path, found_format = _existing_path(base_path, storage_format)
+    if found_format == 'csv':
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    import pyarrow.parquet as pq
+    return pq.read_schema(path).names
+
+@traced(category='io')
+def read_dataset(base_path: str, columns: list = None, as_category: bool = False, storage_format: str = STORAGE_FORMAT) -> pd.DataFrame:
+    """
+    Lê um dataset processado, carregando só as colunas pedidas (projeção).
+    Colunas de lista sempre voltam como listas Python, nos dois formatos.
+
+    Args:
+        base_path (str): Caminho base do config (ex: EDA_FINAL_PATH).
+        columns (list): Colunas a carregar (None carrega todas).
+        as_category (bool): Se True, as colunas categóricas ficam com dtype 'category' (menos memória, ex: dashboard);
+                            se False, voltam como texto (object), como as demais etapas do pipeline esperam.
+
+    Raises:
+        FileNotFoundError: Se o dataset não existir em nenhum formato.
+    """
+    path, found_format = _existing_path(base_path, storage_format)
+
+    if found_format == 'csv':
+        # float_precision='round_trip' preserva os scores exatamente como foram gravados
+        df = pd.read_csv(path, usecols=columns, float_precision='round_trip', dtype={ROW_HASH_COL: str})
+        for col in df.columns:
+            if is_list_column(col):
+                df[col] = [ast.literal_eval(v) if isinstance(v, str) else [] for v in df[col]]
+            elif col in DATETIME_COLUMNS:
+                df[col] = _parse_datetimes(df[col])
+            elif as_category and is_categorical_column(col):
+                df[col] = df[col].astype('category')
+        return df
+
+    df = pd.read_parquet(path, columns=columns, engine='pyarrow')
+    for col in df.columns:
+        if is_list_column(col):
+            df[col] = [v.tolist() if isinstance(v, np.ndarray) else [] for v in df[col]]
+        elif col in DATETIME_COLUMNS:
+            df[col] = _parse_datetimes(df[col])
+        elif isinstance(df[col].dtype, pd.CategoricalDtype):
+            if not as_category:
+                df[col] = df[col].astype(object)
+        elif as_category and is_categorical_column(col):
+            # Datasets gravados em blocos (DatasetWriter) guardam as categorias como texto
+            df[col] = df[col].astype('category')
+    return df
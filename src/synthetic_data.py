@@ -0,0 +1,204 @@
+# transdevs_techexperience/src/synthetic_data.py
+
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.config import (ORIGINAL_COL_NAMES, TEXT_COLUMNS_FOR_NLP, EXCLUSION_CRITERIA, GROUP_NAMES,
+                        GROUP_OPTIONS_SEPARATOR, NO_ALTERNATIVE_OPTION, LEADERSHIP_TYPES, TYPO_CORRECTION_MAP, POSITIVE_WORDS,
+                        NEGATIVE_WORDS, TIMESTAMP_FORMAT, SYNTHETIC_DATA_DIR, SYNTHETIC_DATA_SIZES, SYNTHETIC_DATA_SEED,
+                        SYNTHETIC_TYPO_RATE, SYNTHETIC_LEXICON_RATE, SYNTHETIC_MISSING_RATE)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Distribuições das respostas de múltipla escolha, próximas às da exportação real do formulário
+CONSCIENCE_WEIGHTS = {
+    "Estou ciente do escopo do projeto e quero continuar.": 0.80,
+    "Ainda tenho dúvidas, mas quero continuar no projeto.": 0.17,
+    EXCLUSION_CRITERIA: 0.03,
+}
+LEADERSHIP_WEIGHTS = {LEADERSHIP_TYPES['EXECUCAO']: 0.68, LEADERSHIP_TYPES['SUPORTE']: 0.24, LEADERSHIP_TYPES['DIRETA']: 0.08}
+NO_ALTERNATIVE_RATE = 0.07 # Fração de quem só aceita o grupo principal
+
+# Fragmentos das respostas livres: uma resposta junta uma ou duas frases da pergunta, cada uma sobre um tema
+TEXT_THEMES = [
+    'programação', 'desenvolvimento web', 'tecnologia', 'banco de dados', 'análise de dados', 'automação', 'APIs',
+    'integração com WhatsApp', 'Python', 'JavaScript', 'front-end', 'back-end', 'trabalho em equipe', 'metodologias ágeis',
+    'projetos reais', 'experiência prática', 'desenvolvimento de software', 'Supabase', 'testes automatizados',
+    'carreira profissional', 'UX e design', 'computação em nuvem', 'git e versionamento', 'inteligência artificial', 'comunicação',
+]
+TEXT_TEMPLATES = {
+    'objetivo_proposito': [
+        'Quero aprender {tema}', 'Meu objetivo é entrar na área de {tema}', 'Busco experiência prática em {tema}',
+        'Mudar de carreira e trabalhar com {tema}', 'Gostaria de conhecer melhor {tema}', 'Me encontrar na área e crescer em {tema}',
+    ],
+    'expectativas_experiencia': [
+        'Encontros temáticos sobre {tema}', 'Gostaria de uma dinâmica de quebra-gelo falando de {tema}',
+        'Reuniões de interação para trocar ideias sobre {tema}', 'Oficinas práticas de {tema}',
+        'Mentorias com quem já trabalha com {tema}', 'Um projeto real usando {tema}',
+    ],
+    'bagagem_contribuicao': [
+        'Trago conhecimento de {tema}', 'Sei um pouco de {tema}', 'Faço cursos de {tema}', 'Tenho vivência profissional com {tema}',
+        'Trago dedicação e vontade de aprender {tema}', 'Já trabalhei com {tema} em outra área',
+    ],
+    'contribuicao_grupo': [
+        'O grupo pode me ajudar com {tema}', 'Trocando conhecimento sobre {tema}', 'Com apoio e paciência para aprender {tema}',
+        'Compartilhando experiências de {tema}', 'Com retorno sobre meus projetos de {tema}', 'Me ajudando a ganhar prática em {tema}',
+    ],
+    'compromisso_pessoal': [
+        'Estudar {tema} todos os dias', 'Ter disciplina para praticar {tema}', 'Me dedicar ao grupo e a {tema}',
+        'Participar das reuniões e estudar {tema}', 'Manter a constância nos estudos de {tema}', 'Reservar horas na semana para {tema}',
+    ],
+    'expectativas_pos_projeto': [
+        'Levar experiência em {tema}', 'Um portfólio com projetos de {tema}', 'Conexões e amigos da área de {tema}',
+        'Confiança para trabalhar com {tema}', 'Conhecimento prático de {tema}', 'Uma vaga na área de {tema}',
+    ],
+}
+# Frases com palavras dos léxicos de sentimento (POSITIVE_WORDS / NEGATIVE_WORDS)
+POSITIVE_CLAUSES = ['pensando em {palavra}', 'com foco em {palavra}', 'e resumo tudo em uma palavra: {palavra}']
+NEGATIVE_CLAUSES = ['apesar de {palavra}', 'mesmo com {palavra}', 'e o que me preocupa é {palavra}']
+POSITIVE_CLAUSE_SHARE = 0.7 # Entre as respostas com palavras dos léxicos, fração com palavra positiva
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Davi', 'Elis', 'Fabi', 'Gabriel', 'Helena', 'Igor', 'Júlia', 'Kai', 'Luna', 'Mateus',
+               'Nina', 'Otávio', 'Paula', 'Rafa', 'Sofia', 'Tiago', 'Val', 'Yara', 'Zoe', 'Alex', 'Sam', 'Noah', 'Aiyme']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Lima', 'Costa', 'Pereira', 'Almeida', 'Ribeiro', 'Carvalho', 'Gomes', 'Rocha']
+
+# Janela do 'Carimbo de data/hora': as respostas chegam em ordem ao longo desse período
+SYNTHETIC_PERIOD_START = datetime(2025, 10, 20, 8, 0, 0)
+SYNTHETIC_PERIOD_DAYS = 10
+
+def _with_typos(fragment: str) -> str:
+    """Reescreve um fragmento como alguém que comete os erros de TYPO_CORRECTION_MAP (a forma corrigida volta a ser o erro)."""
+    misspellings = {}
+    for typo, corrected in TYPO_CORRECTION_MAP.items():
+        misspellings.setdefault(corrected, typo)
+    return ' '.join(misspellings.get(word, word) for word in fragment.split())
+
+def _lower_first(text: str) -> str:
+    return text[:1].lower() + text[1:]
+
+def _text_answers(column: str, n_rows: int, rng: np.random.Generator, typo_rate: float, lexicon_rate: float) -> np.ndarray:
+    """Respostas livres de uma pergunta: uma ou duas frases de TEXT_TEMPLATES e, às vezes, uma frase com palavra dos léxicos."""
+    fragments = [template.format(tema=theme) for template in TEXT_TEMPLATES[column] for theme in TEXT_THEMES]
+    variants = (np.asarray(fragments, dtype=object), np.asarray([_with_typos(fragment) for fragment in fragments], dtype=object))
+    has_typos = rng.random(n_rows) < typo_rate
+    first = np.where(has_typos, variants[1][rng.integers(0, len(fragments), n_rows)], variants[0][rng.integers(0, len(fragments), n_rows)])
+    second = np.where(has_typos, variants[1][rng.integers(0, len(fragments), n_rows)], variants[0][rng.integers(0, len(fragments), n_rows)])
+    has_second = rng.random(n_rows) < 0.4
+
+    positive_clauses = [clause.format(palavra=word) for clause in POSITIVE_CLAUSES for word in POSITIVE_WORDS]
+    negative_clauses = [clause.format(palavra=word) for clause in NEGATIVE_CLAUSES for word in NEGATIVE_WORDS]
+    lexicon = np.where(rng.random(n_rows) < POSITIVE_CLAUSE_SHARE,
+                       np.asarray(positive_clauses, dtype=object)[rng.integers(0, len(positive_clauses), n_rows)],
+                       np.asarray(negative_clauses, dtype=object)[rng.integers(0, len(negative_clauses), n_rows)])
+    has_lexicon = rng.random(n_rows) < lexicon_rate
+
+    return np.asarray([
+        f"{a}{', e ' + _lower_first(b) if with_b else ''}{', ' + c if with_c else ''}."
+        for a, b, with_b, c, with_c in zip(first, second, has_second, lexicon, has_lexicon)
+    ], dtype=object)
+
+def _alternative_groups(principal: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Grupos alternativos (múltipla escolha, na ordem de GROUP_NAMES, sem o principal) ou NO_ALTERNATIVE_OPTION."""
+    n_rows = len(principal)
+    picks = rng.random((n_rows, len(GROUP_NAMES))) < 0.35
+    picks |= (np.arange(len(GROUP_NAMES)) == rng.integers(0, len(GROUP_NAMES), n_rows)[:, None]) # Ao menos uma escolha
+    picks &= np.asarray(GROUP_NAMES, dtype=object) != principal[:, None]
+    no_alternative = (rng.random(n_rows) < NO_ALTERNATIVE_RATE) | ~picks.any(axis=1)
+    return np.asarray([
+        NO_ALTERNATIVE_OPTION if none else GROUP_OPTIONS_SEPARATOR.join(group for group, picked in zip(GROUP_NAMES, row) if picked)
+        for row, none in zip(picks, no_alternative)
+    ], dtype=object)
+
+def generate_survey(n_rows: int, seed: int = SYNTHETIC_DATA_SEED, row_offset: int = 0, total_rows: int = None,
+                    typo_rate: float = SYNTHETIC_TYPO_RATE, lexicon_rate: float = SYNTHETIC_LEXICON_RATE,
+                    missing_rate: float = SYNTHETIC_MISSING_RATE) -> pd.DataFrame:
+    """
+    Gera respostas sintéticas do formulário de check-in, com os cabeçalhos originais (ORIGINAL_COL_NAMES)
+    e os valores como o Google Forms exporta, prontas para load_raw_data / iter_raw_data_chunks.
+    - Consciência do escopo, grupo principal, grupos alternativos e interesse em liderança seguem
+      distribuições próximas às da exportação real (grupo principal concentrado em poucos grupos).
+    - Textos livres em português combinam frases de cada pergunta, com erros de digitação de TYPO_CORRECTION_MAP
+      (typo_rate) e palavras dos léxicos de sentimento (lexicon_rate).
+    - Cada pergunta fica em branco em missing_rate das respostas.
+
+    Args:
+        n_rows (int): Quantidade de respostas.
+        seed (int): Semente; a mesma semente (e o mesmo row_offset) gera sempre as mesmas respostas.
+        row_offset (int): Posição da primeira resposta na exportação, para gerar exportações grandes em blocos.
+        total_rows (int, optional): Tamanho total da exportação (os carimbos de data/hora cobrem a janela toda). Por padrão, n_rows.
+
+    Returns:
+        pd.DataFrame: Uma linha por resposta, colunas na ordem do formulário.
+    """
+    rng = np.random.default_rng([seed, row_offset])
+    total_rows = total_rows or n_rows
+
+    seconds_per_row = SYNTHETIC_PERIOD_DAYS * 86_400 / max(total_rows, 1)
+    offsets = (row_offset + np.arange(n_rows) + rng.random(n_rows)) * seconds_per_row
+    timestamps = (pd.Timestamp(SYNTHETIC_PERIOD_START) + pd.to_timedelta(offsets, unit='s')).strftime(TIMESTAMP_FORMAT)
+
+    popularity = 1.0 / np.arange(1, len(GROUP_NAMES) + 1)
+    principal = rng.choice(np.asarray(GROUP_NAMES, dtype=object), n_rows, p=popularity / popularity.sum())
+    names = [f"{first} {last}" if with_last else first for first, last, with_last in
+             zip(rng.choice(FIRST_NAMES, n_rows), rng.choice(LAST_NAMES, n_rows), rng.random(n_rows) < 0.6)]
+
+    columns = {
+        'timestamp': np.asarray(timestamps, dtype=object),
+        'nome_completo': np.asarray(names, dtype=object),
+        'telefone_whatsapp': np.char.add('119', rng.integers(10_000_000, 100_000_000, n_rows).astype(str)).astype(object),
+        'consciencia_escopo': rng.choice(list(CONSCIENCE_WEIGHTS), n_rows, p=list(CONSCIENCE_WEIGHTS.values())).astype(object),
+        'grupo_principal': principal,
+        'grupo_alternativo': _alternative_groups(principal, rng),
+        'interesse_lideranca': rng.choice(list(LEADERSHIP_WEIGHTS), n_rows, p=list(LEADERSHIP_WEIGHTS.values())).astype(object),
+    }
+    for col in TEXT_COLUMNS_FOR_NLP:
+        columns[col] = _text_answers(col, n_rows, rng, typo_rate, lexicon_rate)
+
+    df = pd.DataFrame({header: columns[name] for header, name in ORIGINAL_COL_NAMES.items()})
+    # Respostas em branco (exceto carimbo, nome e consciência do escopo, que o formulário exige)
+    for header, name in ORIGINAL_COL_NAMES.items():
+        if name not in ('timestamp', 'nome_completo', 'consciencia_escopo'):
+            df.loc[rng.random(n_rows) < missing_rate, header] = np.nan
+    return df
+
+def synthetic_survey_path(n_rows: int, seed: int = SYNTHETIC_DATA_SEED) -> str:
+    """Caminho padrão da exportação sintética de n_rows respostas."""
+    return os.path.join(SYNTHETIC_DATA_DIR, f'checkin_sintetico_{n_rows}_seed{seed}.csv')
+
+def write_synthetic_survey(n_rows: int, file_path: str = None, seed: int = SYNTHETIC_DATA_SEED, chunk_size: int = 100_000,
+                           overwrite: bool = False) -> str:
+    """
+    Grava uma exportação sintética em CSV, em blocos de chunk_size respostas (a memória não cresce com n_rows).
+    Se o arquivo já existir, é reaproveitado (a geração é determinística pela semente), exceto com overwrite=True.
+
+    Returns:
+        str: Caminho do CSV.
+    """
+    file_path = file_path or synthetic_survey_path(n_rows, seed)
+    if os.path.exists(file_path) and not overwrite:
+        logging.info(f"Exportação sintética já existe: {file_path}")
+        return file_path
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    for row_offset in range(0, n_rows, chunk_size):
+        chunk = generate_survey(min(chunk_size, n_rows - row_offset), seed=seed, row_offset=row_offset, total_rows=n_rows)
+        chunk.to_csv(tmp_path, index=False, mode='w' if row_offset == 0 else 'a', header=row_offset == 0)
+    os.replace(tmp_path, file_path)
+    logging.info(f"Exportação sintética de {n_rows} respostas gravada em: {file_path}")
+    return file_path
+
+if __name__ == '__main__':
+    logging.info("Executando synthetic_data.py para teste.")
+    df_test = generate_survey(1_000).rename(columns=ORIGINAL_COL_NAMES)
+    for col in ['consciencia_escopo', 'grupo_principal', 'interesse_lideranca']:
+        print(f"\n--- {col} ---")
+        print(df_test[col].value_counts(normalize=True, dropna=False).round(3))
+    print("\n--- Exemplos de respostas livres ---")
+    for col in TEXT_COLUMNS_FOR_NLP:
+        print(f"{col}: {df_test[col].iloc[0]}")
+    print(f"\nTamanhos padrão das exportações: {SYNTHETIC_DATA_SIZES}")
+    print(f"Exportação de teste: {write_synthetic_survey(SYNTHETIC_DATA_SIZES[0])}")
@@ -0,0 +1,202 @@
+# transdevs_techexperience/src/tracing.py
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.config import TRACING_ENABLED, TRACE_DIR, TRACE_DEEP_MEMORY
+
+try:
+    import resource # Pico de RSS do processo; não existe no Windows (os spans ficam sem a medida de memória)
+except ImportError:
+    resource = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Estado do rastreamento deste processo: spans concluídos (eventos do Chrome trace) e o instante zero do trace
+_TRACE = {'enabled': TRACING_ENABLED, 'events': [], 'origin': time.perf_counter()}
+_LOCK = threading.Lock()
+
+def enable_tracing(reset: bool = True):
+    """Liga o registro de spans neste processo (por padrão, descartando os spans anteriores)."""
+    if reset:
+        reset_trace()
+    _TRACE['enabled'] = True
+
+def disable_tracing():
+    _TRACE['enabled'] = False
+
+def tracing_enabled() -> bool:
+    return _TRACE['enabled']
+
+def reset_trace():
+    with _LOCK:
+        _TRACE['events'] = []
+        _TRACE['origin'] = time.perf_counter()
+
+def _peak_rss_mb() -> float:
+    """Maior RSS do processo até agora, em MB (ru_maxrss vem em KB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource is not None else float('nan')
+
+def data_rows(obj) -> int:
+    """Linhas de um resultado: DataFrame, Series, array, matriz esparsa, lista ou a primeira dessas numa tupla. None se não houver."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)) or hasattr(obj, 'tocsr'):
+        return int(obj.shape[0])
+    if isinstance(obj, list):
+        return len(obj)
+    if isinstance(obj, tuple):
+        return next((rows for rows in map(data_rows, obj) if rows is not None), None)
+    return None
+
+def data_memory_mb(obj) -> float:
+    """Memória ocupada pelos dados (DataFrames, Series, arrays e matrizes esparsas, somando os de uma tupla), em MB. None se não houver."""
+    if isinstance(obj, pd.DataFrame):
+        return obj.memory_usage(index=True, deep=TRACE_DEEP_MEMORY).sum() / 1024 ** 2
+    if isinstance(obj, pd.Series):
+        return obj.memory_usage(index=True, deep=TRACE_DEEP_MEMORY) / 1024 ** 2
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes / 1024 ** 2
+    if hasattr(obj, 'tocsr') and hasattr(obj, 'data'):
+        return sum(getattr(obj, part).nbytes for part in ('data', 'indices', 'indptr') if hasattr(obj, part)) / 1024 ** 2
+    if isinstance(obj, tuple):
+        sizes = [size for size in map(data_memory_mb, obj) if size is not None]
+        return sum(sizes) if sizes else None
+    return None
+
+def _first_data_argument(args: tuple, kwargs: dict):
+    """Primeiro argumento com linhas (a entrada principal da função), ou None."""
+    return next((value for value in (*args, *kwargs.values()) if data_rows(value) is not None), None)
+
+@contextmanager
+def span(name: str, category: str = 'pipeline', data_in=None, **span_args):
+    """
+    Registra um span (evento 'X' do Chrome trace) com tempo de parede, tempo de CPU do processo, crescimento do pico de RSS
+    e, se data_in for informado, linhas e memória da entrada. Sem rastreamento ligado, não faz nada.
+    O dicionário devolvido aceita argumentos extras durante o span; a chave 'data_out' recebe o resultado,
+    do qual são medidas as linhas e a memória de saída.
+    Os spans de uma thread se aninham pelo tempo, como chamadas de função, no chrome://tracing ou no Perfetto.
+
+    Uso:
+        with span('vetorização TF-IDF', category='nlp', data_in=textos) as info:
+            ...
+            info['data_out'] = matriz
+    """
+    if not _TRACE['enabled']:
+        yield {}
+        return
+    span_args = dict(span_args)
+    if data_in is not None: # Medido fora do intervalo cronometrado (memory_usage profundo pode demorar)
+        span_args['rows_in'] = data_rows(data_in)
+        span_args['mem_in_mb'] = data_memory_mb(data_in)
+    peak_before = _peak_rss_mb()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    try:
+        yield span_args
+    finally:
+        end = time.perf_counter()
+        span_args['cpu_ms'] = round((time.process_time() - cpu_start) * 1000, 3)
+        span_args['peak_rss_delta_mb'] = round(_peak_rss_mb() - peak_before, 2)
+        data_out = span_args.pop('data_out', None)
+        if data_out is not None:
+            span_args['rows_out'] = data_rows(data_out)
+            span_args['mem_out_mb'] = data_memory_mb(data_out)
+        event = {
+            'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+            'ts': round((start - _TRACE['origin']) * 1e6, 1), 'dur': round((end - start) * 1e6, 1),
+            'args': {key: round(value, 3) if isinstance(value, float) else value for key, value in span_args.items()
+                     if value is not None and value == value}, # Sem None nem NaN (JSON inválido para o visualizador)
+        }
+        with _LOCK:
+            _TRACE['events'].append(event)
+
+def traced(name: str = None, category: str = 'pipeline'):
+    """
+    Decorador: cada chamada da função vira um span (ver span), com as linhas e a memória da primeira entrada com linhas
+    e do resultado. Sem rastreamento ligado, só chama a função.
+    Em funções com lru_cache, aplique traced por baixo do cache para registrar só as chamadas que executam de fato.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _TRACE['enabled']:
+                return func(*args, **kwargs)
+            with span(span_name, category, data_in=_first_data_argument(args, kwargs), module=func.__module__) as span_args:
+                result = func(*args, **kwargs)
+                span_args['data_out'] = result
+            return result
+        return wrapper
+    return decorator
+
+def trace_summary() -> pd.DataFrame:
+    """Spans agrupados por nome: chamadas, tempo total de parede e de CPU (ms) e maior crescimento do pico de RSS, do mais lento ao mais rápido."""
+    with _LOCK:
+        events = list(_TRACE['events'])
+    if not events:
+        return pd.DataFrame(columns=['span', 'chamadas', 'total_ms', 'cpu_ms', 'pico_rss_mb'])
+    df = pd.DataFrame({
+        'span': [event['name'] for event in events],
+        'total_ms': [event['dur'] / 1000 for event in events],
+        'cpu_ms': [event['args'].get('cpu_ms', 0.0) for event in events],
+        'pico_rss_mb': [event['args'].get('peak_rss_delta_mb', 0.0) for event in events],
+    })
+    summary = df.groupby('span', sort=False).agg(chamadas=('total_ms', 'size'), total_ms=('total_ms', 'sum'),
+                                                 cpu_ms=('cpu_ms', 'sum'), pico_rss_mb=('pico_rss_mb', 'max'))
+    return summary.sort_values('total_ms', ascending=False).round(1).reset_index()
+
+def export_trace(file_path: str = None, label: str = 'pipeline') -> str:
+    """
+    Grava os spans registrados em JSON no formato de eventos do Chrome (abrir em chrome://tracing ou https://ui.perfetto.dev)
+    e registra no log os spans mais demorados. Por padrão, grava em TRACE_DIR/trace_<label>_<data e hora>.json.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    file_path = file_path or os.path.join(TRACE_DIR, f"trace_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with _LOCK:
+        events = list(_TRACE['events'])
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': f'TransDevs {label}'}}]
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    logging.info(f"Trace com {len(events)} spans gravado em: {file_path}")
+    logging.info(f"Spans mais demorados:\n{trace_summary().head(15).to_string(index=False)}")
+    return file_path
+
+@contextmanager
+def tracing_session(file_path: str = None, label: str = 'pipeline'):
+    """
+    Rastreia o bloco e grava o trace ao sair dele, mesmo se o bloco terminar antes (return ou erro).
+    Para a opção --trace dos scripts: None não rastreia; '' grava no caminho padrão de export_trace.
+    """
+    if file_path is None:
+        yield
+        return
+    enable_tracing()
+    try:
+        yield
+    finally:
+        disable_tracing()
+        export_trace(file_path or None, label)
+
+if __name__ == '__main__':
+    # Rastreia o ETL e a EDA da exportação real e grava o trace
+    from src.data_ingestion import load_raw_data
+    from src.data_processing import preprocess_data
+    from src.analysis.eda import process_and_analyze_text_columns
+    from src.config import TEXT_COLUMNS_FOR_NLP
+
+    enable_tracing()
+    _, df_active_test, _ = preprocess_data(load_raw_data(), save_pii_mapping=False)
+    process_and_analyze_text_columns(df_active_test, TEXT_COLUMNS_FOR_NLP, persist=False)
+    print(f"Trace gravado em {export_trace(label='teste')}")